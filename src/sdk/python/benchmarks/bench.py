@@ -0,0 +1,272 @@
+# SecureAddress Bridge SDK benchmarks
+#
+# Measures requests/sec, latency percentiles and peak memory of the client's
+# hot paths (serial sync, unpooled sync, pooled threads and async) against the
+# local mock API server.
+#
+# Usage:
+#   python benchmarks/bench.py --requests 2000 --concurrency 32
+#   python benchmarks/bench.py --latency 5 --error-rate 0.01 --output results.json
+#   python benchmarks/bench.py --baseline results.json --max-regression 0.15
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import MockApiServer, MockConfig  # noqa: E402
+from secureaddress_bridge import (  # noqa: E402
+    AsyncSecureAddressBridge, HttpTransport, RetryPolicy, SecureAddressBridge
+)
+
+ENDPOINTS = ("auth", "address", "validate-token", "tracking", "request-shipment")
+SCENARIOS = ("sync", "sync-unpooled", "threads", "async")
+MEMORY_PASS_REQUESTS = 200
+
+# Coalescing and conditional requests would answer repeated identical GETs
+# without a round trip and make the numbers meaningless, so every call is sent
+CLIENT_OPTIONS = {"coalesce_requests": False, "conditional_requests": False}
+
+
+def _operation(client: Any, endpoint: str) -> Callable[[int], Any]:
+    """
+    Return a callable that performs one call against `endpoint` (a coroutine
+    function for async clients)
+    """
+    if endpoint == "auth":
+        return lambda i: client.authenticate()
+    if endpoint == "address":
+        return lambda i: client.get_address()
+    if endpoint == "validate-token":
+        return lambda i: client.validate_token()
+    if endpoint == "tracking":
+        return lambda i: client.get_tracking_info(f"TRK{i:08d}", "usps")
+    if endpoint == "request-shipment":
+        return lambda i: client.request_shipment({
+            "shipping_token": f"shp_{i}",
+            "carrier": "usps",
+            "service": "Priority",
+            "package": {"type": "box", "weight": 1.5},
+            "idempotency_key": f"bench-{i}"
+        })
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(q / 100.0 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _summarize(latencies: List[float], errors: int, elapsed: float, peak_memory: int) -> Dict[str, Any]:
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "requests_per_sec": count / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        "peak_memory_kb": peak_memory / 1024
+    }
+
+
+def _timed(operation: Callable[[int], Any], latencies: List[float], errors: List[int]) -> Callable[[int], None]:
+    def call(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            operation(i)
+        except Exception:
+            errors.append(i)
+        latencies.append(time.perf_counter() - started)
+    return call
+
+
+def _sync_pass(client: SecureAddressBridge, endpoint: str, count: int, concurrency: int) -> Tuple[List[float], int, float]:
+    latencies, errors = [], []
+    call = _timed(_operation(client, endpoint), latencies, errors)
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        for i in range(count):
+            call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(call, range(count)))
+    return latencies, len(errors), time.perf_counter() - started
+
+
+def _run_sync(client: SecureAddressBridge, endpoint: str, count: int, concurrency: int) -> Dict[str, Any]:
+    latencies, errors, elapsed = _sync_pass(client, endpoint, count, concurrency)
+
+    # tracemalloc slows every allocation, so memory is measured on a separate, shorter pass
+    tracemalloc.start()
+    _sync_pass(client, endpoint, min(count, MEMORY_PASS_REQUESTS), concurrency)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return _summarize(latencies, errors, elapsed, peak)
+
+
+async def _async_pass(
+    client: AsyncSecureAddressBridge,
+    endpoint: str,
+    count: int,
+    concurrency: int
+) -> Tuple[List[float], int, float]:
+    operation = _operation(client, endpoint)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+
+    async def call(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                errors.append(i)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(count)))
+    return latencies, len(errors), time.perf_counter() - started
+
+
+async def _run_async(client: AsyncSecureAddressBridge, endpoint: str, count: int, concurrency: int) -> Dict[str, Any]:
+    await client.authenticate()
+    latencies, errors, elapsed = await _async_pass(client, endpoint, count, concurrency)
+
+    tracemalloc.start()
+    await _async_pass(client, endpoint, min(count, MEMORY_PASS_REQUESTS), concurrency)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return _summarize(latencies, errors, elapsed, peak)
+
+
+def run_scenario(scenario: str, endpoint: str, base_url: str, count: int, concurrency: int, retries: int) -> Dict[str, Any]:
+    """
+    Run one scenario/endpoint pair against the server at base_url
+
+    Args:
+        scenario: One of SCENARIOS
+        endpoint: One of ENDPOINTS
+        base_url: The mock server URL
+        count: Number of calls to make
+        concurrency: Calls in flight for the threads and async scenarios
+        retries: Retries per call (backoff is kept negligible)
+
+    Returns:
+        Dict with requests, errors, requests_per_sec, p50_ms, p99_ms, max_ms and peak_memory_kb
+    """
+    retry_policy = RetryPolicy(max_retries=retries, backoff_factor=0.001, jitter=False)
+
+    if scenario == "async":
+        async def run() -> Dict[str, Any]:
+            async with AsyncSecureAddressBridge(
+                "bench-app", "bench-secret", base_url=base_url, retry_policy=retry_policy, **CLIENT_OPTIONS
+            ) as client:
+                return await _run_async(client, endpoint, count, concurrency)
+        return asyncio.run(run())
+
+    transport = HttpTransport(keep_alive=scenario != "sync-unpooled", pool_maxsize=max(concurrency, 10))
+    with SecureAddressBridge(
+        "bench-app", "bench-secret", base_url=base_url, transport=transport, retry_policy=retry_policy, **CLIENT_OPTIONS
+    ) as client:
+        client.authenticate()
+        result = _run_sync(client, endpoint, count, concurrency if scenario == "threads" else 1)
+    transport.close()
+    return result
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], max_regression: float) -> List[str]:
+    """
+    Return a description of every result that regressed past max_regression
+    (throughput down or p99 latency up by more than that fraction)
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result["requests_per_sec"] < previous["requests_per_sec"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: {result['requests_per_sec']:.0f} req/s vs {previous['requests_per_sec']:.0f} baseline"
+            )
+        if result["p99_ms"] > previous["p99_ms"] * (1 + max_regression):
+            regressions.append(f"{name}: p99 {result['p99_ms']:.2f} ms vs {previous['p99_ms']:.2f} ms baseline")
+    return regressions
+
+
+def failures(results: Dict[str, Dict[str, Any]], error_rate: float, retries: int) -> List[str]:
+    """
+    Return a description of every result with failed calls. Errors are only
+    expected when the mock injects them and the client has no retries to absorb them
+    """
+    if error_rate and not retries:
+        return []
+    return [f"ERRORS {name}: {result['errors']} failed calls" for name, result in results.items() if result["errors"]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SecureAddress Bridge Python SDK against a local mock API")
+    parser.add_argument("--requests", type=int, default=1000, help="calls per scenario and endpoint")
+    parser.add_argument("--concurrency", type=int, default=16, help="calls in flight for threads/async")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=["address", "tracking", "request-shipment"])
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server delay in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mock server random extra delay in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests the mock answers with 503")
+    parser.add_argument("--retries", type=int, default=0, help="client retries per call")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results from a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed fractional regression vs baseline")
+    args = parser.parse_args()
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        if "async" in args.scenarios:
+            print("Skipping async scenario (install the `async` extra to enable it)", file=sys.stderr)
+            args.scenarios.remove("async")
+
+    config = MockConfig(args.latency / 1000, args.jitter / 1000, args.error_rate, seed=0)
+    results = {}
+    with MockApiServer(config=config) as server:
+        print(f"{'scenario':<28}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'peak KB':>10}")
+        for scenario in args.scenarios:
+            for endpoint in args.endpoints:
+                name = f"{scenario}/{endpoint}"
+                result = results[name] = run_scenario(
+                    scenario, endpoint, server.url, args.requests, args.concurrency, args.retries
+                )
+                print(
+                    f"{name:<28}{result['requests_per_sec']:>10.0f}{result['p50_ms']:>10.2f}"
+                    f"{result['p99_ms']:>10.2f}{result['errors']:>8}{result['peak_memory_kb']:>10.0f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    problems = failures(results, args.error_rate, args.retries)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        problems.extend(f"REGRESSION {regression}" for regression in regressions)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# SecureAddress Bridge SDK import-time benchmark
+#
+# Measures the cold-start cost of importing the SDK (and of creating a client)
+# in fresh interpreters, and checks that optional dependencies such as
+# requests, aiohttp, flask and cryptography are not imported before they are
+# needed.
+#
+# Usage:
+#   python benchmarks/import_time.py
+#   python benchmarks/import_time.py --runs 50 --output import_time.json
+#   python benchmarks/import_time.py --budget-ms 30
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+SDK_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = (
+    "requests", "urllib3", "aiohttp", "httpx", "flask", "cryptography", "orjson", "sqlite3", "asyncio"
+)
+
+# name: (statement, heavy modules it is allowed to import)
+SCENARIOS = {
+    "package": ("import secureaddress_bridge", ()),
+    "sync-client": ("from secureaddress_bridge import SecureAddressBridge", ()),
+    "async-client": ("from secureaddress_bridge import AsyncSecureAddressBridge", ("asyncio",)),
+    "sync-client-init": (
+        "from secureaddress_bridge import SecureAddressBridge; SecureAddressBridge('app', 'secret')",
+        ("requests", "urllib3")
+    ),
+    "sandbox-client-init": (
+        "from secureaddress_bridge import SecureAddressBridge; SecureAddressBridge('app', 'secret', sandbox=True)",
+        ()
+    ),
+}
+
+_CHILD = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+import json
+print(json.dumps({{"seconds": elapsed, "modules": sorted(m for m in sys.modules if m.split(".")[0] in {heavy!r})}}))
+"""
+
+
+def measure(statement: str, runs: int) -> Dict[str, Any]:
+    """
+    Time `statement` in `runs` fresh interpreters
+
+    Returns:
+        Dict with median_ms, min_ms, max_ms and the heavy modules it imported
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SDK_PATH, os.environ.get("PYTHONPATH")])))
+    # Deployed code runs from cached bytecode, so let the warm-up run write it
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    code = _CHILD.format(statement=statement, heavy=HEAVY_MODULES)
+    timings, modules = [], []
+    # The first run writes the bytecode cache and is not counted
+    for i in range(runs + 1):
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        if i:
+            timings.append(result["seconds"] * 1000)
+        modules = result["modules"]
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "heavy_modules": sorted({m.split(".")[0] for m in modules})
+    }
+
+
+def check(name: str, result: Dict[str, Any], allowed: List[str], budget_ms: float) -> List[str]:
+    """
+    Return a description of every way a scenario broke its import budget
+    """
+    problems = []
+    unexpected = [m for m in result["heavy_modules"] if m not in allowed]
+    if unexpected:
+        problems.append(f"{name}: imported {', '.join(unexpected)} eagerly")
+    if name in ("package", "sync-client") and result["median_ms"] > budget_ms:
+        problems.append(f"{name}: {result['median_ms']:.1f} ms exceeds the {budget_ms:.1f} ms budget")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure SecureAddress Bridge SDK import time")
+    parser.add_argument("--runs", type=int, default=20, help="fresh interpreters per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="allowed median import time of the sync client")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results, problems = {}, []
+    print(f"{'scenario':<22}{'median ms':>11}{'min ms':>9}{'max ms':>9}  heavy modules")
+    for name in args.scenarios:
+        statement, allowed = SCENARIOS[name]
+        result = results[name] = measure(statement, args.runs)
+        print(
+            f"{name:<22}{result['median_ms']:>11.1f}{result['min_ms']:>9.1f}{result['max_ms']:>9.1f}"
+            f"  {', '.join(result['heavy_modules']) or '-'}"
+        )
+        problems.extend(check(name, result, allowed, args.budget_ms))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    for problem in problems:
+        print(f"IMPORT BUDGET {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
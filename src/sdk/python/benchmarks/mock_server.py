@@ -0,0 +1,231 @@
+# SecureAddress Bridge mock API server
+#
+# A local stand-in for the SecureAddress Bridge API used by the benchmark
+# suite. It serves the auth, address, validate-token, tracking, usage-stats
+# and request-shipment endpoints with deterministic payloads and configurable
+# latency and error injection. Address and tracking responses carry ETags
+# (answering a matching If-None-Match with 304), and large bodies are gzipped
+# for clients that accept it.
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+class MockConfig:
+    """
+    Latency and error injection settings, adjustable while the server runs
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = None):
+        """
+        Initialize the settings
+
+        Args:
+            latency: Fixed delay added to every response, in seconds
+            jitter: Extra uniformly distributed delay (0..jitter seconds)
+            error_rate: Fraction of requests answered with a 503
+            seed: Seed for the latency/error random generator
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> Tuple[float, bool]:
+        """
+        Draw the delay and whether to fail for one request
+        """
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, fail
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def mock_address(access_token: str) -> Dict[str, Any]:
+    """
+    Return the deterministic address served for an access token
+    """
+    number = int(_digest(access_token)[:6], 16) % 9000 + 100
+    return {
+        "street": f"{number} Main St",
+        "city": "Springfield",
+        "state": "IL",
+        "postal_code": f"{62700 + number % 100:05d}",
+        "country": "US"
+    }
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY keep-alive
+    # clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    GZIP_MIN_SIZE = 1024
+
+    def _respond(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None, etag: bool = False) -> None:
+        content = json.dumps(body).encode()
+        headers = dict(headers or {})
+        if etag and status == 200:
+            headers["ETag"] = f'"{_digest(content.decode())[:32]}"'
+            if headers["ETag"] in (self.headers.get("If-None-Match") or ""):
+                status, content = 304, b""
+        if len(content) >= self.GZIP_MIN_SIZE and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            content = gzip.compress(content)
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _bearer(self) -> Optional[str]:
+        authorization = self.headers.get("Authorization") or ""
+        return authorization[7:] if authorization.startswith("Bearer ") else None
+
+    def _inject(self) -> bool:
+        delay, fail = self.server.config.sample()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._respond(503, {"error": "Injected failure"}, {"Retry-After": "0"})
+        return fail
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rsplit("/", 1)[-1]
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.count(url.path)
+        if self._inject():
+            return
+
+        token = self._bearer()
+        if path == "address":
+            if not token:
+                return self._respond(401, {"error": "Missing access token"})
+            return self._respond(200, mock_address(token), etag=True)
+        if path == "validate-token":
+            if not token:
+                return self._respond(401, {"error": "Missing access token"})
+            return self._respond(200, {"valid": True, "app_id": self.headers.get("X-App-ID"), "scope": ["address"]})
+        if path == "tracking":
+            statuses = ("pre_transit", "in_transit", "out_for_delivery", "delivered")
+            number = query.get("number", "")
+            return self._respond(200, {
+                "tracking_number": number,
+                "carrier": query.get("carrier"),
+                "status": statuses[int(_digest(number)[:2], 16) % len(statuses)]
+            }, etag=True)
+        if path == "usage-stats":
+            return self._respond(200, {"limit": 1000000, "used": self.server.total, "period": "day"})
+        self._respond(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rsplit("/", 1)[-1]
+        body = self._read_body() or {}
+        self.server.count(url.path)
+        if self._inject():
+            return
+
+        if path == "auth":
+            return self._respond(200, {"access_token": _digest(str(body.get("app_id")))[:32], "expires_in": 3600})
+        if path == "request-shipment":
+            key = self.headers.get("Idempotency-Key") or json.dumps(body, sort_keys=True)
+            return self._respond(200, {
+                "shipment_id": _digest(key)[:16],
+                "tracking_number": _digest(key)[16:34].upper(),
+                "carrier": body.get("carrier"),
+                "service": body.get("service")
+            })
+        if path == "confirm-delivery":
+            return self._respond(200, {"confirmed": True, "tracking_number": body.get("tracking_number")})
+        self._respond(404, {"error": "Not found"})
+
+
+class MockApiServer(ThreadingHTTPServer):
+    """
+    Threaded mock API server; use as a context manager or call start()/stop()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: MockConfig = None):
+        super().__init__((host, port), MockApiHandler)
+        self.config = config or MockConfig()
+        self.requests = {}
+        self.total = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.total += 1
+
+    def start(self) -> "MockApiServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "MockApiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the SecureAddress Bridge mock API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="fixed response delay in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    config = MockConfig(args.latency / 1000, args.jitter / 1000, args.error_rate)
+    server = MockApiServer(args.host, args.port, config)
+    print(f"Mock SecureAddress Bridge API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# SecureAddress Bridge Python SDK
+#
+# This SDK provides a Python implementation of the SecureAddress Bridge SDK
+# for securely accessing verified physical addresses with enhanced blockchain support
+# and blind shipping capabilities.
+# Version: 1.0.0
+#
+# Importing the package is cheap: each name below is loaded from its submodule
+# on first access, and optional dependencies (requests, aiohttp, httpx, flask,
+# cryptography, orjson) are only imported by the code paths that need them.
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+_EXPORTS = {
+    "SecureAddressBridge": "client",
+    "TokenContext": "client",
+    "AsyncSecureAddressBridge": "aio",
+    "AsyncHttpTransport": "aio",
+    "AsyncSandboxTransport": "aio",
+    "AsyncTokenManager": "aio",
+    "AsyncRequestCoalescer": "aio",
+    "AsyncWebhookReceiver": "aio",
+    "AsyncClientRegistry": "aio",
+    "AsyncTrackingSubscription": "aio",
+    "ApiRequest": "models",
+    "AddressResult": "models",
+    "ShipmentResult": "models",
+    "LinkResult": "models",
+    "ResponseModel": "models",
+    "Address": "models",
+    "TrackingInfo": "models",
+    "ShippingToken": "models",
+    "WebhookRegistration": "models",
+    "SecureAddressError": "errors",
+    "RateLimitError": "errors",
+    "RetryPolicy": "policies",
+    "TokenBucket": "policies",
+    "QuotaTracker": "policies",
+    "HttpTransport": "transport",
+    "BufferedResponse": "transport",
+    "SandboxEngine": "sandbox",
+    "SandboxTransport": "sandbox",
+    "RequestMetrics": "instrumentation",
+    "LatencyHistogram": "instrumentation",
+    "Instrumentation": "instrumentation",
+    "LinkCheckpoint": "bulk",
+    "ResponseCache": "cache",
+    "PersistentCache": "cache",
+    "ParsedToken": "tokens",
+    "LocalTokenValidator": "tokens",
+    "TokenManager": "tokens",
+    "WebhookVerifier": "webhooks",
+    "WebhookEvent": "webhooks",
+    "WebhookReceiver": "webhooks",
+    "CarrierIndex": "carriers",
+    "RequestCoalescer": "coalescing",
+    "ClientRegistry": "registry",
+    "TrackingUpdate": "tracking",
+    "TrackingPoller": "tracking",
+    "TrackingEvent": "tracking",
+    "TrackingSubscription": "tracking",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .aio import (  # noqa: F401
+        AsyncClientRegistry, AsyncHttpTransport, AsyncRequestCoalescer, AsyncSandboxTransport,
+        AsyncSecureAddressBridge, AsyncTokenManager, AsyncTrackingSubscription, AsyncWebhookReceiver
+    )
+    from .bulk import LinkCheckpoint  # noqa: F401
+    from .cache import PersistentCache, ResponseCache  # noqa: F401
+    from .carriers import CarrierIndex  # noqa: F401
+    from .client import SecureAddressBridge, TokenContext  # noqa: F401
+    from .coalescing import RequestCoalescer  # noqa: F401
+    from .errors import RateLimitError, SecureAddressError  # noqa: F401
+    from .instrumentation import Instrumentation, LatencyHistogram, RequestMetrics  # noqa: F401
+    from .models import (  # noqa: F401
+        Address, AddressResult, ApiRequest, LinkResult, ResponseModel, ShipmentResult, ShippingToken, TrackingInfo,
+        WebhookRegistration
+    )
+    from .policies import QuotaTracker, RetryPolicy, TokenBucket  # noqa: F401
+    from .registry import ClientRegistry  # noqa: F401
+    from .sandbox import SandboxEngine, SandboxTransport  # noqa: F401
+    from .tokens import LocalTokenValidator, ParsedToken, TokenManager  # noqa: F401
+    from .tracking import TrackingEvent, TrackingPoller, TrackingSubscription, TrackingUpdate  # noqa: F401
+    from .transport import BufferedResponse, HttpTransport  # noqa: F401
+    from .webhooks import WebhookEvent, WebhookReceiver, WebhookVerifier  # noqa: F401
@@ -0,0 +1,1201 @@
+# SecureAddress Bridge Python SDK: async client, transports and helpers
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .bulk import LinkCheckpoint, _chunks
+from .cache import ResponseCache
+from .carriers import CarrierIndex
+from .client import SecureAddressBridge
+from .coalescing import RequestCoalescer
+from .errors import SecureAddressError
+from .instrumentation import Instrumentation, _InstrumentedCall, _endpoint_label
+from .models import (
+    Address, AddressResult, ApiRequest, LinkResult, ShipmentResult, ShippingToken, TrackingInfo, WebhookRegistration
+)
+from .policies import QuotaTracker, RetryPolicy, TokenBucket
+from .registry import ClientRegistry
+from .sandbox import SandboxTransport
+from .tokens import LocalTokenValidator, TokenManager
+from .tracking import TrackingEvent, TrackingSubscription
+from .transport import BufferedResponse, _accept_encoding
+from .webhooks import _WebhookReceiverBase
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHttpTransport:
+    """
+    Pooled asyncio HTTP transport backed by a single shared aiohttp session
+    (requires the `async` extra)
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        keepalive_timeout: float = 15.0
+    ):
+        """
+        Initialize the transport
+
+        Args:
+            limit: Maximum number of simultaneous connections
+            limit_per_host: Maximum number of simultaneous connections per host
+            connect_timeout: Seconds to wait when establishing a connection
+            read_timeout: Seconds to wait for the server to send a response
+            keepalive_timeout: Seconds an idle connection is kept open
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError(
+                "AsyncHttpTransport requires aiohttp. Install it with: pip install secureaddress-bridge[async]"
+            )
+
+        self._aiohttp = aiohttp
+        self.connect_errors = (aiohttp.ClientConnectorError,)
+        self.transient_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._connection_counts = {"new_connections": 0, "reused_connections": 0}
+
+    def _get_session(self) -> Any:
+        # The session is created lazily so that it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = self._aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = self._aiohttp.ClientSession(
+                connector=connector,
+                headers={"Accept-Encoding": _accept_encoding()},
+                timeout=self._aiohttp.ClientTimeout(connect=self.connect_timeout, sock_read=self.read_timeout),
+                trace_configs=[self._trace_config()]
+            )
+        return self._session
+
+    def _trace_config(self) -> Any:
+        counts = self._connection_counts
+
+        async def on_create(session, context, params):
+            counts["new_connections"] += 1
+
+        async def on_reuse(session, context, params):
+            counts["reused_connections"] += 1
+
+        trace_config = self._aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Return how many requests reused a pooled connection
+        """
+        counts = dict(self._connection_counts)
+        counts["requests"] = counts["new_connections"] + counts["reused_connections"]
+        return counts
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        params: Dict[str, Any] = None,
+        json: Any = None
+    ) -> BufferedResponse:
+        """
+        Send a request through the shared session
+
+        Args:
+            method: The HTTP method
+            url: The absolute request URL
+            headers: Request headers
+            params: Query string parameters
+            json: JSON-serializable request body
+
+        Returns:
+            The fully read response
+        """
+        session = self._get_session()
+        async with session.request(method, url, headers=headers, params=params, json=json) as response:
+            content = await response.read()
+            return BufferedResponse(response.status, dict(response.headers), content)
+
+    async def close(self) -> None:
+        """
+        Close the session and all pooled connections
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncHttpTransport":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class AsyncSandboxTransport(SandboxTransport):
+    """
+    Async version of SandboxTransport
+    """
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        params: Dict[str, Any] = None,
+        json: Any = None
+    ) -> BufferedResponse:
+        latency = self.engine.sample_latency()
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return self.engine.handle(method, url, headers=headers, params=params, json=json)
+
+    async def close(self) -> None:
+        pass
+
+
+_LEADER_CANCELLED = object()
+
+
+async def _join_flight(flight: "asyncio.Future") -> Any:
+    """
+    Await a call another task has in flight
+
+    Returns _LEADER_CANCELLED when that task was cancelled before the call
+    finished, in which case the caller should make the call itself.
+    """
+    try:
+        return await asyncio.shield(flight)
+    except asyncio.CancelledError:
+        if not flight.cancelled():
+            raise
+        return _LEADER_CANCELLED
+
+
+def _release_flight(flight: "asyncio.Future") -> None:
+    # A leader cancelled mid-call cancels its flight so that waiters never hang
+    if not flight.done():
+        flight.cancel()
+
+
+async def _abounded_map(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    concurrency: int
+) -> AsyncIterator[Any]:
+    """
+    Await func over items, keeping at most `concurrency` calls in flight, and
+    yield the results as they complete
+    """
+    items = iter(items)
+    pending = {asyncio.ensure_future(func(item)) for item in itertools.islice(items, concurrency)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for item in itertools.islice(items, len(done)):
+                pending.add(asyncio.ensure_future(func(item)))
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _aordered_bounded_map(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    concurrency: int
+) -> AsyncIterator[Any]:
+    """
+    Like _abounded_map, but yield the results in input order
+    """
+    items = iter(items)
+    window = deque(asyncio.ensure_future(func(item)) for item in itertools.islice(items, concurrency))
+    try:
+        while window:
+            task = window.popleft()
+            for item in itertools.islice(items, 1):
+                window.append(asyncio.ensure_future(func(item)))
+            yield await task
+    finally:
+        for task in window:
+            task.cancel()
+
+
+class AsyncWebhookReceiver(_WebhookReceiverBase):
+    """
+    ASGI webhook receiver dispatching events to handlers on asyncio workers
+
+    Handlers may be coroutine functions or plain functions.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._queue = None
+        self._tasks = []
+
+    def start(self) -> None:
+        """
+        Start the worker tasks on the running loop (done automatically on the first delivery)
+        """
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers after the queued events have been handled
+        """
+        tasks, self._tasks = self._tasks, []
+        for _ in tasks:
+            await self._queue.put(None)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def receive(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Async version of WebhookReceiver.receive
+        """
+        status, response, event = self._accept(
+            body,
+            headers.get("X-Webhook-Signature"),
+            headers.get("X-Webhook-Timestamp"),
+            headers.get("X-Webhook-Event")
+        )
+        if event is None:
+            return status, response
+
+        self.start()
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return self._queue_full(event)
+        return status, response
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await self.stop()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] == "websocket":
+            # Deliveries are plain HTTP POSTs; refuse the handshake
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        if scope["method"] != "POST":
+            status, response = 405, {"error": "Method not allowed"}
+        else:
+            chunks = []
+            more = True
+            while more:
+                message = await receive()
+                chunks.append(message.get("body", b""))
+                more = message.get("more_body", False)
+            headers = {
+                name.decode("latin-1").title(): value.decode("latin-1")
+                for name, value in scope.get("headers", [])
+            }
+            status, response = await self.receive(b"".join(chunks), headers)
+
+        payload = json.dumps(response).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        if status == 503:
+            headers.append((b"retry-after", b"1"))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _work(self) -> None:
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            self._before_dispatch(event)
+            for handler in self._handlers_for(event):
+                try:
+                    result = handler(event)
+                    if asyncio.iscoroutine(result):
+                        await result
+                    self._count("processed")
+                except Exception:
+                    self._count("failed")
+                    logger.exception("Webhook handler failed for event %s", event.id)
+
+
+class AsyncTokenManager(TokenManager):
+    """
+    TokenManager for the async client: refreshes run on the event loop and
+    concurrent awaiters share one in-flight request
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], Awaitable[Dict[str, Any]]],
+        refresh_margin: float = 60.0,
+        background_refresh: bool = True
+    ):
+        super().__init__(fetch, refresh_margin=refresh_margin, background_refresh=background_refresh)
+        self._refresh_task = None
+
+    def get_token(self) -> Optional[str]:
+        # Never block the event loop; the client awaits ensure_token() first
+        return self.access_token
+
+    async def ensure_token(self) -> Optional[str]:
+        """
+        Return a usable access token, refreshing first if it has expired
+        """
+        if self.expired():
+            return await self.refresh()
+        if self.needs_refresh() and time.monotonic() >= self._retry_at:
+            self._refresh_in_background()
+        return self.access_token
+
+    async def refresh(self) -> Optional[str]:
+        """
+        Refresh the token now; concurrent awaiters share one request
+        """
+        flight = self._flight
+        while flight is not None:
+            result = await _join_flight(flight)
+            if result is not _LEADER_CANCELLED:
+                return result
+            flight = self._flight
+
+        flight = self._flight = asyncio.get_event_loop().create_future()
+        try:
+            self.record(await self.fetch(self.refresh_token))
+            self.refresh_count += 1
+            flight.set_result(self.access_token)
+        except Exception as e:
+            flight.set_exception(e)
+        finally:
+            self._flight = None
+            _release_flight(flight)
+        return await flight
+
+    def _start_timer(self, delay: float) -> None:
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            return
+        self._timer = loop.call_later(delay, self._refresh_in_background)
+
+    def cancel(self) -> None:
+        """
+        Cancel any scheduled or running background refresh
+        """
+        super().cancel()
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None:
+            task.cancel()
+
+    async def close(self) -> None:
+        """
+        Cancel background refreshes and wait for a running one to stop
+        """
+        task = self._refresh_task
+        self.cancel()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _refresh_in_background(self) -> None:
+        # Keep a reference so the task is not garbage-collected mid-refresh
+        if self._flight is None and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.ensure_future(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Background token refresh failed: %s", e)
+            self._schedule_retry()
+
+
+class AsyncRequestCoalescer(RequestCoalescer):
+    """
+    RequestCoalescer for the async client: concurrent awaiters share one request
+    """
+
+    async def run(self, request: ApiRequest, send: Callable[[ApiRequest], Awaitable[Any]]) -> Any:
+        """
+        Send the request, or await an identical one already in flight
+        """
+        key = self.key(request)
+        flight = self._flights.get(key)
+        while flight is not None:
+            self.coalesced += 1
+            result = await _join_flight(flight)
+            if result is not _LEADER_CANCELLED:
+                return result
+            # Nothing was shared; send the request (or join whoever took over)
+            self.coalesced -= 1
+            flight = self._flights.get(key)
+
+        flight = self._flights[key] = asyncio.get_event_loop().create_future()
+        self.leaders += 1
+        try:
+            flight.set_result(await send(request))
+        except Exception as e:
+            flight.set_exception(e)
+        finally:
+            del self._flights[key]
+            _release_flight(flight)
+        return await flight
+
+
+class AsyncTrackingSubscription(TrackingSubscription):
+    """
+    Async version of TrackingSubscription; iterate over it with `async for`
+    """
+
+    async def add(self, tracking_number: str, carrier: str) -> None:
+        """
+        Start receiving events for a shipment
+        """
+        if self._track((tracking_number, carrier)):
+            try:
+                await self.client.update_tracking_subscription(self.subscription_id, add=[(tracking_number, carrier)])
+            except SecureAddressError as e:
+                if not self._expired(e):
+                    raise
+
+    async def remove(self, tracking_number: str, carrier: str) -> None:
+        """
+        Stop receiving events for a shipment
+        """
+        if self._untrack((tracking_number, carrier)):
+            try:
+                await self.client.update_tracking_subscription(self.subscription_id, remove=[(tracking_number, carrier)])
+            except SecureAddressError as e:
+                if not self._expired(e):
+                    raise
+
+    def __iter__(self):
+        raise TypeError("AsyncTrackingSubscription must be iterated with `async for`")
+
+    def __aiter__(self) -> AsyncIterator[TrackingEvent]:
+        return self.events()
+
+    async def events(self) -> AsyncIterator[TrackingEvent]:
+        """
+        Poll until close() is called, yielding events as they arrive
+        """
+        while not self._closed.is_set():
+            await self.client._ensure_token()
+            request, subscribing = self._next_request()
+            try:
+                data = await self.client._send(request, conditional=subscribing)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e))
+                continue
+
+            events = self._accept(data, subscribing)
+            for event in events:
+                self.cursor = event.cursor
+                yield event
+            if not subscribing and not events:
+                await asyncio.sleep(self.idle_interval)
+
+
+class AsyncSecureAddressBridge(SecureAddressBridge):
+    """
+    Async version of the SecureAddressBridge client (requires aiohttp)
+    
+    Every network method is a coroutine; all calls share a single pooled
+    aiohttp session. Use it as an async context manager, or await close()
+    when done.
+    """
+    
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        base_url: str = "https://api.secureaddress.bridge",
+        api_version: str = "v1",
+        supported_chains: List[str] = None,
+        supported_carriers: List[str] = None,
+        transport: AsyncHttpTransport = None,
+        cache: ResponseCache = None,
+        token_validator: LocalTokenValidator = None,
+        auto_refresh: bool = False,
+        refresh_margin: float = 60.0,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: TokenBucket = None,
+        carrier_index: CarrierIndex = None,
+        instrumentation: Instrumentation = None,
+        sandbox: bool = False,
+        quota: QuotaTracker = None,
+        response_models: bool = False,
+        coalesce_requests: bool = True,
+        conditional_requests: bool = False
+    ):
+        """
+        Initialize the async SecureAddress Bridge client
+        
+        Args:
+            app_id: Your application ID
+            app_secret: Your application secret
+            base_url: The base URL of the SecureAddress Bridge API
+            api_version: The API version to use
+            supported_chains: List of supported blockchain networks
+            supported_carriers: List of supported shipping carriers
+            transport: Shared AsyncHttpTransport to send requests through (a
+                private one is created when omitted)
+            cache: Optional ResponseCache for get_address and validate_token
+            token_validator: Optional LocalTokenValidator that lets
+                validate_token check signed tokens without a network call
+            auto_refresh: Track the access token's expiry and refresh it
+                automatically before it expires
+            refresh_margin: Seconds before expiry at which to refresh
+            retry_policy: Retry policy for failed requests (defaults to
+                RetryPolicy(); pass RetryPolicy(max_retries=0) to disable)
+            rate_limiter: Optional TokenBucket shared by every request
+            carrier_index: Prebuilt CarrierIndex to share between clients
+                (built from the supported carriers and methods when omitted;
+                when given it also defines supported_carriers and
+                supported_shipping_methods)
+            instrumentation: Optional Instrumentation that records latency,
+                payload sizes, retries and errors for every call
+            sandbox: Answer every call from an in-process SandboxEngine
+                instead of the network (ignored when a transport is passed)
+            quota: Optional QuotaTracker that counts requests locally so
+                remaining_quota() needs no network call
+            response_models: Return lazily parsed, read-only Address,
+                TrackingInfo, ShippingToken and WebhookRegistration mappings
+                instead of dicts
+            coalesce_requests: Let concurrent identical GET requests share
+                one in-flight request
+            conditional_requests: Remember the ETag and body of GET responses
+                and repeat those requests with If-None-Match, reusing the
+                remembered body when the server answers 304 (off by default;
+                the remembered bodies are held until evicted)
+        """
+        super().__init__(
+            app_id,
+            app_secret,
+            base_url=base_url,
+            api_version=api_version,
+            supported_chains=supported_chains,
+            supported_carriers=supported_carriers,
+            transport=transport or (AsyncSandboxTransport() if sandbox else AsyncHttpTransport()),
+            cache=cache,
+            token_validator=token_validator,
+            auto_refresh=auto_refresh,
+            refresh_margin=refresh_margin,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            carrier_index=carrier_index,
+            instrumentation=instrumentation,
+            quota=quota,
+            response_models=response_models,
+            coalesce_requests=coalesce_requests,
+            conditional_requests=conditional_requests
+        )
+        self._owns_transport = transport is None
+        self._reconcile_task = None
+    
+    async def close(self) -> None:
+        """
+        Release the client's transport (shared transports are left open)
+        """
+        if self.token_manager is not None:
+            await self.token_manager.close()
+        task, self._reconcile_task = self._reconcile_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if self._owns_transport:
+            await self.transport.close()
+    
+    async def __aenter__(self) -> "AsyncSecureAddressBridge":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    def _create_token_manager(self, refresh_margin: float) -> TokenManager:
+        return AsyncTokenManager(self._fetch_token, refresh_margin=refresh_margin)
+    
+    def _create_coalescer(self) -> RequestCoalescer:
+        return AsyncRequestCoalescer()
+    
+    async def refresh_access_token(self) -> Optional[str]:
+        """
+        Async version of SecureAddressBridge.refresh_access_token
+        """
+        if self.token_manager is None:
+            raise Exception("Token refresh requires auto_refresh=True")
+        
+        return await self.token_manager.refresh()
+    
+    async def _fetch_token(self, refresh_token: Optional[str]) -> Dict[str, Any]:
+        if refresh_token:
+            return await self._send(self._refresh_token_request(refresh_token))
+        self._check_renewable()
+        return await self._send(self._authenticate_request())
+    
+    async def _ensure_token(self) -> None:
+        """
+        Refresh an expired managed token before a request is built
+        """
+        if self.token_manager is not None:
+            await self.token_manager.ensure_token()
+    
+    async def _send_raw(self, request: ApiRequest) -> BufferedResponse:
+        if self.coalescer is not None and request.method == "GET":
+            return await self.coalescer.run(request, self._send_instrumented)
+        return await self._send_instrumented(request)
+    
+    async def _send_instrumented(self, request: ApiRequest) -> BufferedResponse:
+        if self.instrumentation is None:
+            return await self._send_attempts(request)
+        
+        call = self.instrumentation.start(request)
+        try:
+            response = await self._send_attempts(request, call)
+        except Exception as e:
+            call.finish(error=e)
+            raise
+        call.finish(response)
+        return response
+    
+    async def _send_attempts(self, request: ApiRequest, call: _InstrumentedCall = None) -> BufferedResponse:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            
+            if self.quota is not None:
+                self._record_quota(request)
+            
+            response = error = None
+            try:
+                response = await self.transport.request(
+                    request.method,
+                    request.url,
+                    headers=request.headers,
+                    params=request.params,
+                    json=request.body
+                )
+            except Exception as e:
+                error = e
+            
+            delay = self._retry_delay(request, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            
+            attempt += 1
+            if call is not None:
+                call.attempts += 1
+            await asyncio.sleep(delay)
+    
+    async def _send(self, request: ApiRequest, model: type = None, conditional: bool = True) -> Dict[str, Any]:
+        if self.etag_cache is None or request.method != "GET" or not conditional:
+            return self._parse_response(request, await self._send_raw(request), model if self.response_models else None)
+        
+        request, entry = self.etag_cache.prepare(request)
+        response = self.etag_cache.resolve(request, await self._send_raw(request), entry)
+        return self._parse_response(request, response, model if self.response_models else None)
+    
+    def _record_quota(self, request: ApiRequest) -> None:
+        self.quota.record(_endpoint_label(request))
+        # usage-stats needs a token; reconcile once the client has one
+        running = self._reconcile_task is not None and not self._reconcile_task.done()
+        if self._access_token and not running and self.quota.reconcile_due():
+            # Keep a reference so the task is not garbage-collected mid-request
+            self._reconcile_task = asyncio.ensure_future(self._background_reconcile())
+    
+    async def _background_reconcile(self) -> None:
+        try:
+            await self.get_usage_stats()
+        except Exception as e:
+            self.quota.reconcile_failed()
+            logger.warning("Quota reconciliation failed: %s", e)
+    
+    async def configure_rate_limit(self, usage_stats: Dict[str, Any] = None) -> Optional[TokenBucket]:
+        """
+        Async version of SecureAddressBridge.configure_rate_limit
+        """
+        if usage_stats is None:
+            usage_stats = await self.get_usage_stats()
+        return SecureAddressBridge.configure_rate_limit(self, usage_stats)
+    
+    async def authenticate(self) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.authenticate
+        """
+        data = await self._send(self._authenticate_request())
+        self._store_token(data, app_token=True)
+        
+        return data
+    
+    async def exchange_code(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.exchange_code
+        """
+        data = await self._send(self._exchange_code_request(options))
+        self._store_token(data)
+        
+        return data
+    
+    async def get_address(self, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.get_address
+        """
+        await self._ensure_token()
+        cache_key = self._address_cache_key(options)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        data = await self._send(self._get_address_request(options), Address)
+        self._cache_response(cache_key, data)
+        
+        return data
+    
+    async def get_addresses(
+        self,
+        tokens: Iterable[str],
+        fields: List[str] = None,
+        include_verification_info: bool = False,
+        concurrency: int = 16,
+        batch_size: int = 100,
+        use_batch_endpoint: bool = True
+    ) -> AsyncIterator[AddressResult]:
+        """
+        Async version of SecureAddressBridge.get_addresses (an async iterator)
+        """
+        await self._ensure_token()
+        options = self._bulk_address_options(fields, include_verification_info)
+        tokens = iter(tokens)
+        
+        if use_batch_endpoint and self.access_token and self._batch_address_supported is not False:
+            first = list(itertools.islice(tokens, batch_size))
+            results = await self._fetch_address_batch(first, options)
+            if results is not None:
+                for result in results:
+                    yield result
+                
+                async def fetch_batch(chunk: List[str]) -> List[AddressResult]:
+                    return await self._fetch_address_batch_or_each(chunk, options)
+                
+                async for results in _abounded_map(fetch_batch, _chunks(tokens, batch_size), concurrency):
+                    for result in results:
+                        yield result
+                return
+            tokens = itertools.chain(first, tokens)
+        
+        async for result in _abounded_map(lambda token: self._fetch_one_address(token, options), tokens, concurrency):
+            yield result
+    
+    async def _validate_locally(self, token: str) -> Optional[Dict[str, Any]]:
+        parsed = self.token_validator.parse(token)
+        if parsed is None:
+            return None
+        
+        if self.token_validator.needs_refresh(parsed):
+            try:
+                self.token_validator.update_keys(await self._send(self._jwks_request()))
+            except Exception:
+                return None
+        
+        return self.token_validator.verify(parsed, self.app_id)
+    
+    async def _fetch_one_address(self, token: str, options: Dict[str, Any]) -> AddressResult:
+        try:
+            return AddressResult(token, address=await self.get_address(dict(options, access_token=token)))
+        except Exception as e:
+            return AddressResult(token, error=e)
+    
+    async def _fetch_address_batch(
+        self,
+        tokens: List[str],
+        options: Dict[str, Any]
+    ) -> Optional[List[AddressResult]]:
+        request = self._address_batch_request(tokens, options)
+        try:
+            response = await self._send_raw(request)
+            return self._address_batch_results(tokens, request, response)
+        except Exception as e:
+            return [AddressResult(token, error=e) for token in tokens]
+    
+    async def _fetch_address_batch_or_each(self, tokens: List[str], options: Dict[str, Any]) -> List[AddressResult]:
+        results = await self._fetch_address_batch(tokens, options)
+        if results is None:
+            results = [await self._fetch_one_address(token, options) for token in tokens]
+        return results
+    
+    async def register_webhook(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.register_webhook
+        """
+        await self._ensure_token()
+        return await self._send(self._register_webhook_request(options), WebhookRegistration)
+    
+    async def link_address_to_wallet(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.link_address_to_wallet
+        """
+        await self._ensure_token()
+        return await self._send(self._link_address_to_wallet_request(options))
+    
+    async def link_wallets(
+        self,
+        links: Iterable[Dict[str, Any]],
+        concurrency: int = 16,
+        checkpoint: Union[str, LinkCheckpoint] = None,
+        defer_credentials: bool = False,
+        group_by_chain: bool = True
+    ) -> AsyncIterator[LinkResult]:
+        """
+        Async version of SecureAddressBridge.link_wallets (an async iterator)
+        """
+        await self._ensure_token()
+        checkpoint, owns_checkpoint = self._open_link_checkpoint(checkpoint)
+        try:
+            for group in self._plan_wallet_links(links, checkpoint, defer_credentials, group_by_chain):
+                async for result in _abounded_map(self._link_one_wallet, group, concurrency):
+                    self._checkpoint_link(checkpoint, result)
+                    yield result
+        finally:
+            if owns_checkpoint:
+                checkpoint.close()
+    
+    async def _link_one_wallet(self, item: Tuple[int, Dict[str, Any], bool]) -> LinkResult:
+        index, options, credential_pending = item
+        client = self.for_token(options["access_token"]) if options.get("access_token") else self
+        try:
+            link = await client.link_address_to_wallet(options)
+            return LinkResult(index, options["wallet_address"], options["chain_id"], link=link, credential_pending=credential_pending)
+        except Exception as e:
+            return LinkResult(index, options["wallet_address"], options["chain_id"], error=e, credential_pending=credential_pending)
+    
+    async def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.get_usage_stats
+        """
+        await self._ensure_token()
+        mark = self.quota.mark() if self.quota is not None else None
+        data = await self._send(self._get_usage_stats_request())
+        if self.quota is not None:
+            self.quota.reconcile(data, mark)
+        
+        return data
+    
+    async def refresh_capabilities(self) -> CarrierIndex:
+        """
+        Async version of SecureAddressBridge.refresh_capabilities
+        """
+        return self._apply_capabilities(await self._send(self._capabilities_request()))
+    
+    async def create_blind_shipping_token(self, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.create_blind_shipping_token
+        """
+        await self._ensure_token()
+        return await self._send(self._create_blind_shipping_token_request(options), ShippingToken)
+    
+    async def request_shipment(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.request_shipment
+        """
+        return await self._send(self._request_shipment_request(options))
+    
+    async def request_shipments(
+        self,
+        shipments: Iterable[Dict[str, Any]],
+        concurrency: int = 16,
+        batch_size: int = 50,
+        use_batch_endpoint: bool = True,
+        idempotency_namespace: str = ""
+    ) -> AsyncIterator[ShipmentResult]:
+        """
+        Async version of SecureAddressBridge.request_shipments (an async iterator)
+        """
+        prepared = self._prepare_shipments(shipments, idempotency_namespace)
+        
+        if use_batch_endpoint and prepared and self._batch_shipment_supported is not False:
+            chunks = list(_chunks(prepared, batch_size))
+            results = await self._submit_shipment_batch(chunks[0])
+            if results is not None:
+                for result in results:
+                    yield result
+                async for results in _aordered_bounded_map(self._submit_shipment_batch_or_each, chunks[1:], concurrency):
+                    for result in results:
+                        yield result
+                return
+        
+        async for result in _aordered_bounded_map(self._submit_one_shipment, prepared, concurrency):
+            yield result
+    
+    async def _submit_one_shipment(self, item: Tuple[int, Dict[str, Any]]) -> ShipmentResult:
+        index, options = item
+        try:
+            return ShipmentResult(index, options["idempotency_key"], shipment=await self.request_shipment(options))
+        except Exception as e:
+            return ShipmentResult(index, options["idempotency_key"], error=e)
+    
+    async def _submit_shipment_batch(
+        self,
+        items: List[Tuple[int, Dict[str, Any]]]
+    ) -> Optional[List[ShipmentResult]]:
+        request = self._shipment_batch_request(items)
+        try:
+            response = await self._send_raw(request)
+            return self._shipment_batch_results(items, request, response)
+        except Exception as e:
+            return [ShipmentResult(index, options["idempotency_key"], error=e) for index, options in items]
+    
+    async def _submit_shipment_batch_or_each(self, items: List[Tuple[int, Dict[str, Any]]]) -> List[ShipmentResult]:
+        results = await self._submit_shipment_batch(items)
+        if results is None:
+            results = [await self._submit_one_shipment(item) for item in items]
+        return results
+    
+    async def get_tracking_info(self, tracking_number: str, carrier: str) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.get_tracking_info
+        """
+        cache_key = self._tracking_cache_key(tracking_number, carrier)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        data = await self._send(self._get_tracking_info_request(tracking_number, carrier), TrackingInfo)
+        self._cache_tracking(tracking_number, carrier, data)
+        
+        return data
+    
+    async def confirm_delivery(self, tracking_number: str, carrier: str) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.confirm_delivery
+        """
+        await self._ensure_token()
+        return await self._send(self._confirm_delivery_request(tracking_number, carrier))
+    
+    def subscribe_tracking(
+        self,
+        shipments: Iterable[Tuple[str, str]] = (),
+        event_types: Iterable[str] = None,
+        subscription_id: str = None,
+        cursor: str = None,
+        **options: Any
+    ) -> AsyncTrackingSubscription:
+        """
+        Async version of SecureAddressBridge.subscribe_tracking
+        """
+        return AsyncTrackingSubscription(
+            self,
+            shipments,
+            event_types=event_types,
+            subscription_id=subscription_id,
+            cursor=cursor,
+            **options
+        )
+    
+    async def create_tracking_subscription(
+        self,
+        shipments: Iterable[Tuple[str, str]],
+        event_types: Iterable[str] = None,
+        cursor: str = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.create_tracking_subscription
+        """
+        await self._ensure_token()
+        return await self._send(self._create_tracking_subscription_request(shipments, event_types, cursor))
+    
+    async def get_tracking_events(
+        self,
+        subscription_id: str,
+        cursor: str = None,
+        wait: float = 25.0,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.get_tracking_events
+        """
+        await self._ensure_token()
+        return await self._send(self._get_tracking_events_request(subscription_id, cursor, wait, limit), conditional=False)
+    
+    async def update_tracking_subscription(
+        self,
+        subscription_id: str,
+        add: Iterable[Tuple[str, str]] = (),
+        remove: Iterable[Tuple[str, str]] = ()
+    ) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.update_tracking_subscription
+        """
+        await self._ensure_token()
+        return await self._send(self._update_tracking_subscription_request(subscription_id, add, remove))
+    
+    async def validate_token(self, token: str = None) -> Dict[str, Any]:
+        """
+        Async version of SecureAddressBridge.validate_token
+        """
+        await self._ensure_token()
+        token = token or self.access_token
+        if not token:
+            return {"valid": False, "error": "No access token provided"}
+        
+        cache_key = ("validate", token) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if self.token_validator is not None:
+            result = await self._validate_locally(token)
+            if result is not None:
+                return result
+        
+        try:
+            response = await self._send_raw(self._validate_token_request(token))
+            result = self._validation_result(response)
+        
+        except Exception as e:
+            return {
+                "valid": False,
+                "error": str(e)
+            }
+        
+        if result["valid"]:
+            self._cache_response(cache_key, result)
+        
+        return result
+
+
+class AsyncClientRegistry(ClientRegistry):
+    """
+    ClientRegistry for AsyncSecureAddressBridge clients sharing one aiohttp session
+    """
+
+    client_class = AsyncSecureAddressBridge
+
+    def _create_transport(self) -> Any:
+        return AsyncHttpTransport()
+
+    async def get(self, app_id: str) -> AsyncSecureAddressBridge:
+        """
+        Async version of ClientRegistry.get
+        """
+        while True:
+            client = self._clients.get(app_id)
+            if client is not None:
+                self._touch(app_id)
+                for stale in self._collect_evictions():
+                    self._close_client(stale)
+                return client
+
+            if app_id not in self._credentials:
+                raise KeyError(f"Unknown tenant: {app_id}")
+            flight = self._flights.get(app_id)
+            if flight is None:
+                break
+            result = await _join_flight(flight)
+            if result is not _LEADER_CANCELLED:
+                return result
+
+        flight = self._flights[app_id] = asyncio.get_event_loop().create_future()
+        try:
+            client, evicted = await self._create_current_client(app_id)
+            flight.set_result(client)
+            for stale in evicted:
+                self._close_client(stale)
+        except Exception as e:
+            flight.set_exception(e)
+        finally:
+            self._flights.pop(app_id, None)
+            _release_flight(flight)
+        return await flight
+
+    __getitem__ = get
+
+    async def _create_current_client(
+        self,
+        app_id: str
+    ) -> Tuple[AsyncSecureAddressBridge, List[AsyncSecureAddressBridge]]:
+        while True:
+            generation = self._generation(app_id)
+            client = await self._create_client(app_id)
+            evicted = self._install(app_id, client, generation)
+            if evicted is not None:
+                return client, evicted
+            self._close_client(client)
+
+    async def _create_client(self, app_id: str) -> AsyncSecureAddressBridge:
+        with self._lock:
+            kwargs = self._client_kwargs(app_id)
+            load_capabilities = self.load_capabilities and app_id not in self._carrier_indexes
+        client = self.client_class(**kwargs)
+        try:
+            token = self._saved_token(app_id)
+            if token is not None:
+                client._store_token(token, app_token=True)
+            else:
+                await client.authenticate()
+            if load_capabilities:
+                await client.refresh_capabilities()
+        except BaseException:
+            self._close_client(client)
+            raise
+        return client
+
+    def _close_client(self, client: AsyncSecureAddressBridge) -> None:
+        # Clients share the registry's transport, so closing only cancels token refreshes
+        if client.token_manager is not None:
+            client.token_manager.cancel()
+
+    async def close(self) -> None:
+        """
+        Close every tenant client and the registry's transport
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._last_used.clear()
+        for client in clients:
+            await client.close()
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def __aenter__(self) -> "AsyncClientRegistry":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
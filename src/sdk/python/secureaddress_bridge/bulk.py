@@ -0,0 +1,109 @@
+# SecureAddress Bridge Python SDK: bounded-concurrency helpers for bulk operations
+
+import hashlib
+import itertools
+import json
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split an iterable into lists of at most `size` items without materializing it
+    """
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bounded_map(func: Callable[[Any], Any], items: Iterable[Any], concurrency: int) -> Iterator[Any]:
+    """
+    Run func over items on a thread pool, keeping at most `concurrency` calls in
+    flight, and yield the results as they complete
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {executor.submit(func, item) for item in itertools.islice(items, concurrency)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for item in itertools.islice(items, len(done)):
+                pending.add(executor.submit(func, item))
+            for future in done:
+                yield future.result()
+
+
+def _ordered_bounded_map(func: Callable[[Any], Any], items: Iterable[Any], concurrency: int) -> Iterator[Any]:
+    """
+    Like _bounded_map, but yield the results in input order
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        window = deque(executor.submit(func, item) for item in itertools.islice(items, concurrency))
+        while window:
+            future = window.popleft()
+            for item in itertools.islice(items, 1):
+                window.append(executor.submit(func, item))
+            yield future.result()
+
+
+class LinkCheckpoint:
+    """
+    Append-only JSON-lines record of completed wallet links
+
+    Lets a bulk link_wallets run resume after a crash without re-linking
+    wallets, and remembers which links still need their verifiable credential.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a checkpoint file
+
+        Args:
+            path: Path of the JSON-lines checkpoint file
+        """
+        self.path = path
+        self._state = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted run
+                        continue
+                    self._state[entry["key"]] = entry
+        except FileNotFoundError:
+            pass
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def key(wallet_address: str, chain_id: Any) -> str:
+        return hashlib.sha256(f"{chain_id}|{wallet_address}".encode("utf-8")).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._state.get(key)
+
+    def record(self, key: str, link_id: Optional[str], credential_pending: bool) -> None:
+        entry = {"key": key, "link_id": link_id, "credential_pending": credential_pending}
+        self._state[key] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def pending_credentials(self) -> int:
+        return sum(1 for entry in self._state.values() if entry.get("credential_pending"))
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "LinkCheckpoint":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,500 @@
+# SecureAddress Bridge Python SDK: response caching and conditional requests
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .models import ApiRequest, ResponseModel, _RESPONSE_MODELS, _json_loads, _json_size
+from .transport import BufferedResponse
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Bounded in-memory TTL + LRU cache for get_address and validate_token
+    responses (and get_tracking_info responses when tracking_ttl is set)
+
+    Entries are keyed on the access token plus the request options that shape the
+    response, expire after `ttl` seconds and are evicted least-recently-used once
+    `max_entries` or `max_bytes` is exceeded. Cached responses are shared between
+    callers and must be treated as read-only.
+    """
+
+    # Webhook events after which cached data for the affected user is stale
+    INVALIDATING_EVENTS = frozenset([
+        "address.updated",
+        "address.verified",
+        "permission.revoked",
+        "permission.created"
+    ])
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000, max_bytes: int = None, tracking_ttl: float = None):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds an entry stays fresh
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses (serialized JSON
+                length); unbounded when omitted
+            tracking_ttl: Seconds to cache get_tracking_info responses (not
+                cached when omitted)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.tracking_ttl = tracking_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._token_keys = {}
+        self._user_tokens = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Any]:
+        """
+        Return the cached value for a key, or None when missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: tuple, value: Any, token: str, ttl: float = None) -> None:
+        """
+        Cache a value for a key belonging to an access token
+        """
+        size = _json_size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value, size)
+            self._token_keys.setdefault(token, set()).add(key)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def associate_user(self, token: str, user_id: str) -> None:
+        """
+        Record which user a token belongs to, so user-level webhook events can
+        invalidate it
+        """
+        with self._lock:
+            self._user_tokens.setdefault(user_id, set()).add(token)
+
+    def invalidate_token(self, token: str) -> int:
+        """
+        Drop every cached response for an access token
+
+        Returns:
+            The number of entries removed
+        """
+        with self._lock:
+            keys = self._token_keys.pop(token, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Drop every cached response for the tokens associated with a user
+
+        Returns:
+            The number of entries removed
+        """
+        with self._lock:
+            tokens = self._user_tokens.pop(user_id, set())
+        return sum(self.invalidate_token(token) for token in tokens)
+
+    def handle_webhook_event(self, event: Dict[str, Any]) -> int:
+        """
+        Invalidate cached responses made stale by a webhook event
+
+        Args:
+            event: The decoded webhook payload (uses event_type, user_id and,
+                when present, access_token)
+
+        Returns:
+            The number of entries removed
+        """
+        if event.get("event_type") not in self.INVALIDATING_EVENTS:
+            return 0
+
+        removed = 0
+        if event.get("access_token"):
+            removed += self.invalidate_token(event["access_token"])
+        if event.get("user_id"):
+            removed += self.invalidate_user(event["user_id"])
+        return removed
+
+    def clear(self) -> None:
+        """
+        Drop every cached response
+        """
+        with self._lock:
+            self._entries.clear()
+            self._token_keys.clear()
+            self._user_tokens.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and current occupancy
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+    def _remove(self, key: tuple) -> None:
+        # Callers must hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+            keys = self._token_keys.get(key[1])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._token_keys[key[1]]
+
+
+class PersistentCache(ResponseCache):
+    """
+    SQLite-backed ResponseCache that survives restarts and is shared by
+    every process using the same file
+
+    Keys and tokens are stored only as SHA-256 digests, and with an
+    encryption_key (requires the `crypto` extra) cached payloads are
+    encrypted at rest with Fernet. Entries expire after their TTL (wall-clock
+    time) and, once max_entries or max_bytes is exceeded, the entries closest
+    to expiry are evicted. The database runs in WAL mode, so concurrent
+    readers never block writers in other processes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 300.0,
+        max_entries: int = 100000,
+        max_bytes: int = None,
+        encryption_key: Union[str, bytes] = None,
+        tracking_ttl: float = None,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            path: Path of the SQLite database file
+            ttl: Seconds an entry stays fresh
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached payloads; unbounded when omitted
+            encryption_key: Fernet key (see generate_key) used to encrypt payloads
+            tracking_ttl: Seconds to cache get_tracking_info responses (not cached when omitted)
+            timeout: Seconds to wait for another process's write lock
+        """
+        super().__init__(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes, tracking_ttl=tracking_ttl)
+        self.path = path
+        self.timeout = timeout
+        self._fernet = None
+        if encryption_key is not None:
+            try:
+                from cryptography.fernet import Fernet
+            except ImportError:
+                raise ImportError(
+                    "Cache encryption requires cryptography. Install it with: pip install secureaddress-bridge[crypto]"
+                )
+            self._fernet = Fernet(encryption_key)
+        self._connection = None
+        self._pid = None
+        with self._lock:
+            self._connect()
+
+    @staticmethod
+    def generate_key() -> bytes:
+        """
+        Return a new random encryption key (requires the `crypto` extra)
+        """
+        from cryptography.fernet import Fernet
+        return Fernet.generate_key()
+
+    def _connect(self) -> Any:
+        # Callers must hold the lock; connections are never shared across a fork
+        if self._connection is None or self._pid != os.getpid():
+            import sqlite3
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "size INTEGER NOT NULL, model TEXT, value BLOB NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_token ON entries (token)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS user_tokens (user_id TEXT NOT NULL, token TEXT NOT NULL, "
+                "PRIMARY KEY (user_id, token))"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value).encode("utf-8")).hexdigest()
+
+    def _encode(self, value: Any) -> Tuple[Optional[str], bytes]:
+        if isinstance(value, ResponseModel):
+            model = type(value).__name__
+            payload = value.raw if value.raw is not None else json.dumps(value.to_dict())
+        else:
+            model = None
+            payload = json.dumps(value)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        if self._fernet is not None:
+            payload = self._fernet.encrypt(payload)
+        return model, payload
+
+    def _decode(self, model: Optional[str], payload: bytes) -> Any:
+        if self._fernet is not None:
+            payload = self._fernet.decrypt(payload)
+        model_class = _RESPONSE_MODELS.get(model) if model else None
+        if model_class is not None:
+            return model_class(payload)
+        return _json_loads(payload)
+
+    def get(self, key: tuple) -> Optional[Any]:
+        """
+        Return the cached value for a key, or None when missing or expired
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT expires_at, model, value FROM entries WHERE key = ?", (self._digest(key),)
+            ).fetchone()
+            if row is None or row[0] <= time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            return self._decode(row[1], row[2])
+        except Exception as e:
+            # Written with another key, or corrupted: treat as a miss
+            logger.warning("Discarding unreadable cache entry (%s)", type(e).__name__)
+            with self._lock:
+                self._connect().execute("DELETE FROM entries WHERE key = ?", (self._digest(key),))
+            return None
+
+    def set(self, key: tuple, value: Any, token: str, ttl: float = None) -> None:
+        """
+        Cache a value for a key belonging to an access token
+        """
+        model, payload = self._encode(value)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, token, expires_at, size, model, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._digest(key), self._digest(token), expires_at, len(payload), model, payload)
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: Any) -> None:
+        # Callers must hold the lock
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        count, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        excess = max(count - self.max_entries, 0)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Count how many of the soonest-expiring entries must go to get under the byte limit
+            freed = needed = 0
+            for (entry_size,) in connection.execute("SELECT size FROM entries ORDER BY expires_at"):
+                if size - freed <= self.max_bytes:
+                    break
+                freed += entry_size
+                needed += 1
+            excess = max(excess, needed)
+        if excess:
+            connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY expires_at LIMIT ?)", (excess,)
+            )
+            self.evictions += excess
+
+    def associate_user(self, token: str, user_id: str) -> None:
+        """
+        Record which user a token belongs to, so user-level webhook events can
+        invalidate it
+        """
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR IGNORE INTO user_tokens (user_id, token) VALUES (?, ?)",
+                (self._digest(user_id), self._digest(token))
+            )
+
+    def invalidate_token(self, token: str) -> int:
+        """
+        Drop every cached response for an access token
+
+        Returns:
+            The number of entries removed
+        """
+        with self._lock:
+            return self._connect().execute("DELETE FROM entries WHERE token = ?", (self._digest(token),)).rowcount
+
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Drop every cached response for the tokens associated with a user
+
+        Returns:
+            The number of entries removed
+        """
+        user = self._digest(user_id)
+        with self._lock:
+            connection = self._connect()
+            removed = connection.execute(
+                "DELETE FROM entries WHERE token IN (SELECT token FROM user_tokens WHERE user_id = ?)", (user,)
+            ).rowcount
+            connection.execute("DELETE FROM user_tokens WHERE user_id = ?", (user,))
+            return removed
+
+    def clear(self) -> None:
+        """
+        Drop every cached response
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM entries")
+            connection.execute("DELETE FROM user_tokens")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters (for this process) and current occupancy
+        """
+        with self._lock:
+            count, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": count,
+                "bytes": size
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class ETagCache:
+    """
+    Remembers the ETag and body of recent GET responses so that repeat
+    requests are sent with If-None-Match, and a 304 Not Modified is answered
+    from memory instead of transferring the payload again
+
+    Entries are keyed by URL, query parameters and access token; the least
+    recently used are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of responses to remember
+        """
+        self.max_entries = max_entries
+        self.not_modified = 0
+        self.modified = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: ApiRequest) -> tuple:
+        return (
+            request.url,
+            json.dumps(request.params, sort_keys=True) if request.params else None,
+            (request.headers or {}).get("Authorization")
+        )
+
+    def prepare(self, request: ApiRequest) -> Tuple[ApiRequest, Optional[tuple]]:
+        """
+        Make a request conditional if its last response carried an ETag
+
+        Returns:
+            (request, entry): the request (with If-None-Match when an entry
+            exists) and the entry to pass to resolve
+        """
+        with self._lock:
+            entry = self._entries.get(self.key(request))
+        if entry is None:
+            return request, None
+        return request._replace(headers=dict(request.headers or {}, **{"If-None-Match": entry[0]})), entry
+
+    def resolve(self, request: ApiRequest, response: Any, entry: Optional[tuple]) -> Any:
+        """
+        Turn a 304 into the stored response, and remember the ETag of a fresh one
+        """
+        key = self.key(request)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.not_modified += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return BufferedResponse(200, entry[1], entry[2])
+
+        if response.status_code != 200:
+            return response
+
+        headers = dict(response.headers)
+        etag = next((value for name, value in headers.items() if name.lower() == "etag"), None)
+        with self._lock:
+            if entry is not None:
+                self.modified += 1
+            if etag is None:
+                self._entries.pop(key, None)
+                return response
+            self._entries[key] = (etag, headers, response.content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return how many conditional requests were answered 304 or with a new body
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "not_modified": self.not_modified, "modified": self.modified}
@@ -0,0 +1,69 @@
+# SecureAddress Bridge Python SDK: carrier capability index
+
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping
+
+
+class CarrierIndex:
+    """
+    Immutable, set-based index of supported carriers and their shipping methods
+
+    Built once per client (or shared between clients) so that carrier and
+    service validation is a constant-time set lookup per item.
+    """
+
+    __slots__ = ("carriers", "methods", "_pairs")
+
+    def __init__(self, shipping_methods: Mapping[str, Iterable[str]], carriers: Iterable[str] = None):
+        """
+        Initialize the index
+
+        Args:
+            shipping_methods: Supported shipping methods for each carrier
+            carriers: Supported carriers (defaults to the carriers in shipping_methods)
+        """
+        carriers = frozenset(carriers if carriers is not None else shipping_methods)
+        methods = {carrier: frozenset(shipping_methods.get(carrier, ())) for carrier in carriers}
+        object.__setattr__(self, "carriers", carriers)
+        object.__setattr__(self, "methods", MappingProxyType(methods))
+        object.__setattr__(self, "_pairs", frozenset(
+            (carrier, method) for carrier, carrier_methods in methods.items() for method in carrier_methods
+        ))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CarrierIndex is immutable")
+
+    @classmethod
+    def from_capabilities(cls, data: Dict[str, Any]) -> "CarrierIndex":
+        """
+        Build an index from a capabilities endpoint response
+
+        Accepts {"carriers": {"usps": ["Priority", ...]}} or
+        {"carriers": [{"carrier": "usps", "services": ["Priority", ...]}]}
+        """
+        carriers = data.get("carriers", {})
+        if isinstance(carriers, list):
+            carriers = {item["carrier"]: item.get("services", item.get("shipping_methods", [])) for item in carriers}
+        return cls(carriers)
+
+    def supports_carrier(self, carrier: str) -> bool:
+        return carrier in self.carriers
+
+    def supports(self, carrier: str, method: str) -> bool:
+        return (carrier, method) in self._pairs
+
+    def invalid_methods(self, carriers: Iterable[str], methods: Iterable[str]) -> List[str]:
+        """
+        Return "<method> for <carrier>" for every requested method a carrier lacks
+        """
+        methods = list(methods)
+        wanted = frozenset(methods)
+        invalid = []
+        for carrier in carriers:
+            missing = wanted - self.methods.get(carrier, frozenset())
+            if missing:
+                invalid.extend(f"{method} for {carrier}" for method in methods if method in missing)
+        return invalid
+
+    def as_shipping_methods(self) -> Dict[str, List[str]]:
+        return {carrier: sorted(methods) for carrier, methods in self.methods.items()}
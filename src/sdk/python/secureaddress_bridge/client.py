@@ -0,0 +1,1877 @@
+# SecureAddress Bridge Python SDK: client
+
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import OrderedDict
+from types import FunctionType, MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .bulk import LinkCheckpoint, _bounded_map, _chunks, _ordered_bounded_map
+from .cache import ETagCache, ResponseCache
+from .carriers import CarrierIndex
+from .coalescing import RequestCoalescer
+from .errors import RateLimitError, SecureAddressError, _error_data, _error_message, _retry_after
+from .instrumentation import Instrumentation, _InstrumentedCall, _endpoint_label
+from .models import (
+    Address, AddressResult, ApiRequest, LinkResult, ShipmentResult, ShippingToken, TrackingInfo, WebhookRegistration,
+    _JSON_OBJECT, _json_loads, _parsed
+)
+from .policies import QuotaTracker, RetryPolicy, TokenBucket
+from .tokens import LocalTokenValidator, TokenManager
+from .tracking import TrackingSubscription
+from .transport import HttpTransport
+from .webhooks import WebhookVerifier
+
+logger = logging.getLogger(__name__)
+
+
+def _field_paths(fields: Union[Iterable[str], Dict[str, Any]]) -> List[str]:
+    """
+    Flatten a field projection into dotted paths
+
+    Accepts dotted paths (["city", "verification.method"]) or a nested dict
+    whose values are True, a list of sub-fields or another dict
+    ({"city": True, "verification": ["method", "verified"]}).
+    """
+    if isinstance(fields, dict):
+        paths = []
+        for name, value in fields.items():
+            if value is True:
+                paths.append(name)
+            elif value:
+                paths.extend(f"{name}.{path}" for path in _field_paths(value))
+    else:
+        paths = list(fields)
+
+    for path in paths:
+        if not isinstance(path, str) or "," in path or not all(path.split(".")):
+            raise ValueError(f"Invalid field path: {path!r}")
+    return paths
+
+
+def _projects_verification(paths: List[str]) -> bool:
+    return any(path.split(".", 1)[0] == "verification" for path in paths)
+
+
+class TokenContext:
+    """
+    Immutable per-user view of a client, created with client.for_token(token)
+
+    Every method of the client is available and runs with this context's
+    access token, while sharing the client's transport, cache, rate limiter
+    and other state. A context holds two references, so creating one per
+    request is cheap, and many threads can use contexts for different users
+    on one client without locking. Its token cannot be changed: authenticate,
+    exchange_code and refresh_access_token raise before sending anything;
+    call for_token() again instead. Quota accounting stays on the client.
+    """
+
+    __slots__ = ("_client", "_token")
+
+    # The context's token is fixed, so the client's token manager never applies
+    token_manager = None
+
+    def __init__(self, client: "SecureAddressBridge", token: str):
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "_token", token)
+
+    @property
+    def access_token(self) -> str:
+        return self._token
+
+    @property
+    def _access_token(self) -> str:
+        return self._token
+
+    @property
+    def client(self) -> "SecureAddressBridge":
+        return self._client
+
+    def for_token(self, token: str) -> "TokenContext":
+        return TokenContext(self._client, token)
+
+    def authenticate(self, *args: Any, **kwargs: Any) -> Any:
+        raise Exception(self._fixed_token_message("authenticate"))
+
+    def exchange_code(self, *args: Any, **kwargs: Any) -> Any:
+        raise Exception(self._fixed_token_message("exchange_code"))
+
+    def refresh_access_token(self, *args: Any, **kwargs: Any) -> Any:
+        raise Exception(self._fixed_token_message("refresh_access_token"))
+
+    @staticmethod
+    def _fixed_token_message(method: str) -> str:
+        return (
+            f"{method}() would replace a TokenContext's fixed token; call it on the client "
+            "and use for_token() with the new token"
+        )
+
+    def _record_quota(self, request: ApiRequest) -> None:
+        # Quota belongs to the app, so it is reconciled under the client's token, not the user's
+        self._client._record_quota(request)
+
+    def __getattr__(self, name: str) -> Any:
+        client = self._client
+        for klass in type(client).__mro__:
+            if name in klass.__dict__:
+                attr = klass.__dict__[name]
+                if isinstance(attr, FunctionType):
+                    # Bind the client's methods to the context so they read its token
+                    return attr.__get__(self, type(client))
+                break
+        return getattr(client, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ("access_token", "_access_token", "token_manager"):
+            raise AttributeError("A TokenContext's token cannot be changed; use for_token() to create a new context")
+        # Shared state (e.g. batch endpoint support, carrier index) lives on the client
+        setattr(self._client, name, value)
+
+    def __repr__(self) -> str:
+        return f"TokenContext({type(self._client).__name__}, token=...{self._token[-4:] if self._token else None})"
+
+
+class SecureAddressBridge:
+    """
+    Python client for the SecureAddress Bridge API
+    """
+    
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        base_url: str = "https://api.secureaddress.bridge",
+        api_version: str = "v1",
+        supported_chains: List[str] = None,
+        supported_carriers: List[str] = None,
+        transport: HttpTransport = None,
+        cache: ResponseCache = None,
+        token_validator: LocalTokenValidator = None,
+        auto_refresh: bool = False,
+        refresh_margin: float = 60.0,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: TokenBucket = None,
+        carrier_index: CarrierIndex = None,
+        instrumentation: Instrumentation = None,
+        sandbox: bool = False,
+        quota: QuotaTracker = None,
+        response_models: bool = False,
+        coalesce_requests: bool = True,
+        conditional_requests: bool = False
+    ):
+        """
+        Initialize the SecureAddress Bridge client
+        
+        Args:
+            app_id: Your application ID
+            app_secret: Your application secret
+            base_url: The base URL of the SecureAddress Bridge API
+            api_version: The API version to use
+            supported_chains: List of supported blockchain networks
+            supported_carriers: List of supported shipping carriers
+            transport: Shared HttpTransport to send requests through (a private
+                pooled transport is created when omitted)
+            cache: Optional ResponseCache for get_address and validate_token
+            token_validator: Optional LocalTokenValidator that lets
+                validate_token check signed tokens without a network call
+            auto_refresh: Track the access token's expiry and refresh it
+                automatically before it expires
+            refresh_margin: Seconds before expiry at which to refresh
+            retry_policy: Retry policy for failed requests (defaults to
+                RetryPolicy(); pass RetryPolicy(max_retries=0) to disable)
+            rate_limiter: Optional TokenBucket shared by every request
+            carrier_index: Prebuilt CarrierIndex to share between clients
+                (built from the supported carriers and methods when omitted;
+                when given it also defines supported_carriers and
+                supported_shipping_methods)
+            instrumentation: Optional Instrumentation that records latency,
+                payload sizes, retries and errors for every call
+            sandbox: Answer every call from an in-process SandboxEngine
+                instead of the network (ignored when a transport is passed)
+            quota: Optional QuotaTracker that counts requests locally so
+                remaining_quota() needs no network call
+            response_models: Return lazily parsed, read-only Address,
+                TrackingInfo, ShippingToken and WebhookRegistration mappings
+                instead of dicts
+            coalesce_requests: Let concurrent identical GET requests share
+                one in-flight request
+            conditional_requests: Remember the ETag and body of GET responses
+                and repeat those requests with If-None-Match, reusing the
+                remembered body when the server answers 304 (off by default;
+                the remembered bodies are held until evicted)
+        """
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.base_url = base_url
+        self.api_version = api_version
+        self.token_manager = self._create_token_manager(refresh_margin) if auto_refresh else None
+        # Whether the current token came from authenticate() (and can be renewed with the app credentials)
+        self._app_token = False
+        self.access_token = None
+        self.supported_chains = supported_chains or ["ethereum"]
+        if carrier_index is not None:
+            self._set_carrier_tables(sorted(carrier_index.carriers), carrier_index.as_shipping_methods(), carrier_index)
+        else:
+            self._set_carrier_tables(supported_carriers or ["usps", "fedex", "ups"], {
+                "usps": ["Priority", "First-Class", "Ground", "Express"],
+                "fedex": ["Ground", "2Day", "Express", "Overnight"],
+                "ups": ["Ground", "Next Day Air", "2nd Day Air", "3 Day Select"]
+            })
+        self._owns_transport = transport is None
+        if transport is None:
+            if sandbox:
+                from .sandbox import SandboxTransport
+                transport = SandboxTransport()
+            else:
+                transport = HttpTransport()
+        self.transport = transport
+        self.cache = cache
+        self.token_validator = token_validator
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation
+        self.quota = quota
+        self.response_models = response_models
+        self.coalescer = self._create_coalescer() if coalesce_requests else None
+        self.etag_cache = ETagCache() if conditional_requests else None
+        self._webhook_verifiers = {}
+        # Whether the server exposes the batch address and shipment endpoints (None until probed)
+        self._batch_address_supported = None
+        self._batch_shipment_supported = None
+    
+    def close(self) -> None:
+        """
+        Release the client's transport (shared transports are left open)
+        """
+        if self.token_manager is not None:
+            self.token_manager.cancel()
+        if self._owns_transport:
+            self.transport.close()
+    
+    def __enter__(self) -> "SecureAddressBridge":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _send_raw(self, request: ApiRequest) -> Any:
+        """
+        Send a prepared request through the transport and return the raw response
+        
+        Applies the client-side rate limiter before every attempt and retries
+        according to the retry policy. Concurrent identical GETs share one
+        request when coalescing is on.
+        """
+        if self.coalescer is not None and request.method == "GET":
+            return self.coalescer.run(request, self._send_instrumented)
+        return self._send_instrumented(request)
+    
+    def _send_instrumented(self, request: ApiRequest) -> Any:
+        if self.instrumentation is None:
+            return self._send_attempts(request)
+        
+        call = self.instrumentation.start(request)
+        try:
+            response = self._send_attempts(request, call)
+        except Exception as e:
+            call.finish(error=e)
+            raise
+        call.finish(response)
+        return response
+    
+    def _send_attempts(self, request: ApiRequest, call: _InstrumentedCall = None) -> Any:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    time.sleep(wait)
+            
+            if self.quota is not None:
+                self._record_quota(request)
+            
+            response = error = None
+            try:
+                response = self.transport.request(
+                    request.method,
+                    request.url,
+                    headers=request.headers,
+                    params=request.params,
+                    json=request.body
+                )
+            except Exception as e:
+                error = e
+            
+            delay = self._retry_delay(request, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            
+            attempt += 1
+            if call is not None:
+                call.attempts += 1
+            time.sleep(delay)
+    
+    def _retry_delay(self, request: ApiRequest, attempt: int, response: Any, error: Optional[Exception]) -> Optional[float]:
+        """
+        Ask the retry policy for a backoff delay, pausing the rate limiter on 429s
+        """
+        if response is not None and response.status_code == 429 and self.rate_limiter is not None:
+            retry_after = _retry_after(response)
+            if retry_after:
+                self.rate_limiter.pause(retry_after)
+        
+        return self.retry_policy.retry_delay(request, attempt, response=response, error=error, transport=self.transport)
+    
+    def _send(self, request: ApiRequest, model: type = None, conditional: bool = True) -> Dict[str, Any]:
+        """
+        Send a prepared request and return its decoded JSON body (or a
+        `model` instance when the client uses response models)
+        
+        conditional=False keeps a GET out of the ETag cache (e.g. long polls,
+        whose answers are never repeated).
+        """
+        if self.etag_cache is None or request.method != "GET" or not conditional:
+            return self._parse_response(request, self._send_raw(request), model if self.response_models else None)
+        
+        request, entry = self.etag_cache.prepare(request)
+        response = self.etag_cache.resolve(request, self._send_raw(request), entry)
+        return self._parse_response(request, response, model if self.response_models else None)
+    
+    @staticmethod
+    def _parse_response(request: ApiRequest, response: Any, model: type = None) -> Dict[str, Any]:
+        """
+        Decode a response, raising SecureAddressError (or RateLimitError) on failure
+        
+        With a ResponseModel class the body is wrapped undecoded and parsed on first access;
+        bodies that are not framed as a JSON object are rejected up front.
+        """
+        if response.status_code != 200:
+            error_data = _error_data(response)
+            message = _error_message(error_data, request.error_message)
+            if response.status_code == 429:
+                raise RateLimitError(message, data=error_data, retry_after=_retry_after(response))
+            raise SecureAddressError(message, status=response.status_code, data=error_data)
+        
+        try:
+            if model is None:
+                return _json_loads(response.content)
+            if _JSON_OBJECT.match(response.content):
+                return model(response.content)
+        except ValueError:
+            pass
+        raise SecureAddressError(
+            f"{request.error_message}: invalid JSON in response",
+            status=response.status_code
+        )
+    
+    def configure_sandbox(self, config: Dict[str, Any]) -> None:
+        """
+        Configure the simulated API used in sandbox mode
+        
+        Args:
+            config: Dict containing sandbox options
+                - simulate_errors: Fail a fraction of requests (error_rate, default 0.1)
+                - error_status: Status code (or list of codes) for simulated errors
+                - verification_success: Whether tokens and addresses verify
+                - mock_address: Address fields returned by get_address
+                - latency: Seconds per request, a (min, max) range, or a callable
+        """
+        from .sandbox import SandboxTransport
+        
+        if not isinstance(self.transport, SandboxTransport):
+            raise Exception("Sandbox mode is not enabled. Create the client with sandbox=True.")
+        
+        self.transport.engine.configure(config)
+    
+    def _record_quota(self, request: ApiRequest) -> None:
+        self.quota.record(_endpoint_label(request))
+        # usage-stats needs a token; reconcile once the client has one
+        if self._access_token and self.quota.reconcile_due():
+            threading.Thread(target=self._background_reconcile, daemon=True).start()
+    
+    def _background_reconcile(self) -> None:
+        try:
+            self.get_usage_stats()
+        except Exception as e:
+            self.quota.reconcile_failed()
+            logger.warning("Quota reconciliation failed: %s", e)
+    
+    def for_token(self, token: str) -> TokenContext:
+        """
+        Return an immutable view of this client that uses `token` for every call
+        
+        Use one context per user (or per request) to serve many users from a
+        single client across threads; contexts share the client's transport
+        and are cheap to create.
+        
+        Args:
+            token: The user's access token
+        
+        Returns:
+            A TokenContext exposing the client's methods
+        """
+        return TokenContext(self, token)
+    
+    def remaining_quota(self) -> Optional[int]:
+        """
+        Return the requests left in the current quota window, without a network call
+        
+        Returns:
+            The locally tracked remaining quota, or None when the client has
+            no QuotaTracker or the limit is not known yet
+        """
+        if self.quota is None:
+            return None
+        return self.quota.remaining()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Return client-side request metrics and connection reuse counters
+        
+        Returns:
+            {"endpoints": per-endpoint stats (empty without instrumentation),
+             "connections": the transport's connection reuse counters,
+             "coalescing": requests sent and callers coalesced onto them,
+             "conditional": conditional requests answered 304 or with a new body}
+        """
+        return {
+            "endpoints": self.instrumentation.stats() if self.instrumentation is not None else {},
+            "connections": self.transport.connection_stats(),
+            "coalescing": self.coalescer.stats() if self.coalescer is not None else {},
+            "conditional": self.etag_cache.stats() if self.etag_cache is not None else {}
+        }
+    
+    def configure_rate_limit(self, usage_stats: Dict[str, Any] = None) -> Optional[TokenBucket]:
+        """
+        Match the client-side rate limiter to the quota reported by get_usage_stats
+        
+        Args:
+            usage_stats: A get_usage_stats result (fetched when omitted); reads
+                `rate_limit` (or `limit`) and `window_seconds` (default 60)
+        
+        Returns:
+            The configured TokenBucket, or None when no quota was reported
+        """
+        usage_stats = usage_stats if usage_stats is not None else self.get_usage_stats()
+        quota = usage_stats.get("rate_limit", usage_stats)
+        if not isinstance(quota, dict):
+            quota = {"limit": quota}
+        
+        limit = quota.get("limit")
+        if not limit:
+            return None
+        
+        window = float(quota.get("window_seconds", 60))
+        if self.rate_limiter is None:
+            self.rate_limiter = TokenBucket.from_quota(limit, window)
+        else:
+            self.rate_limiter.set_rate(limit / window)
+        return self.rate_limiter
+    
+    @property
+    def supported_carriers(self) -> Tuple[str, ...]:
+        """
+        The carriers shipment validation accepts
+        
+        Read-only; assign a new list to change them, which rebuilds the
+        carrier index.
+        """
+        return self._supported_carriers
+    
+    @supported_carriers.setter
+    def supported_carriers(self, carriers: Iterable[str]) -> None:
+        self._set_carrier_tables(carriers, self._supported_shipping_methods)
+    
+    @property
+    def supported_shipping_methods(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        The shipping methods shipment validation accepts for each carrier
+        
+        Read-only; assign a new mapping to change them, which rebuilds the
+        carrier index.
+        """
+        return self._supported_shipping_methods
+    
+    @supported_shipping_methods.setter
+    def supported_shipping_methods(self, shipping_methods: Mapping[str, Iterable[str]]) -> None:
+        self._set_carrier_tables(self._supported_carriers, shipping_methods)
+    
+    def _set_carrier_tables(
+        self,
+        carriers: Iterable[str],
+        shipping_methods: Mapping[str, Iterable[str]],
+        carrier_index: CarrierIndex = None
+    ) -> None:
+        """
+        Replace the supported carriers and methods, keeping the carrier index
+        (rebuilt unless one is given) in step with them
+        """
+        self._supported_carriers = tuple(carriers)
+        self._supported_shipping_methods = MappingProxyType(
+            {carrier: tuple(methods) for carrier, methods in shipping_methods.items()}
+        )
+        self.carrier_index = carrier_index or CarrierIndex(self._supported_shipping_methods, self._supported_carriers)
+    
+    def _create_token_manager(self, refresh_margin: float) -> TokenManager:
+        return TokenManager(self._fetch_token, refresh_margin=refresh_margin)
+    
+    def _create_coalescer(self) -> RequestCoalescer:
+        return RequestCoalescer()
+    
+    @property
+    def access_token(self) -> Optional[str]:
+        """
+        The current access token (refreshed first if auto_refresh is on and it has expired)
+        """
+        if self.token_manager is not None:
+            return self.token_manager.get_token()
+        return self._access_token
+    
+    @access_token.setter
+    def access_token(self, token: Optional[str]) -> None:
+        self._access_token = token
+        self._app_token = False
+        if self.token_manager is not None:
+            self.token_manager.set_token(token)
+    
+    def _store_token(self, data: Dict[str, Any], app_token: bool = False) -> None:
+        """
+        Keep the token from an auth or token response, tracking its expiry
+        
+        Args:
+            data: The token response
+            app_token: The token was issued for the app credentials (by
+                authenticate) rather than for a user
+        """
+        self._access_token = data.get("access_token")
+        self._app_token = app_token
+        if self.token_manager is not None:
+            self.token_manager.record(data, grant=True)
+    
+    def refresh_access_token(self) -> Optional[str]:
+        """
+        Refresh the access token now (requires auto_refresh)
+        
+        Uses the refresh token from exchange_code when available; an app token
+        from authenticate is renewed with the app credentials. A user token
+        without a refresh token cannot be refreshed and raises, rather than
+        being replaced by a token for a different identity. Concurrent callers
+        share a single request.
+        
+        Returns:
+            The new access token
+        """
+        if self.token_manager is None:
+            raise Exception("Token refresh requires auto_refresh=True")
+        
+        return self.token_manager.refresh()
+    
+    def _fetch_token(self, refresh_token: Optional[str]) -> Dict[str, Any]:
+        if refresh_token:
+            return self._send(self._refresh_token_request(refresh_token))
+        self._check_renewable()
+        return self._send(self._authenticate_request())
+    
+    def _check_renewable(self) -> None:
+        """
+        Refuse to renew a user token with the app credentials, which would
+        silently switch to the app's identity and scope
+        """
+        if not self._app_token:
+            raise Exception(
+                "The access token has no refresh token and cannot be refreshed. "
+                "Call exchange_code or authenticate again."
+            )
+    
+    def _refresh_token_request(self, refresh_token: str) -> ApiRequest:
+        """
+        Build the request for exchanging a refresh token
+        """
+        token_endpoint = f"{self.base_url}/{self.api_version}/token"
+        payload = {
+            "app_id": self.app_id,
+            "app_secret": self.app_secret,
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token"
+        }
+        
+        return ApiRequest("POST", token_endpoint, body=payload, error_message="Failed to refresh token")
+    
+    def set_access_token(self, token: str) -> None:
+        """
+        Set the access token for API calls
+        
+        Args:
+            token: The access token
+        """
+        self.access_token = token
+    
+    def authenticate(self) -> Dict[str, Any]:
+        """
+        Authenticate with the API using app credentials
+        
+        Returns:
+            Dict containing auth result with access token
+        """
+        data = self._send(self._authenticate_request())
+        self._store_token(data, app_token=True)
+        
+        return data
+    
+    def _authenticate_request(self) -> ApiRequest:
+        """
+        Build the request for authenticate
+        """
+        auth_endpoint = f"{self.base_url}/{self.api_version}/auth"
+        payload = {
+            "app_id": self.app_id,
+            "app_secret": self.app_secret
+        }
+        
+        return ApiRequest("POST", auth_endpoint, body=payload, error_message="Failed to authenticate")
+    
+    def get_authorization_url(self, options: Dict[str, Any]) -> str:
+        """
+        Generate an authorization URL for users to grant permission
+        
+        Args:
+            options: Dict containing authorization options
+                - redirect_uri: The URI to redirect to after authorization
+                - scope: List of address fields to request
+                - expiry_days: Number of days until the permission expires
+                - max_accesses: Maximum number of times the address can be accessed
+                - preferred_chain: Preferred blockchain to use for authorization
+                - state: Optional state parameter for CSRF protection
+        
+        Returns:
+            The authorization URL
+        """
+        if "redirect_uri" not in options:
+            raise ValueError("redirect_uri is required")
+        
+        if "scope" not in options:
+            raise ValueError("scope is required")
+        
+        scope = options["scope"]
+        if isinstance(scope, list):
+            scope = " ".join(scope)
+        
+        params = {
+            "app_id": self.app_id,
+            "redirect_uri": options["redirect_uri"],
+            "scope": scope,
+            "expiry_days": options.get("expiry_days", 30),
+            "version": self.api_version
+        }
+        
+        if "max_accesses" in options:
+            params["max_accesses"] = options["max_accesses"]
+        
+        if "preferred_chain" in options and options["preferred_chain"] in self.supported_chains:
+            params["preferred_chain"] = options["preferred_chain"]
+        
+        if "state" in options:
+            params["state"] = options["state"]
+        
+        # Build the query string
+        query_string = "&".join([f"{k}={v}" for k, v in params.items()])
+        
+        return f"{self.base_url}/authorize?{query_string}"
+    
+    def exchange_code(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Exchange an authorization code for an access token
+        
+        Args:
+            options: Dict containing exchange options
+                - code: The authorization code
+                - redirect_uri: The redirect URI used in the authorization request
+        
+        Returns:
+            Dict containing the exchange result with access token
+        """
+        data = self._send(self._exchange_code_request(options))
+        self._store_token(data)
+        
+        return data
+    
+    def _exchange_code_request(self, options: Dict[str, Any]) -> ApiRequest:
+        """
+        Build the request for exchange_code
+        """
+        if "code" not in options:
+            raise ValueError("code is required")
+        
+        if "redirect_uri" not in options:
+            raise ValueError("redirect_uri is required")
+        
+        exchange_endpoint = f"{self.base_url}/{self.api_version}/token"
+        payload = {
+            "app_id": self.app_id,
+            "app_secret": self.app_secret,
+            "code": options["code"],
+            "redirect_uri": options["redirect_uri"],
+            "grant_type": "authorization_code"
+        }
+        
+        return ApiRequest("POST", exchange_endpoint, body=payload, error_message="Failed to exchange code")
+    
+    def get_address(self, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Get the user's address information
+        
+        Args:
+            options: Dict containing request options
+                - fields: Fields to request, as dotted paths (e.g. ["city",
+                  "verification.method"]) or a nested dict (e.g. {"city": True,
+                  "verification": ["method", "verified"]})
+                - include_verification_info: Include verification details
+                  (implied by fields under "verification")
+                - access_token: Override the instance access token
+        
+        Returns:
+            Dict containing the user's address information
+        """
+        cache_key = self._address_cache_key(options)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        data = self._send(self._get_address_request(options), Address)
+        self._cache_response(cache_key, data)
+        
+        return data
+    
+    def _address_cache_key(self, options: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """
+        Return the cache key for a get_address call, or None when not caching
+        """
+        if self.cache is None:
+            return None
+        
+        options = options or {}
+        access_token = options.get("access_token") or self.access_token
+        if not access_token:
+            return None
+        
+        fields = options.get("fields")
+        return (
+            "address",
+            access_token,
+            tuple(_field_paths(fields)) if fields else None,
+            bool(options.get("include_verification_info"))
+        )
+    
+    def _cache_response(self, cache_key: Optional[tuple], data: Dict[str, Any]) -> None:
+        if cache_key is None:
+            return
+        
+        self.cache.set(cache_key, _parsed(data), token=cache_key[1])
+        if data.get("user_id"):
+            self.cache.associate_user(cache_key[1], data["user_id"])
+    
+    def _get_address_request(self, options: Dict[str, Any] = None) -> ApiRequest:
+        """
+        Build the request for get_address
+        """
+        options = options or {}
+        
+        access_token = options.get("access_token") or self.access_token
+        if not access_token:
+            raise Exception("No access token. Call authenticate or exchange_code first, or provide an access token.")
+        
+        url = f"{self.base_url}/{self.api_version}/address"
+        params = {}
+        
+        paths = _field_paths(options["fields"]) if options.get("fields") else []
+        if paths:
+            params["fields"] = ",".join(paths)
+        
+        if options.get("include_verification_info") or _projects_verification(paths):
+            params["include_verification"] = "true"
+        
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id,
+            "X-SDK-Version": "1.0.0"
+        }
+        
+        return ApiRequest("GET", url, headers=headers, params=params or None, error_message="Failed to get address")
+    
+    def get_addresses(
+        self,
+        tokens: Iterable[str],
+        fields: List[str] = None,
+        include_verification_info: bool = False,
+        concurrency: int = 16,
+        batch_size: int = 100,
+        use_batch_endpoint: bool = True
+    ) -> Iterator[AddressResult]:
+        """
+        Get the addresses for many access tokens, yielding results as they complete
+        
+        When the client holds an app access token and the server exposes the
+        batch address endpoint, tokens are sent `batch_size` at a time;
+        otherwise one get_address call is made per token. A failure is reported
+        on that token's AddressResult and never aborts the rest of the batch.
+        Results are not yielded in input order.
+        
+        Args:
+            tokens: Iterable of user access tokens
+            fields: List of specific fields to request
+            include_verification_info: Include verification details
+            concurrency: Maximum number of requests in flight
+            batch_size: Number of tokens per batch endpoint request
+            use_batch_endpoint: Use the batch endpoint when the server supports it
+        
+        Returns:
+            Iterator of AddressResult
+        """
+        options = self._bulk_address_options(fields, include_verification_info)
+        tokens = iter(tokens)
+        
+        if use_batch_endpoint and self.access_token and self._batch_address_supported is not False:
+            # The first batch doubles as a probe for endpoint support
+            first = list(itertools.islice(tokens, batch_size))
+            results = self._fetch_address_batch(first, options)
+            if results is not None:
+                yield from results
+                for results in _bounded_map(
+                    lambda chunk: self._fetch_address_batch_or_each(chunk, options),
+                    _chunks(tokens, batch_size),
+                    concurrency
+                ):
+                    yield from results
+                return
+            tokens = itertools.chain(first, tokens)
+        
+        yield from _bounded_map(lambda token: self._fetch_one_address(token, options), tokens, concurrency)
+    
+    @staticmethod
+    def _bulk_address_options(fields: Optional[List[str]], include_verification_info: bool) -> Dict[str, Any]:
+        options = {"include_verification_info": include_verification_info}
+        if fields:
+            options["fields"] = fields
+        return options
+    
+    def _fetch_one_address(self, token: str, options: Dict[str, Any]) -> AddressResult:
+        try:
+            return AddressResult(token, address=self.get_address(dict(options, access_token=token)))
+        except Exception as e:
+            return AddressResult(token, error=e)
+    
+    def _fetch_address_batch(self, tokens: List[str], options: Dict[str, Any]) -> Optional[List[AddressResult]]:
+        """
+        Fetch one batch of addresses, returning None if the server has no batch endpoint
+        """
+        request = self._address_batch_request(tokens, options)
+        try:
+            response = self._send_raw(request)
+            return self._address_batch_results(tokens, request, response)
+        except Exception as e:
+            return [AddressResult(token, error=e) for token in tokens]
+    
+    def _fetch_address_batch_or_each(self, tokens: List[str], options: Dict[str, Any]) -> List[AddressResult]:
+        results = self._fetch_address_batch(tokens, options)
+        if results is None:
+            results = [self._fetch_one_address(token, options) for token in tokens]
+        return results
+    
+    def _address_batch_request(self, tokens: List[str], options: Dict[str, Any]) -> ApiRequest:
+        """
+        Build the request for the batch address endpoint
+        """
+        url = f"{self.base_url}/{self.api_version}/address/batch"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id,
+            "X-SDK-Version": "1.0.0"
+        }
+        
+        paths = _field_paths(options["fields"]) if options.get("fields") else []
+        payload = {
+            "tokens": tokens,
+            "include_verification": bool(options.get("include_verification_info")) or _projects_verification(paths)
+        }
+        
+        if paths:
+            payload["fields"] = paths
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to get addresses")
+    
+    def _address_batch_results(
+        self,
+        tokens: List[str],
+        request: ApiRequest,
+        response: Any
+    ) -> Optional[List[AddressResult]]:
+        """
+        Map a batch address response back onto per-token results
+        """
+        if response.status_code in (404, 405, 501):
+            self._batch_address_supported = False
+            return None
+        
+        data = self._parse_response(request, response)
+        self._batch_address_supported = True
+        
+        by_token = {item.get("token"): item for item in data.get("results", [])}
+        results = []
+        for token in tokens:
+            item = by_token.get(token)
+            if item is None:
+                results.append(AddressResult(token, error=Exception("No result returned for token")))
+            elif "error" in item:
+                results.append(AddressResult(token, error=Exception(item["error"])))
+            else:
+                results.append(AddressResult(token, address=item.get("address")))
+        return results
+    
+    def validate_token(self, token: str = None) -> Dict[str, Any]:
+        """
+        Check if the access token is still valid
+        
+        Args:
+            token: The access token to validate (defaults to instance token)
+        
+        Returns:
+            Dict containing validation result
+        """
+        token = token or self.access_token
+        if not token:
+            return {"valid": False, "error": "No access token provided"}
+        
+        cache_key = ("validate", token) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if self.token_validator is not None:
+            result = self._validate_locally(token)
+            if result is not None:
+                return result
+        
+        try:
+            response = self._send_raw(self._validate_token_request(token))
+            result = self._validation_result(response)
+        
+        except Exception as e:
+            return {
+                "valid": False,
+                "error": str(e)
+            }
+        
+        # Only successful validations are cached so failures are always rechecked
+        if result["valid"]:
+            self._cache_response(cache_key, result)
+        
+        return result
+    
+    def _validate_locally(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate a signed token against the cached signing keys, returning None
+        when the network check is needed
+        """
+        parsed = self.token_validator.parse(token)
+        if parsed is None:
+            return None
+        
+        if self.token_validator.needs_refresh(parsed):
+            try:
+                self.token_validator.update_keys(self._send(self._jwks_request()))
+            except Exception:
+                return None
+        
+        return self.token_validator.verify(parsed, self.app_id)
+    
+    def _jwks_request(self) -> ApiRequest:
+        """
+        Build the request for the API's published token signing keys
+        """
+        url = f"{self.base_url}/.well-known/jwks.json"
+        headers = {
+            "X-App-ID": self.app_id
+        }
+        
+        return ApiRequest("GET", url, headers=headers, error_message="Failed to fetch signing keys")
+    
+    def _validate_token_request(self, token: str) -> ApiRequest:
+        """
+        Build the request for validate_token
+        """
+        url = f"{self.base_url}/{self.api_version}/validate-token"
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "X-App-ID": self.app_id
+        }
+        
+        return ApiRequest("GET", url, headers=headers, error_message="Token validation failed")
+    
+    @staticmethod
+    def _validation_result(response: Any) -> Dict[str, Any]:
+        """
+        Turn a validate-token response into the validation result dict
+        """
+        if response.status_code != 200:
+            return {
+                "valid": False,
+                "error": _error_message(_error_data(response), "Token validation failed"),
+                "status": response.status_code
+            }
+        
+        data = response.json()
+        return {
+            "valid": True,
+            **data
+        }
+    
+    def register_webhook(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a webhook to receive notifications about address changes
+        
+        Args:
+            options: Dict containing webhook options
+                - url: The URL to send webhook events to
+                - events: List of events to subscribe to
+                - secret: Secret for signing webhook payloads
+        
+        Returns:
+            Dict containing webhook registration result
+        """
+        return self._send(self._register_webhook_request(options), WebhookRegistration)
+    
+    def _register_webhook_request(self, options: Dict[str, Any]) -> ApiRequest:
+        """
+        Build the request for register_webhook
+        """
+        if not self.access_token:
+            raise Exception("No access token. Authentication required to register webhooks.")
+        
+        if "url" not in options:
+            raise ValueError("Webhook URL is required")
+        
+        if "events" not in options or not isinstance(options["events"], list) or not options["events"]:
+            raise ValueError("At least one event type must be specified")
+        
+        url = f"{self.base_url}/{self.api_version}/webhooks"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {
+            "url": options["url"],
+            "events": options["events"]
+        }
+        
+        if "secret" in options:
+            payload["secret"] = options["secret"]
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to register webhook")
+    
+    def verify_webhook_signature(
+        self,
+        signature: str,
+        payload: Union[str, bytes, bytearray, memoryview],
+        secret: str,
+        timestamp: str = None
+    ) -> bool:
+        """
+        Verify a webhook signature
+        
+        For high volumes, or several secrets during rotation, use a
+        WebhookVerifier directly.
+        
+        Args:
+            signature: The signature from the X-Webhook-Signature header
+            payload: The raw webhook payload (str, bytes or memoryview)
+            secret: Your webhook secret
+            timestamp: The X-Webhook-Timestamp header, when the signature covers it
+        
+        Returns:
+            Whether the signature is valid
+        """
+        verifier = self._webhook_verifiers.get(secret)
+        if verifier is None:
+            verifier = self._webhook_verifiers[secret] = WebhookVerifier(secret, reject_replays=False)
+        
+        try:
+            return verifier.verify(payload, signature, timestamp)
+        
+        except Exception as e:
+            logger.warning("Error verifying webhook signature: %s", e)
+            return False
+    
+    def link_address_to_wallet(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Link a verified address to a blockchain wallet
+        
+        Args:
+            options: Dict containing linking options
+                - wallet_address: The blockchain wallet address
+                - chain_id: The chain ID of the blockchain
+                - create_verifiable_credential: Create a verifiable credential
+        
+        Returns:
+            Dict containing the result of the linking operation
+        """
+        return self._send(self._link_address_to_wallet_request(options))
+    
+    def _link_address_to_wallet_request(self, options: Dict[str, Any]) -> ApiRequest:
+        """
+        Build the request for link_address_to_wallet
+        """
+        if not self.access_token:
+            raise Exception("No access token. Authentication required to link address to wallet.")
+        
+        if "wallet_address" not in options:
+            raise ValueError("Wallet address is required")
+        
+        if "chain_id" not in options:
+            raise ValueError("Chain ID is required")
+        
+        url = f"{self.base_url}/{self.api_version}/link-wallet"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {
+            "wallet_address": options["wallet_address"],
+            "chain_id": options["chain_id"],
+            "create_vc": options.get("create_verifiable_credential", False)
+        }
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to link address to wallet")
+    
+    def link_wallets(
+        self,
+        links: Iterable[Dict[str, Any]],
+        concurrency: int = 16,
+        checkpoint: Union[str, LinkCheckpoint] = None,
+        defer_credentials: bool = False,
+        group_by_chain: bool = True
+    ) -> Iterator[LinkResult]:
+        """
+        Link many wallets, yielding one LinkResult per submitted item as it completes
+        
+        Every item is validated before anything is submitted. Items may carry
+        their user's access_token; otherwise the client's token is used. With a
+        checkpoint, completed links are recorded as they finish and skipped on
+        the next run, so an interrupted migration resumes where it stopped.
+        With defer_credentials, wallets are linked without their verifiable
+        credential first; running link_wallets again over the same input and
+        checkpoint without defer_credentials then only requests the pending
+        credentials (by repeating those links with create_vc).
+        
+        Args:
+            links: Iterable of link_address_to_wallet option dicts, optionally
+                with an access_token
+            concurrency: Maximum number of requests in flight
+            checkpoint: LinkCheckpoint or path of a checkpoint file
+            defer_credentials: Link now and leave credentials for a later run
+            group_by_chain: Submit the links one chain_id at a time
+        
+        Returns:
+            Iterator of LinkResult (not in input order)
+        """
+        checkpoint, owns_checkpoint = self._open_link_checkpoint(checkpoint)
+        try:
+            for group in self._plan_wallet_links(links, checkpoint, defer_credentials, group_by_chain):
+                for result in _bounded_map(self._link_one_wallet, group, concurrency):
+                    self._checkpoint_link(checkpoint, result)
+                    yield result
+        finally:
+            if owns_checkpoint:
+                checkpoint.close()
+    
+    @staticmethod
+    def _open_link_checkpoint(checkpoint: Union[str, LinkCheckpoint, None]) -> Tuple[Optional[LinkCheckpoint], bool]:
+        if checkpoint is None or isinstance(checkpoint, LinkCheckpoint):
+            return checkpoint, False
+        return LinkCheckpoint(checkpoint), True
+    
+    def _plan_wallet_links(
+        self,
+        links: Iterable[Dict[str, Any]],
+        checkpoint: Optional[LinkCheckpoint],
+        defer_credentials: bool,
+        group_by_chain: bool
+    ) -> List[List[Tuple[int, Dict[str, Any], bool]]]:
+        """
+        Validate every link and return the (index, options, credential_pending)
+        items still to submit, grouped by chain_id
+        """
+        groups = OrderedDict()
+        problems = []
+        for index, options in enumerate(links):
+            if not options.get("wallet_address"):
+                problems.append(f"#{index}: Wallet address is required")
+                continue
+            if options.get("chain_id") is None:
+                problems.append(f"#{index}: Chain ID is required")
+                continue
+            
+            wants_credential = bool(options.get("create_verifiable_credential"))
+            if checkpoint is not None:
+                done = checkpoint.get(LinkCheckpoint.key(options["wallet_address"], options["chain_id"]))
+                if done is not None and (not done.get("credential_pending") or not wants_credential or defer_credentials):
+                    continue
+            
+            credential_pending = wants_credential and defer_credentials
+            if credential_pending:
+                options = dict(options, create_verifiable_credential=False)
+            group = options["chain_id"] if group_by_chain else None
+            groups.setdefault(group, []).append((index, options, credential_pending))
+        
+        if problems:
+            raise ValueError(f"Invalid wallet links: {'; '.join(problems)}")
+        return list(groups.values())
+    
+    def _link_one_wallet(self, item: Tuple[int, Dict[str, Any], bool]) -> LinkResult:
+        index, options, credential_pending = item
+        client = self.for_token(options["access_token"]) if options.get("access_token") else self
+        try:
+            link = client.link_address_to_wallet(options)
+            return LinkResult(index, options["wallet_address"], options["chain_id"], link=link, credential_pending=credential_pending)
+        except Exception as e:
+            return LinkResult(index, options["wallet_address"], options["chain_id"], error=e, credential_pending=credential_pending)
+    
+    @staticmethod
+    def _checkpoint_link(checkpoint: Optional[LinkCheckpoint], result: LinkResult) -> None:
+        if checkpoint is not None and result.ok:
+            checkpoint.record(
+                LinkCheckpoint.key(result.wallet_address, result.chain_id),
+                result.link.get("link_id"),
+                result.credential_pending
+            )
+    
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Get and refresh permission usage statistics
+        
+        Returns:
+            Dict containing usage statistics
+        """
+        mark = self.quota.mark() if self.quota is not None else None
+        data = self._send(self._get_usage_stats_request())
+        if self.quota is not None:
+            self.quota.reconcile(data, mark)
+        
+        return data
+    
+    def _get_usage_stats_request(self) -> ApiRequest:
+        """
+        Build the request for get_usage_stats
+        """
+        if not self.access_token:
+            raise Exception("No access token. Authentication required.")
+        
+        url = f"{self.base_url}/{self.api_version}/usage-stats"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "X-App-ID": self.app_id
+        }
+        
+        return ApiRequest("GET", url, headers=headers, error_message="Failed to get usage statistics")
+    
+    def refresh_capabilities(self) -> CarrierIndex:
+        """
+        Load the supported carriers and shipping methods from the API
+        
+        Replaces the client's carrier index (and the supported_carriers and
+        supported_shipping_methods attributes) with the server's capability table.
+        
+        Returns:
+            The new CarrierIndex
+        """
+        return self._apply_capabilities(self._send(self._capabilities_request()))
+    
+    def _capabilities_request(self) -> ApiRequest:
+        """
+        Build the request for the carrier capabilities endpoint
+        """
+        url = f"{self.base_url}/{self.api_version}/capabilities"
+        headers = {
+            "X-App-ID": self.app_id
+        }
+        
+        return ApiRequest("GET", url, headers=headers, error_message="Failed to get capabilities")
+    
+    def _apply_capabilities(self, data: Dict[str, Any]) -> CarrierIndex:
+        index = CarrierIndex.from_capabilities(data)
+        self._set_carrier_tables(sorted(index.carriers), index.as_shipping_methods(), index)
+        return index
+    
+    def create_blind_shipping_token(self, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Create a blind shipping token for secure shipping without exposing address
+        
+        Args:
+            options: Dict containing blind shipping options
+                - carriers: List of allowed carriers (e.g., ['usps', 'fedex', 'ups'])
+                - shipping_methods: List of allowed shipping methods
+                - require_confirmation: Whether to require delivery confirmation
+                - expiry_days: Number of days until the shipping token expires
+                - max_uses: Maximum number of times the shipping token can be used
+        
+        Returns:
+            Dict containing the result with the shipping token
+        """
+        return self._send(self._create_blind_shipping_token_request(options), ShippingToken)
+    
+    def _create_blind_shipping_token_request(self, options: Dict[str, Any] = None) -> ApiRequest:
+        """
+        Build the request for create_blind_shipping_token
+        """
+        options = options or {}
+        
+        if not self.access_token:
+            raise Exception("No access token. Call authenticate or exchange_code first.")
+        
+        if "carriers" not in options or not isinstance(options["carriers"], list) or not options["carriers"]:
+            raise ValueError("At least one carrier must be specified")
+        
+        if "shipping_methods" not in options or not isinstance(options["shipping_methods"], list) or not options["shipping_methods"]:
+            raise ValueError("At least one shipping method must be specified")
+        
+        invalid_carriers = [c for c in options["carriers"] if not self.carrier_index.supports_carrier(c)]
+        if invalid_carriers:
+            raise ValueError(f"Unsupported carriers: {', '.join(invalid_carriers)}")
+        
+        invalid_methods = self.carrier_index.invalid_methods(options["carriers"], options["shipping_methods"])
+        if invalid_methods:
+            raise ValueError(f"Unsupported shipping methods: {', '.join(invalid_methods)}")
+        
+        url = f"{self.base_url}/{self.api_version}/create-shipping-token"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {
+            "carriers": options["carriers"],
+            "shipping_methods": options["shipping_methods"],
+            "require_confirmation": options.get("require_confirmation", False),
+            "expiry_days": options.get("expiry_days", 7),
+            "max_uses": options.get("max_uses", 1)
+        }
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to create blind shipping token")
+    
+    def request_shipment(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Request a shipment using a blind shipping token
+        
+        Args:
+            options: Dict containing shipment request options
+                - shipping_token: The blind shipping token
+                - carrier: The carrier to use (e.g., 'usps', 'fedex', 'ups')
+                - service: The shipping service to use
+                - package: Dict containing package details
+                - idempotency_key: Key that lets the API deduplicate retries of
+                  this shipment (generated when omitted)
+        
+        Returns:
+            Dict containing the result with tracking information
+        """
+        return self._send(self._request_shipment_request(options))
+    
+    def request_shipments(
+        self,
+        shipments: Iterable[Dict[str, Any]],
+        concurrency: int = 16,
+        batch_size: int = 50,
+        use_batch_endpoint: bool = True,
+        idempotency_namespace: str = ""
+    ) -> Iterator[ShipmentResult]:
+        """
+        Request many shipments, yielding one ShipmentResult per item in input order
+        
+        Every item is validated before anything is submitted, so one bad item
+        fails the whole call up front with a ValueError listing each problem.
+        Items without an idempotency_key get a deterministic one derived from
+        their contents, so re-running the same input after a crash lets the API
+        return the already-created shipments instead of shipping twice.
+        
+        Args:
+            shipments: Iterable of request_shipment option dicts
+            concurrency: Maximum number of requests in flight
+            batch_size: Number of shipments per batch endpoint request
+            use_batch_endpoint: Use the batch endpoint when the server supports it
+            idempotency_namespace: Prefix mixed into derived idempotency keys
+                (e.g. an order-run ID) to scope them
+        
+        Returns:
+            Iterator of ShipmentResult, in input order
+        """
+        prepared = self._prepare_shipments(shipments, idempotency_namespace)
+        
+        if use_batch_endpoint and prepared and self._batch_shipment_supported is not False:
+            # The first batch doubles as a probe for endpoint support
+            chunks = list(_chunks(prepared, batch_size))
+            results = self._submit_shipment_batch(chunks[0])
+            if results is not None:
+                yield from results
+                for results in _ordered_bounded_map(self._submit_shipment_batch_or_each, chunks[1:], concurrency):
+                    yield from results
+                return
+        
+        yield from _ordered_bounded_map(self._submit_one_shipment, prepared, concurrency)
+    
+    def _prepare_shipments(
+        self,
+        shipments: Iterable[Dict[str, Any]],
+        idempotency_namespace: str
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Validate every shipment in one pass and assign idempotency keys
+        """
+        prepared = []
+        problems = []
+        occurrences = {}
+        for index, options in enumerate(shipments):
+            try:
+                self._validate_shipment(options)
+            except ValueError as e:
+                problems.append(f"#{index}: {e}")
+                continue
+            
+            key = options.get("idempotency_key")
+            if not key:
+                digest = hashlib.sha256(json.dumps(
+                    [idempotency_namespace] + [options[k] for k in ("shipping_token", "carrier", "service", "package")],
+                    sort_keys=True
+                ).encode("utf-8")).hexdigest()
+                # Identical items in one run are distinct shipments
+                occurrence = occurrences.get(digest, 0)
+                occurrences[digest] = occurrence + 1
+                key = f"{digest[:32]}-{occurrence}"
+            prepared.append((index, dict(options, idempotency_key=key)))
+        
+        if problems:
+            raise ValueError(f"Invalid shipments: {'; '.join(problems)}")
+        return prepared
+    
+    def _submit_one_shipment(self, item: Tuple[int, Dict[str, Any]]) -> ShipmentResult:
+        index, options = item
+        try:
+            return ShipmentResult(index, options["idempotency_key"], shipment=self.request_shipment(options))
+        except Exception as e:
+            return ShipmentResult(index, options["idempotency_key"], error=e)
+    
+    def _submit_shipment_batch(self, items: List[Tuple[int, Dict[str, Any]]]) -> Optional[List[ShipmentResult]]:
+        """
+        Submit one batch of shipments, returning None if the server has no batch endpoint
+        """
+        request = self._shipment_batch_request(items)
+        try:
+            response = self._send_raw(request)
+            return self._shipment_batch_results(items, request, response)
+        except Exception as e:
+            return [ShipmentResult(index, options["idempotency_key"], error=e) for index, options in items]
+    
+    def _submit_shipment_batch_or_each(self, items: List[Tuple[int, Dict[str, Any]]]) -> List[ShipmentResult]:
+        results = self._submit_shipment_batch(items)
+        if results is None:
+            results = [self._submit_one_shipment(item) for item in items]
+        return results
+    
+    def _shipment_batch_request(self, items: List[Tuple[int, Dict[str, Any]]]) -> ApiRequest:
+        """
+        Build the request for the batch shipment endpoint
+        """
+        url = f"{self.base_url}/{self.api_version}/request-shipment/batch"
+        headers = {
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {
+            "shipments": [
+                {
+                    "shipping_token": options["shipping_token"],
+                    "carrier": options["carrier"],
+                    "service": options["service"],
+                    "package": options["package"],
+                    "idempotency_key": options["idempotency_key"]
+                }
+                for _, options in items
+            ]
+        }
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to request shipments")
+    
+    def _shipment_batch_results(
+        self,
+        items: List[Tuple[int, Dict[str, Any]]],
+        request: ApiRequest,
+        response: Any
+    ) -> Optional[List[ShipmentResult]]:
+        """
+        Map a batch shipment response back onto per-item results
+        """
+        if response.status_code in (404, 405, 501):
+            self._batch_shipment_supported = False
+            return None
+        
+        data = self._parse_response(request, response)
+        self._batch_shipment_supported = True
+        
+        by_key = {item.get("idempotency_key"): item for item in data.get("results", [])}
+        results = []
+        for index, options in items:
+            key = options["idempotency_key"]
+            item = by_key.get(key)
+            if item is None:
+                results.append(ShipmentResult(index, key, error=Exception("No result returned for shipment")))
+            elif "error" in item:
+                results.append(ShipmentResult(index, key, error=SecureAddressError(_error_message(item, "Failed to request shipment"))))
+            else:
+                results.append(ShipmentResult(index, key, shipment=item))
+        return results
+    
+    def _validate_shipment(self, options: Dict[str, Any]) -> None:
+        """
+        Check a shipment's token, carrier, service and package, raising ValueError
+        """
+        if "shipping_token" not in options:
+            raise ValueError("Shipping token is required")
+        
+        if "carrier" not in options or not self.carrier_index.supports_carrier(options["carrier"]):
+            raise ValueError(f"Invalid or unsupported carrier: {options.get('carrier')}")
+        
+        if "service" not in options or not self.carrier_index.supports(options["carrier"], options["service"]):
+            raise ValueError(f"Invalid or unsupported shipping service: {options.get('service')}")
+        
+        if "package" not in options or "type" not in options["package"]:
+            raise ValueError("Package type is required")
+    
+    def _request_shipment_request(self, options: Dict[str, Any]) -> ApiRequest:
+        """
+        Build the request for request_shipment
+        """
+        self._validate_shipment(options)
+        
+        url = f"{self.base_url}/{self.api_version}/request-shipment"
+        headers = {
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id,
+            "Idempotency-Key": options.get("idempotency_key") or str(uuid.uuid4())
+        }
+        
+        payload = {
+            "shipping_token": options["shipping_token"],
+            "carrier": options["carrier"],
+            "service": options["service"],
+            "package": options["package"]
+        }
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to request shipment")
+    
+    def get_tracking_info(self, tracking_number: str, carrier: str) -> Dict[str, Any]:
+        """
+        Get tracking information for a shipment
+        
+        Args:
+            tracking_number: The tracking number
+            carrier: The carrier (e.g., 'usps', 'fedex', 'ups')
+        
+        Returns:
+            Dict containing tracking information
+        """
+        cache_key = self._tracking_cache_key(tracking_number, carrier)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        return self._fetch_tracking_info(tracking_number, carrier)
+    
+    def _fetch_tracking_info(self, tracking_number: str, carrier: str) -> Dict[str, Any]:
+        """
+        Fetch tracking information, bypassing (but refreshing) the tracking cache
+        """
+        data = self._send(self._get_tracking_info_request(tracking_number, carrier), TrackingInfo)
+        self._cache_tracking(tracking_number, carrier, data)
+        
+        return data
+    
+    def _tracking_cache_key(self, tracking_number: str, carrier: str) -> Optional[tuple]:
+        if self.cache is None or not self.cache.tracking_ttl:
+            return None
+        return ("tracking", tracking_number, carrier)
+    
+    def _cache_tracking(self, tracking_number: str, carrier: str, data: Dict[str, Any]) -> None:
+        cache_key = self._tracking_cache_key(tracking_number, carrier)
+        if cache_key is not None:
+            self.cache.set(cache_key, _parsed(data), token=tracking_number, ttl=self.cache.tracking_ttl)
+    
+    def _get_tracking_info_request(self, tracking_number: str, carrier: str) -> ApiRequest:
+        """
+        Build the request for get_tracking_info
+        """
+        if not tracking_number:
+            raise ValueError("Tracking number is required")
+        
+        if not carrier or not self.carrier_index.supports_carrier(carrier):
+            raise ValueError(f"Invalid or unsupported carrier: {carrier}")
+        
+        url = f"{self.base_url}/{self.api_version}/tracking"
+        params = {
+            "number": tracking_number,
+            "carrier": carrier
+        }
+        
+        headers = {
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        return ApiRequest("GET", url, headers=headers, params=params, error_message="Failed to get tracking information")
+    
+    def confirm_delivery(self, tracking_number: str, carrier: str) -> Dict[str, Any]:
+        """
+        Confirm delivery for a shipment (if confirmation is required)
+        
+        Args:
+            tracking_number: The tracking number
+            carrier: The carrier (e.g., 'usps', 'fedex', 'ups')
+        
+        Returns:
+            Dict containing confirmation result
+        """
+        return self._send(self._confirm_delivery_request(tracking_number, carrier))
+    
+    def _confirm_delivery_request(self, tracking_number: str, carrier: str) -> ApiRequest:
+        """
+        Build the request for confirm_delivery
+        """
+        if not self.access_token:
+            raise Exception("No access token. Call authenticate or exchange_code first.")
+        
+        if not tracking_number:
+            raise ValueError("Tracking number is required")
+        
+        if not carrier or not self.carrier_index.supports_carrier(carrier):
+            raise ValueError(f"Invalid or unsupported carrier: {carrier}")
+        
+        url = f"{self.base_url}/{self.api_version}/confirm-delivery"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {
+            "tracking_number": tracking_number,
+            "carrier": carrier
+        }
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to confirm delivery")
+    
+    def subscribe_tracking(
+        self,
+        shipments: Iterable[Tuple[str, str]] = (),
+        event_types: Iterable[str] = None,
+        subscription_id: str = None,
+        cursor: str = None,
+        **options: Any
+    ) -> TrackingSubscription:
+        """
+        Stream tracking and delivery-confirmation events for many shipments
+        over a single long-poll connection instead of polling each one
+        
+        Args:
+            shipments: Iterable of (tracking_number, carrier) pairs
+            event_types: Event types to receive (defaults to
+                TrackingSubscription.EVENT_TYPES)
+            subscription_id: Existing subscription to resume
+            cursor: Cursor of the last event already processed
+            **options: Further TrackingSubscription settings (wait, limit,
+                idle_interval, reconnect_delay, max_reconnect_delay)
+        
+        Returns:
+            TrackingSubscription; iterate over it to receive TrackingEvents
+        """
+        return TrackingSubscription(
+            self,
+            shipments,
+            event_types=event_types,
+            subscription_id=subscription_id,
+            cursor=cursor,
+            **options
+        )
+    
+    def create_tracking_subscription(
+        self,
+        shipments: Iterable[Tuple[str, str]],
+        event_types: Iterable[str] = None,
+        cursor: str = None
+    ) -> Dict[str, Any]:
+        """
+        Create a server-side subscription to tracking events
+        
+        Args:
+            shipments: Iterable of (tracking_number, carrier) pairs
+            event_types: Event types to receive
+            cursor: Start after this event (when replacing an expired subscription)
+        
+        Returns:
+            Dict containing subscription_id and the initial cursor
+        """
+        return self._send(self._create_tracking_subscription_request(shipments, event_types, cursor))
+    
+    def _create_tracking_subscription_request(
+        self,
+        shipments: Iterable[Tuple[str, str]],
+        event_types: Iterable[str] = None,
+        cursor: str = None
+    ) -> ApiRequest:
+        """
+        Build the request for create_tracking_subscription
+        """
+        if not self.access_token:
+            raise Exception("No access token. Call authenticate or exchange_code first.")
+        
+        url = f"{self.base_url}/{self.api_version}/tracking/subscriptions"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {"shipments": self._tracking_shipments(shipments)}
+        if event_types:
+            payload["event_types"] = list(event_types)
+        if cursor:
+            payload["cursor"] = cursor
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to create tracking subscription")
+    
+    def get_tracking_events(
+        self,
+        subscription_id: str,
+        cursor: str = None,
+        wait: float = 25.0,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Long-poll a tracking subscription for events after a cursor
+        
+        Args:
+            subscription_id: The subscription to poll
+            cursor: Return events after this cursor (from the start when omitted)
+            wait: Seconds the server may hold the request open waiting for events
+            limit: Maximum number of events to return
+        
+        Returns:
+            Dict containing events and the cursor to poll from next
+        """
+        # A revalidated long poll would replay a stale batch instead of waiting for new events
+        return self._send(self._get_tracking_events_request(subscription_id, cursor, wait, limit), conditional=False)
+    
+    def _get_tracking_events_request(
+        self,
+        subscription_id: str,
+        cursor: str = None,
+        wait: float = 25.0,
+        limit: int = 100
+    ) -> ApiRequest:
+        """
+        Build the request for get_tracking_events
+        """
+        if not self.access_token:
+            raise Exception("No access token. Call authenticate or exchange_code first.")
+        
+        url = f"{self._tracking_subscription_url(subscription_id)}/events"
+        params = {
+            "wait": wait,
+            "limit": limit
+        }
+        if cursor:
+            params["cursor"] = cursor
+        
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        return ApiRequest("GET", url, headers=headers, params=params, error_message="Failed to get tracking events")
+    
+    def update_tracking_subscription(
+        self,
+        subscription_id: str,
+        add: Iterable[Tuple[str, str]] = (),
+        remove: Iterable[Tuple[str, str]] = ()
+    ) -> Dict[str, Any]:
+        """
+        Add shipments to or remove shipments from a tracking subscription
+        
+        Args:
+            subscription_id: The subscription to update
+            add: (tracking_number, carrier) pairs to start receiving events for
+            remove: (tracking_number, carrier) pairs to stop receiving events for
+        
+        Returns:
+            Dict containing the update result
+        """
+        return self._send(self._update_tracking_subscription_request(subscription_id, add, remove))
+    
+    def _update_tracking_subscription_request(
+        self,
+        subscription_id: str,
+        add: Iterable[Tuple[str, str]] = (),
+        remove: Iterable[Tuple[str, str]] = ()
+    ) -> ApiRequest:
+        """
+        Build the request for update_tracking_subscription
+        """
+        if not self.access_token:
+            raise Exception("No access token. Call authenticate or exchange_code first.")
+        
+        url = f"{self._tracking_subscription_url(subscription_id)}/shipments"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "X-App-ID": self.app_id
+        }
+        
+        payload = {
+            "add": self._tracking_shipments(add),
+            "remove": self._tracking_shipments(remove)
+        }
+        
+        return ApiRequest("POST", url, headers=headers, body=payload, error_message="Failed to update tracking subscription")
+    
+    def _tracking_subscription_url(self, subscription_id: str) -> str:
+        if not subscription_id:
+            raise ValueError("Subscription ID is required")
+        
+        return f"{self.base_url}/{self.api_version}/tracking/subscriptions/{urllib.parse.quote(subscription_id, safe='')}"
+    
+    def _tracking_shipments(self, shipments: Iterable[Tuple[str, str]]) -> List[Dict[str, str]]:
+        payload = []
+        for tracking_number, carrier in shipments:
+            if not tracking_number:
+                raise ValueError("Tracking number is required")
+            if not carrier or not self.carrier_index.supports_carrier(carrier):
+                raise ValueError(f"Invalid or unsupported carrier: {carrier}")
+            payload.append({"tracking_number": tracking_number, "carrier": carrier})
+        return payload
@@ -0,0 +1,70 @@
+# SecureAddress Bridge Python SDK: coalescing of identical in-flight requests
+
+import json
+import threading
+from typing import Any, Callable, Dict
+
+from .models import ApiRequest
+from .tokens import _Flight
+
+
+class RequestCoalescer:
+    """
+    Shares one in-flight request between concurrent identical GETs
+
+    Requests with the same method, URL, query parameters and headers (and
+    so the same access token) that arrive while one is in flight wait for
+    that request's response instead of sending their own. Each caller still
+    decodes the response into its own result.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: ApiRequest) -> tuple:
+        return (
+            request.method,
+            request.url,
+            json.dumps(request.params, sort_keys=True) if request.params else None,
+            tuple(sorted(request.headers.items())) if request.headers else None
+        )
+
+    def run(self, request: ApiRequest, send: Callable[[ApiRequest], Any]) -> Any:
+        """
+        Send the request, or wait for an identical one already in flight
+        """
+        key = self.key(request)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = send(request)
+            # Read the body before sharing the response between threads
+            flight.result.content
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.wait()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return how many requests were sent and how many callers shared one
+        """
+        with self._lock:
+            return {"sent": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._flights)}
@@ -0,0 +1,64 @@
+# SecureAddress Bridge Python SDK: errors raised by the SDK
+
+import time
+from typing import Any, Dict, Optional
+
+
+class SecureAddressError(Exception):
+    """
+    Raised when the SecureAddress Bridge API returns an error response
+    """
+
+    def __init__(self, message: str, status: int = None, data: Any = None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.data = data
+
+
+class RateLimitError(SecureAddressError):
+    """
+    Raised when the API rejects a request with 429 Too Many Requests
+    """
+
+    def __init__(self, message: str, status: int = 429, data: Any = None, retry_after: float = None):
+        super().__init__(message, status=status, data=data)
+        self.retry_after = retry_after
+
+
+def _error_data(response: Any) -> Dict[str, Any]:
+    """
+    Decode an error body, tolerating empty and non-JSON responses
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _error_message(error_data: Dict[str, Any], default: str) -> str:
+    error = error_data.get("error", default)
+    # Edge functions return {"error": {"code": ..., "message": ...}}
+    if isinstance(error, dict):
+        return error.get("message") or error.get("code") or default
+    return str(error)
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date
+    """
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # email.utils pulls in several modules; only HTTP-date values need it
+    import email.utils
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
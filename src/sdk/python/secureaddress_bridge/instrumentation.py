@@ -0,0 +1,256 @@
+# SecureAddress Bridge Python SDK: per-endpoint metrics, hooks and tracing
+
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from .models import ApiRequest
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetrics(NamedTuple):
+    """
+    Measurements for one API call, passed to after-request hooks
+    """
+    endpoint: str
+    method: str
+    url: str
+    status: Optional[int]
+    duration: float
+    attempts: int
+    request_bytes: int
+    response_bytes: int
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram (seconds) with percentile estimates
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th percentile (0-100) as the upper bound of its bucket
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
+
+
+# Path segments that are followed by a resource ID
+_ID_COLLECTIONS = frozenset(["subscriptions", "webhooks", "shipments", "wallets"])
+# Segments containing a digit are IDs too, except the API version
+_ID_SEGMENT = re.compile(r"^(?!v\d+$).*\d")
+
+
+def _endpoint_label(request: ApiRequest) -> str:
+    """
+    Label a request by method and path (e.g. "GET /v1/tracking") for metrics
+
+    Resource IDs are replaced with "{id}" (e.g. "GET /v1/tracking/subscriptions/{id}/events")
+    so the number of labels stays bounded.
+    """
+    segments = urllib.parse.urlsplit(request.url).path.split("/")
+    for i in range(1, len(segments)):
+        if segments[i] and (segments[i - 1] in _ID_COLLECTIONS or _ID_SEGMENT.search(segments[i])):
+            segments[i] = "{id}"
+    return f"{request.method} {'/'.join(segments)}"
+
+
+class _EndpointStats:
+    __slots__ = ("count", "errors", "retries", "request_bytes", "response_bytes", "statuses", "latency")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses = {}
+        self.latency = LatencyHistogram(buckets)
+
+
+class _InstrumentedCall:
+    __slots__ = ("instrumentation", "request", "endpoint", "started", "attempts", "span")
+
+    def __init__(self, instrumentation: "Instrumentation", request: ApiRequest):
+        self.instrumentation = instrumentation
+        self.request = request
+        self.endpoint = _endpoint_label(request)
+        self.attempts = 1
+        self.span = None
+        if instrumentation.tracer is not None:
+            self.span = instrumentation.tracer.start_span(
+                f"SecureAddressBridge {self.endpoint}",
+                attributes={"http.method": request.method, "http.url": request.url}
+            )
+        self.started = time.perf_counter()
+
+    def finish(self, response: Any = None, error: Optional[Exception] = None) -> None:
+        duration = time.perf_counter() - self.started
+        status = response.status_code if response is not None else None
+        request_bytes = len(json.dumps(self.request.body)) if self.request.body is not None else 0
+        response_bytes = len(getattr(response, "content", b"") or b"") if response is not None else 0
+        metrics = RequestMetrics(
+            self.endpoint,
+            self.request.method,
+            self.request.url,
+            status,
+            duration,
+            self.attempts,
+            request_bytes,
+            response_bytes,
+            error
+        )
+
+        if self.span is not None:
+            if status is not None:
+                self.span.set_attribute("http.status_code", status)
+            self.span.set_attribute("secureaddress.attempts", self.attempts)
+            if error is not None:
+                self.span.record_exception(error)
+            if not metrics.ok:
+                self.span.set_attribute("error", True)
+            self.span.end()
+
+        self.instrumentation.record(metrics)
+
+
+class Instrumentation:
+    """
+    Client-side request instrumentation
+
+    Keeps per-endpoint latency histograms, payload sizes, retry and error
+    counts, runs before/after request hooks and optionally emits one span
+    per call through an OpenTelemetry-style tracer (any object with
+    start_span(name, attributes=...) returning a span with set_attribute,
+    record_exception and end). Clients created without instrumentation skip
+    all of this with a single None check.
+    """
+
+    def __init__(self, tracer: Any = None, buckets: Iterable[float] = LatencyHistogram.DEFAULT_BUCKETS):
+        """
+        Initialize the instrumentation
+
+        Args:
+            tracer: Optional OpenTelemetry-compatible tracer
+            buckets: Latency histogram bucket upper bounds, in seconds
+        """
+        self.tracer = tracer
+        self.buckets = tuple(sorted(buckets))
+        self._before_hooks = []
+        self._after_hooks = []
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def add_hook(
+        self,
+        before: Callable[[ApiRequest], None] = None,
+        after: Callable[[RequestMetrics], None] = None
+    ) -> None:
+        """
+        Register callbacks run before each call is sent and after it completes
+
+        Hook errors are logged and never interrupt the request.
+        """
+        if before is not None:
+            self._before_hooks.append(before)
+        if after is not None:
+            self._after_hooks.append(after)
+
+    def start(self, request: ApiRequest) -> _InstrumentedCall:
+        for hook in self._before_hooks:
+            try:
+                hook(request)
+            except Exception:
+                logger.exception("Before-request hook failed")
+        return _InstrumentedCall(self, request)
+
+    def record(self, metrics: RequestMetrics) -> None:
+        """
+        Add a completed call to the per-endpoint statistics and run the after hooks
+        """
+        with self._lock:
+            stats = self._endpoints.get(metrics.endpoint)
+            if stats is None:
+                stats = self._endpoints[metrics.endpoint] = _EndpointStats(self.buckets)
+            stats.count += 1
+            stats.retries += metrics.attempts - 1
+            stats.request_bytes += metrics.request_bytes
+            stats.response_bytes += metrics.response_bytes
+            stats.latency.observe(metrics.duration)
+            if not metrics.ok:
+                stats.errors += 1
+            status = metrics.status if metrics.status is not None else type(metrics.error).__name__
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+        for hook in self._after_hooks:
+            try:
+                hook(metrics)
+            except Exception:
+                logger.exception("After-request hook failed")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-endpoint counters and latency percentiles
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "error_rate": stats.errors / stats.count,
+                    "retries": stats.retries,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "statuses": dict(stats.statuses),
+                    "latency": stats.latency.summary()
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
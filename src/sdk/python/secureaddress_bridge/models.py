@@ -0,0 +1,225 @@
+# SecureAddress Bridge Python SDK: request, result and response model types
+
+import collections.abc
+import json
+import re
+import types
+from typing import Any, Dict, Iterator, Mapping, NamedTuple, Optional, Union
+
+from .errors import SecureAddressError
+
+
+class ApiRequest(NamedTuple):
+    """
+    A fully prepared API call, shared by the sync and async clients
+    """
+    method: str
+    url: str
+    headers: Optional[Dict[str, str]] = None
+    params: Optional[Dict[str, Any]] = None
+    body: Any = None
+    error_message: str = "Request failed"
+
+
+class AddressResult(NamedTuple):
+    """
+    Outcome of fetching one token's address in a bulk get_addresses call
+    """
+    token: str
+    address: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ShipmentResult(NamedTuple):
+    """
+    Outcome of one shipment in a bulk request_shipments call
+    """
+    index: int
+    idempotency_key: str
+    shipment: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class LinkResult(NamedTuple):
+    """
+    Outcome of one wallet in a bulk link_wallets call
+    """
+    index: int
+    wallet_address: str
+    chain_id: Any
+    link: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    credential_pending: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_json_backend = None
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON with orjson when it is installed (the `speedups` extra),
+    otherwise with the standard json module
+    """
+    global _json_backend
+    if _json_backend is None:
+        try:
+            import orjson
+            _json_backend = orjson.loads
+        except ImportError:
+            _json_backend = json.loads
+    return _json_backend(data)
+
+
+# Whether a body is framed as a JSON object, checked without decoding it
+_JSON_OBJECT = re.compile(rb"\s*\{.*\}\s*\Z", re.DOTALL)
+
+
+class _Field:
+    """
+    Read-only typed attribute backed by a key of the model's parsed data
+    """
+
+    __slots__ = ("key", "default")
+
+    def __init__(self, key: str, default: Any = None):
+        self.key = key
+        self.default = default
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        return instance._parsed().get(self.key, self.default)
+
+
+class ResponseModel(collections.abc.Mapping):
+    """
+    Base class for typed API responses
+
+    Keeps the raw response bytes and only decodes them on first access, then
+    exposes the fields as attributes. Models are read-only mappings, so code
+    written against the dict API (response["city"], response.get("status"))
+    keeps working, and cached models cannot be changed through `data`;
+    to_dict() returns a plain dict copy.
+    """
+
+    __slots__ = ("raw", "_data")
+
+    def __init__(self, raw: Union[str, bytes] = None, data: Dict[str, Any] = None):
+        self.raw = raw
+        self._data = data
+
+    @property
+    def data(self) -> Mapping[str, Any]:
+        return types.MappingProxyType(self._parsed())
+
+    def _parsed(self) -> Dict[str, Any]:
+        data = self._data
+        if data is None:
+            try:
+                data = _json_loads(self.raw) if self.raw else {}
+            except ValueError:
+                raise SecureAddressError(f"Invalid JSON in {type(self).__name__} response") from None
+            self._data = data
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._parsed()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parsed())
+
+    def __len__(self) -> int:
+        return len(self._parsed())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._parsed())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._parsed()!r})"
+
+
+class Address(ResponseModel):
+    """
+    A get_address response
+    """
+
+    __slots__ = ()
+
+    street = _Field("street")
+    city = _Field("city")
+    state = _Field("state")
+    postal_code = _Field("postal_code")
+    country = _Field("country")
+    verification = _Field("verification")
+
+
+class TrackingInfo(ResponseModel):
+    """
+    A get_tracking_info response
+    """
+
+    __slots__ = ()
+
+    tracking_number = _Field("tracking_number")
+    carrier = _Field("carrier")
+    status = _Field("status")
+    estimated_delivery = _Field("estimated_delivery")
+    events = _Field("events", ())
+
+
+class ShippingToken(ResponseModel):
+    """
+    A create_blind_shipping_token response
+    """
+
+    __slots__ = ()
+
+    shipping_token = _Field("shipping_token")
+    carriers = _Field("carriers", ())
+    shipping_methods = _Field("shipping_methods", ())
+    expires_at = _Field("expires_at")
+    max_uses = _Field("max_uses")
+
+
+class WebhookRegistration(ResponseModel):
+    """
+    A register_webhook response
+    """
+
+    __slots__ = ()
+
+    id = _Field("id")
+    url = _Field("url")
+    events = _Field("events", ())
+    secret = _Field("secret")
+
+
+_RESPONSE_MODELS = {model.__name__: model for model in (Address, TrackingInfo, ShippingToken, WebhookRegistration)}
+
+
+def _parsed(value: Any) -> Any:
+    """
+    Decode a response model now, so a body that is not valid JSON raises
+    SecureAddressError before the model is cached
+    """
+    if isinstance(value, ResponseModel):
+        value._parsed()
+    return value
+
+
+def _json_size(value: Any) -> int:
+    if isinstance(value, ResponseModel) and value.raw is not None:
+        return len(value.raw)
+    return len(json.dumps(value.to_dict() if isinstance(value, ResponseModel) else value))
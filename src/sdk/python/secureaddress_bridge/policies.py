@@ -0,0 +1,350 @@
+# SecureAddress Bridge Python SDK: retry, client-side rate limiting and quota tracking
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .errors import _retry_after
+from .models import ApiRequest
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried
+
+    Delays grow exponentially with full jitter and honor Retry-After. POSTs are
+    only retried after an ambiguous failure (5xx, timeout, dropped connection)
+    when they carry an Idempotency-Key header; 429 responses and requests that
+    never reached the server are always safe to retry.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)
+    ):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_retries: Maximum number of retries per request (0 disables retries)
+            backoff_factor: Base delay in seconds, doubled on every attempt
+            max_backoff: Upper bound for a single backoff delay
+            jitter: Randomize delays to avoid synchronized retries
+            retry_statuses: HTTP status codes that are retried
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+
+    @staticmethod
+    def is_idempotent(request: ApiRequest) -> bool:
+        return request.method in ("GET", "HEAD", "OPTIONS", "PUT", "DELETE") or bool(
+            request.headers and request.headers.get("Idempotency-Key")
+        )
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def retry_delay(
+        self,
+        request: ApiRequest,
+        attempt: int,
+        response: Any = None,
+        error: Exception = None,
+        transport: Any = None
+    ) -> Optional[float]:
+        """
+        Return the delay before retrying, or None if the request must not be retried
+
+        Args:
+            request: The request that failed
+            attempt: Zero-based number of the attempt that just failed
+            response: The response, when one was received
+            error: The transport error, when no response was received
+            transport: The transport that sent the request (classifies errors)
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if response is not None:
+            status = response.status_code
+            if status not in self.retry_statuses:
+                return None
+            if status != 429 and not self.is_idempotent(request):
+                return None
+            return self.backoff(attempt, _retry_after(response))
+
+        connect_errors = getattr(transport, "connect_errors", ())
+        transient_errors = getattr(transport, "transient_errors", ())
+        if connect_errors and isinstance(error, connect_errors):
+            return self.backoff(attempt)
+        if transient_errors and isinstance(error, transient_errors) and self.is_idempotent(request):
+            return self.backoff(attempt)
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe client-side rate limiter
+
+    Allows bursts of up to `capacity` requests and refills at `rate` requests
+    per second. One bucket can be shared by many clients to stay under a
+    common quota.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Requests per second
+            capacity: Maximum burst size (defaults to one second of requests)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_quota(cls, limit: int, window_seconds: float, burst: float = None) -> "TokenBucket":
+        """
+        Create a bucket that spreads `limit` requests evenly over `window_seconds`
+        """
+        return cls(limit / float(window_seconds), capacity=burst)
+
+    def set_rate(self, rate: float, capacity: float = None) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+            self._tokens = min(self._tokens, self.capacity)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket
+
+        Returns:
+            Seconds the caller must wait before sending (0 when tokens were available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = max(0.0, self._paused_until - now)
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block until the tokens are available
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every request for the given time (e.g. after a 429 with Retry-After)
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float) -> None:
+        # Callers must hold the lock
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class QuotaTracker:
+    """
+    Local, thread-safe accounting of requests against the API quota
+
+    Counts every request (including retries) per endpoint in the current
+    quota window so that schedulers can call remaining() before each request
+    without a network call. The count is reconciled with the server's
+    usage-stats periodically, and an optional callback fires once per window
+    when usage crosses the warning threshold.
+    """
+
+    def __init__(
+        self,
+        limit: int = None,
+        window_seconds: float = 60.0,
+        warning_threshold: float = 0.9,
+        on_threshold: Callable[[Dict[str, Any]], None] = None,
+        reconcile_interval: Optional[float] = 300.0
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            limit: Requests allowed per window (learned from usage-stats when omitted)
+            window_seconds: Length of the quota window
+            warning_threshold: Fraction of the limit at which on_threshold fires
+            on_threshold: Called with usage() when usage crosses the threshold
+            reconcile_interval: Seconds between background usage-stats
+                reconciliations (None to only reconcile on get_usage_stats)
+        """
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.warning_threshold = warning_threshold
+        self.on_threshold = on_threshold
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._used = 0
+        self._endpoints = {}
+        self._warned = False
+        self._total = 0
+        self._reconciling = False
+        self._last_reconcile = None
+
+    def _roll(self, now: float) -> None:
+        # Callers must hold the lock
+        if now - self._window_start >= self.window_seconds:
+            elapsed_windows = (now - self._window_start) // self.window_seconds
+            self._window_start += elapsed_windows * self.window_seconds
+            self._used = 0
+            self._endpoints = {}
+            self._warned = False
+
+    def record(self, endpoint: str, count: int = 1) -> None:
+        """
+        Count requests sent to an endpoint
+        """
+        with self._lock:
+            self._roll(time.monotonic())
+            self._used += count
+            self._total += count
+            self._endpoints[endpoint] = self._endpoints.get(endpoint, 0) + count
+            crossed = self._crossed_threshold()
+        if crossed:
+            self._notify()
+
+    def _crossed_threshold(self) -> bool:
+        # Callers must hold the lock
+        if self._warned or not self.limit or self._used < self.limit * self.warning_threshold:
+            return False
+        self._warned = True
+        return True
+
+    def _notify(self) -> None:
+        if self.on_threshold is None:
+            return
+        try:
+            self.on_threshold(self.usage())
+        except Exception:
+            logger.exception("Quota threshold callback failed")
+
+    def remaining(self) -> Optional[int]:
+        """
+        Requests left in the current window, or None while the limit is unknown
+        """
+        if not self.limit:
+            return None
+        with self._lock:
+            self._roll(time.monotonic())
+            return max(self.limit - self._used, 0)
+
+    def usage(self) -> Dict[str, Any]:
+        """
+        Return the current window's accounting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._roll(now)
+            return {
+                "limit": self.limit,
+                "used": self._used,
+                "remaining": max(self.limit - self._used, 0) if self.limit else None,
+                "window_seconds": self.window_seconds,
+                "resets_in": max(self._window_start + self.window_seconds - now, 0.0),
+                "endpoints": dict(self._endpoints)
+            }
+
+    def reconcile_due(self) -> bool:
+        """
+        Whether a background reconciliation should start now; claims it if so
+        """
+        if self.reconcile_interval is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if self._reconciling:
+                return False
+            if self._last_reconcile is not None and now - self._last_reconcile < self.reconcile_interval:
+                return False
+            self._reconciling = True
+            self._last_reconcile = now
+            return True
+
+    def reconcile_failed(self) -> None:
+        with self._lock:
+            self._reconciling = False
+
+    def mark(self) -> int:
+        """
+        Return a marker to pass to reconcile, taken just before requesting usage-stats
+        """
+        return self._total
+
+    def reconcile(self, usage_stats: Dict[str, Any], mark: int = None) -> None:
+        """
+        Adopt the server's view of the quota from a get_usage_stats result
+
+        Reads `rate_limit` (or the top level) for `limit`, `window_seconds`,
+        `remaining` or `used`, and `reset_in` (seconds until the window resets).
+
+        Args:
+            usage_stats: A get_usage_stats result
+            mark: mark() taken before the usage-stats request; requests
+                recorded since then are added to the server's count (which
+                may count a request twice, erring on the side of caution)
+        """
+        quota = usage_stats.get("rate_limit", usage_stats)
+        if not isinstance(quota, dict):
+            quota = {"limit": quota}
+
+        with self._lock:
+            now = time.monotonic()
+            if quota.get("limit"):
+                self.limit = int(quota["limit"])
+            if quota.get("window_seconds"):
+                self.window_seconds = float(quota["window_seconds"])
+            if quota.get("reset_in") is not None:
+                self._window_start = now - max(self.window_seconds - float(quota["reset_in"]), 0.0)
+            else:
+                self._roll(now)
+
+            used = quota.get("used")
+            if quota.get("remaining") is not None and self.limit:
+                used = self.limit - int(quota["remaining"])
+            if used is not None:
+                in_flight = self._total - mark if mark is not None else 0
+                self._used = int(used) + in_flight
+                self._warned = bool(self.limit) and self._used >= self.limit * self.warning_threshold and self._warned
+
+            self._reconciling = False
+            self._last_reconcile = now
+            crossed = self._crossed_threshold()
+        if crossed:
+            self._notify()
@@ -0,0 +1,319 @@
+# SecureAddress Bridge Python SDK: multi-tenant client registry
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .client import SecureAddressBridge
+from .tokens import _Flight
+from .transport import HttpTransport
+
+
+class ClientRegistry:
+    """
+    Thread-safe registry of SecureAddressBridge clients, one per app_id
+
+    Every tenant's client shares one pooled transport, authenticates once
+    and keeps its token refreshed, so fetching a tenant's client is a dict
+    lookup. Clients idle for longer than idle_timeout (or beyond max_tenants,
+    least recently used first) are closed whenever get() is called, or by
+    evict_idle(); their unexpired tokens and capability tables are kept and
+    reused when the tenant returns.
+    """
+
+    client_class = SecureAddressBridge
+
+    def __init__(
+        self,
+        base_url: str = "https://api.secureaddress.bridge",
+        api_version: str = "v1",
+        transport: Any = None,
+        idle_timeout: Optional[float] = 900.0,
+        max_tenants: int = None,
+        load_capabilities: bool = False,
+        **client_options: Any
+    ):
+        """
+        Initialize the registry
+
+        Args:
+            base_url: The base URL of the SecureAddress Bridge API
+            api_version: The API version to use
+            transport: Transport shared by every tenant (a pooled one is
+                created, and closed with the registry, when omitted)
+            idle_timeout: Seconds after which an unused tenant client is
+                closed (None to keep clients until max_tenants is exceeded)
+            max_tenants: Maximum number of live tenant clients
+            load_capabilities: Fetch each tenant's carrier capabilities once
+            **client_options: Extra arguments for every tenant client
+                (e.g. retry_policy, cache, instrumentation)
+        """
+        self.base_url = base_url
+        self.api_version = api_version
+        self._owns_transport = transport is None
+        self.transport = transport or self._create_transport()
+        self.idle_timeout = idle_timeout
+        self.max_tenants = max_tenants
+        self.load_capabilities = load_capabilities
+        self.client_options = client_options
+        self.evictions = 0
+        self._credentials = {}
+        self._clients = OrderedDict()
+        self._last_used = {}
+        self._tokens = {}
+        self._carrier_indexes = {}
+        self._flights = {}
+        # A fresh number per register() call, so a client created from
+        # superseded credentials is never installed
+        self._generations = {}
+        self._registrations = itertools.count()
+        self._lock = threading.Lock()
+
+    def _create_transport(self) -> Any:
+        return HttpTransport()
+
+    def register(self, app_id: str, app_secret: str, **client_options: Any) -> None:
+        """
+        Add (or update) a tenant's credentials; its client is created on first use
+
+        Args:
+            app_id: The tenant's application ID
+            app_secret: The tenant's application secret
+            **client_options: Per-tenant client arguments, overriding the registry's
+        """
+        with self._lock:
+            self._credentials[app_id] = (app_secret, client_options)
+            self._generations[app_id] = next(self._registrations)
+            self._tokens.pop(app_id, None)
+            stale = self._clients.pop(app_id, None)
+        if stale is not None:
+            self._close_client(stale)
+
+    def unregister(self, app_id: str) -> None:
+        """
+        Remove a tenant and close its client
+        """
+        with self._lock:
+            self._credentials.pop(app_id, None)
+            self._generations.pop(app_id, None)
+            self._tokens.pop(app_id, None)
+            self._carrier_indexes.pop(app_id, None)
+            self._last_used.pop(app_id, None)
+            client = self._clients.pop(app_id, None)
+        if client is not None:
+            self._close_client(client)
+
+    def get(self, app_id: str) -> SecureAddressBridge:
+        """
+        Return the tenant's authenticated client, creating it on first use
+
+        Concurrent first requests for a tenant share one authentication.
+        Clients that have gone idle are closed on the way.
+
+        Raises:
+            KeyError: If the app_id was never registered
+        """
+        with self._lock:
+            client = self._clients.get(app_id)
+            if client is not None:
+                self._touch(app_id)
+                evicted = self._collect_evictions()
+            else:
+                if app_id not in self._credentials:
+                    raise KeyError(f"Unknown tenant: {app_id}")
+                flight = self._flights.get(app_id)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[app_id] = _Flight()
+
+        if client is not None:
+            for stale in evicted:
+                self._close_client(stale)
+            return client
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            client, evicted = self._create_current_client(app_id)
+            flight.result = client
+        except Exception as e:
+            flight.error = e
+            evicted = []
+        finally:
+            with self._lock:
+                self._flights.pop(app_id, None)
+            flight.done.set()
+
+        for stale in evicted:
+            self._close_client(stale)
+        return flight.wait()
+
+    __getitem__ = get
+
+    def _touch(self, app_id: str) -> None:
+        # Callers must hold the lock
+        self._clients.move_to_end(app_id)
+        self._last_used[app_id] = time.monotonic()
+
+    def _client_kwargs(self, app_id: str) -> Dict[str, Any]:
+        # Callers must hold the lock
+        app_secret, tenant_options = self._credentials[app_id]
+        options = dict(self.client_options, **tenant_options)
+        options.setdefault("auto_refresh", True)
+        return dict(
+            options,
+            app_id=app_id,
+            app_secret=app_secret,
+            base_url=self.base_url,
+            api_version=self.api_version,
+            transport=self.transport,
+            carrier_index=self._carrier_indexes.get(app_id) or options.get("carrier_index")
+        )
+
+    def _generation(self, app_id: str) -> int:
+        with self._lock:
+            if app_id not in self._credentials:
+                raise KeyError(f"Unknown tenant: {app_id}")
+            return self._generations[app_id]
+
+    def _install(self, app_id: str, client: SecureAddressBridge, generation: int) -> Optional[List[SecureAddressBridge]]:
+        """
+        Make client the tenant's live client unless the tenant was re-registered
+        (or removed) while it was being created
+
+        Returns:
+            The clients evicted to make room, or None when client is stale
+        """
+        with self._lock:
+            if self._generations.get(app_id) != generation:
+                return None
+            self._carrier_indexes[app_id] = client.carrier_index
+            self._clients[app_id] = client
+            self._touch(app_id)
+            return self._collect_evictions()
+
+    def _create_current_client(self, app_id: str) -> Tuple[SecureAddressBridge, List[SecureAddressBridge]]:
+        while True:
+            generation = self._generation(app_id)
+            client = self._create_client(app_id)
+            evicted = self._install(app_id, client, generation)
+            if evicted is not None:
+                return client, evicted
+            self._close_client(client)
+
+    def _create_client(self, app_id: str) -> SecureAddressBridge:
+        with self._lock:
+            kwargs = self._client_kwargs(app_id)
+            load_capabilities = self.load_capabilities and app_id not in self._carrier_indexes
+        client = self.client_class(**kwargs)
+        try:
+            token = self._saved_token(app_id)
+            if token is not None:
+                client._store_token(token, app_token=True)
+            else:
+                client.authenticate()
+            if load_capabilities:
+                client.refresh_capabilities()
+        except BaseException:
+            self._close_client(client)
+            raise
+        return client
+
+    def _saved_token(self, app_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            saved = self._tokens.pop(app_id, None)
+        if saved is None:
+            return None
+        token, expires_at = saved
+        if expires_at is not None:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                return None
+            token = dict(token, expires_in=remaining)
+        return token
+
+    def _save_token(self, app_id: str, client: SecureAddressBridge) -> None:
+        # Callers must hold the lock
+        manager = client.token_manager
+        if manager is not None:
+            if manager.access_token and not manager.expired():
+                self._tokens[app_id] = (
+                    {"access_token": manager.access_token, "refresh_token": manager.refresh_token},
+                    manager.expires_at
+                )
+        elif client._access_token:
+            self._tokens[app_id] = ({"access_token": client._access_token}, None)
+
+    def _collect_evictions(self) -> List[SecureAddressBridge]:
+        # Callers must hold the lock; clients are closed after it is released
+        evicted = []
+        now = time.monotonic()
+        while self._clients:
+            app_id = next(iter(self._clients))
+            idle = self.idle_timeout is not None and now - self._last_used[app_id] > self.idle_timeout
+            full = self.max_tenants is not None and len(self._clients) > self.max_tenants
+            if not (idle or full):
+                break
+            client = self._clients.pop(app_id)
+            self._last_used.pop(app_id, None)
+            self._save_token(app_id, client)
+            evicted.append(client)
+            self.evictions += 1
+        return evicted
+
+    def evict_idle(self) -> int:
+        """
+        Close clients that have been idle longer than idle_timeout
+
+        Returns:
+            The number of clients closed
+        """
+        with self._lock:
+            evicted = self._collect_evictions()
+        for client in evicted:
+            self._close_client(client)
+        return len(evicted)
+
+    def _close_client(self, client: SecureAddressBridge) -> None:
+        client.close()
+
+    def tenants(self) -> List[str]:
+        """
+        Return every registered app_id
+        """
+        with self._lock:
+            return list(self._credentials)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return tenant, live client and eviction counters
+        """
+        with self._lock:
+            return {
+                "tenants": len(self._credentials),
+                "active": len(self._clients),
+                "saved_tokens": len(self._tokens),
+                "evictions": self.evictions
+            }
+
+    def close(self) -> None:
+        """
+        Close every tenant client and the registry's transport
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._last_used.clear()
+        for client in clients:
+            client.close()
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "ClientRegistry":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,550 @@
+# SecureAddress Bridge Python SDK: offline sandbox that simulates the API
+
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .transport import BufferedResponse
+
+
+class SandboxEngine:
+    """
+    In-process simulation of the SecureAddress Bridge API
+
+    Answers every endpoint the clients call with deterministic data derived
+    from the request (the same token always yields the same address, the same
+    tracking number the same status), with configurable latency and error
+    injection and no network I/O. Tracking subscriptions advance each
+    shipment by one status per poll, so event streams run to delivery
+    quickly. Shared by SandboxTransport and AsyncSandboxTransport.
+    """
+
+    DEFAULT_ADDRESS = {
+        "street": "123 Privacy Lane",
+        "city": "Secureville",
+        "state": "California",
+        "postal_code": "90210",
+        "country": "US"
+    }
+
+    SHIPPING_METHODS = {
+        "usps": ["Priority", "First-Class", "Ground", "Express"],
+        "fedex": ["Ground", "2Day", "Express", "Overnight"],
+        "ups": ["Ground", "Next Day Air", "2nd Day Air", "3 Day Select"]
+    }
+
+    TRACKING_STATUSES = ("pre_transit", "in_transit", "out_for_delivery", "delivered")
+
+    # GET endpoints answered with an ETag (and 304 Not Modified for a matching If-None-Match)
+    ETAG_ROUTES = frozenset(["address", "tracking", "capabilities", ".well-known/jwks.json"])
+
+    def __init__(self, config: Dict[str, Any] = None, seed: int = None):
+        """
+        Initialize the engine
+
+        Args:
+            config: Initial settings (see configure)
+            seed: Seed for latency and error injection, for reproducible runs
+        """
+        self.simulate_errors = False
+        self.error_rate = 0.1
+        self.error_statuses = (503,)
+        self.verification_success = True
+        self.mock_address = None
+        self.latency = 0.0
+        self.rate_limit = 10000
+        self.window_seconds = 60.0
+        self.subscription_ttl = None
+        self._subscriptions = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self.requests = {}
+        self._routes = {
+            ("POST", "auth"): self._auth,
+            ("POST", "token"): self._token,
+            ("GET", "address"): self._address,
+            ("POST", "address/batch"): self._address_batch,
+            ("GET", ".well-known/jwks.json"): self._jwks,
+            ("GET", "validate-token"): self._validate_token,
+            ("POST", "webhooks"): self._register_webhook,
+            ("POST", "link-wallet"): self._link_wallet,
+            ("GET", "usage-stats"): self._usage_stats,
+            ("GET", "capabilities"): self._capabilities,
+            ("POST", "create-shipping-token"): self._create_shipping_token,
+            ("POST", "request-shipment"): self._request_shipment,
+            ("POST", "request-shipment/batch"): self._request_shipment_batch,
+            ("GET", "tracking"): self._tracking,
+            ("POST", "tracking/subscriptions"): self._create_tracking_subscription,
+            ("GET", "tracking/subscriptions/*/events"): self._tracking_events,
+            ("POST", "tracking/subscriptions/*/shipments"): self._update_tracking_subscription,
+            ("POST", "confirm-delivery"): self._confirm_delivery
+        }
+        if config:
+            self.configure(config)
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """
+        Update the simulation settings
+
+        Args:
+            config: Dict with any of
+                - simulate_errors: Fail a fraction of requests
+                - error_rate: Fraction of requests to fail (default 0.1)
+                - error_status: Status code (or list of codes) for injected errors
+                - verification_success: Whether tokens and addresses verify
+                - mock_address: Address fields returned by get_address
+                - latency: Seconds per request, a (min, max) range, or a
+                  callable returning seconds (e.g. lambda: random.expovariate(50))
+                - rate_limit / window_seconds: Quota reported by usage-stats
+                - subscription_ttl: Seconds an unpolled tracking subscription
+                  lives before it expires (never by default)
+        """
+        with self._lock:
+            if "simulate_errors" in config:
+                self.simulate_errors = bool(config["simulate_errors"])
+            if "error_rate" in config:
+                self.error_rate = float(config["error_rate"])
+            if "error_status" in config:
+                status = config["error_status"]
+                self.error_statuses = tuple(status) if isinstance(status, (list, tuple)) else (status,)
+            if "verification_success" in config:
+                self.verification_success = bool(config["verification_success"])
+            if "mock_address" in config:
+                self.mock_address = dict(config["mock_address"]) if config["mock_address"] else None
+            if "latency" in config:
+                self.latency = config["latency"]
+            if "rate_limit" in config:
+                self.rate_limit = config["rate_limit"]
+            if "window_seconds" in config:
+                self.window_seconds = float(config["window_seconds"])
+            if "subscription_ttl" in config:
+                self.subscription_ttl = config["subscription_ttl"]
+
+    def sample_latency(self) -> float:
+        """
+        Draw the simulated latency for one request, in seconds
+        """
+        latency = self.latency
+        if callable(latency):
+            return max(0.0, float(latency()))
+        if isinstance(latency, (list, tuple)):
+            with self._lock:
+                return self._random.uniform(latency[0], latency[1])
+        return float(latency or 0.0)
+
+    def handle(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        params: Dict[str, Any] = None,
+        json: Any = None
+    ) -> BufferedResponse:
+        """
+        Answer one request (latency is applied by the transport)
+        """
+        parts = urllib.parse.urlsplit(url)
+        segments = parts.path.strip("/").split("/")
+        if len(segments) > 1 and segments[0][:1] == "v" and segments[0][1:].isdigit():
+            segments = segments[1:]
+        route = "/".join(segments)
+
+        query = {key: values[-1] for key, values in urllib.parse.parse_qs(parts.query).items()}
+        query.update(params or {})
+        headers = headers or {}
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window_seconds:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+            self.requests[route] = self.requests.get(route, 0) + 1
+            fail = self.simulate_errors and self._random.random() < self.error_rate
+            status = self._random.choice(self.error_statuses) if fail else None
+
+        if fail:
+            return self._response(status, {"error": {"message": "Simulated sandbox error"}}, {"Retry-After": "1"})
+
+        handler = self._routes.get((method.upper(), route))
+        resource_id = None
+        if handler is None and len(segments) > 3:
+            # Resource routes such as tracking/subscriptions/{id}/events
+            resource_id = urllib.parse.unquote(segments[2])
+            handler = self._routes.get((method.upper(), "/".join(segments[:2] + ["*"] + segments[3:])))
+        if handler is None:
+            return self._response(404, {"error": {"message": f"Unknown sandbox endpoint: {method} /{route}"}})
+
+        authorization = headers.get("Authorization", "")
+        token = authorization[7:] if authorization.startswith("Bearer ") else None
+        response = handler(token=token, query=query, body=json or {}, headers=headers, resource_id=resource_id)
+        if method.upper() == "GET" and route in self.ETAG_ROUTES and response.status_code == 200:
+            return self._conditional(response, headers.get("If-None-Match"))
+        return response
+
+    @staticmethod
+    def _conditional(response: BufferedResponse, if_none_match: Optional[str]) -> BufferedResponse:
+        etag = f'"{hashlib.sha256(response.content).hexdigest()[:32]}"'
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            return BufferedResponse(304, {"ETag": etag}, b"")
+        response.headers["ETag"] = etag
+        return response
+
+    @staticmethod
+    def _response(status: int, body: Any, headers: Dict[str, str] = None) -> BufferedResponse:
+        response_headers = {"Content-Type": "application/json"}
+        response_headers.update(headers or {})
+        return BufferedResponse(status, response_headers, json.dumps(body).encode("utf-8"))
+
+    @staticmethod
+    def _digest(*values: Any) -> str:
+        return hashlib.sha256("|".join(str(value) for value in values).encode("utf-8")).hexdigest()
+
+    def _unauthorized(self) -> BufferedResponse:
+        return self._response(401, {"error": {"message": "Missing or invalid access token"}})
+
+    def _auth(self, body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        return self._response(200, {
+            "access_token": f"sandbox_{self._digest('app', body.get('app_id'), time.time())[:32]}",
+            "token_type": "Bearer",
+            "expires_in": 3600
+        })
+
+    def _token(self, body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        grant = body.get("code") or body.get("refresh_token")
+        return self._response(200, {
+            "access_token": f"sandbox_{self._digest('user', grant, time.time())[:32]}",
+            "refresh_token": f"sandbox_refresh_{self._digest('refresh', grant)[:32]}",
+            "token_type": "Bearer",
+            "expires_in": 3600
+        })
+
+    def address_for(self, token: str, fields: List[str] = None, include_verification: bool = False) -> Dict[str, Any]:
+        """
+        Return the deterministic sandbox address for a user access token
+        """
+        address = dict(self.DEFAULT_ADDRESS)
+        digest = self._digest("address", token)
+        address["street"] = f"{int(digest[:4], 16) % 9000 + 100} Privacy Lane"
+        if self.mock_address:
+            address.update(self.mock_address)
+        if include_verification:
+            address["verification"] = {
+                "verified": self.verification_success,
+                "method": "sandbox",
+                "verification_id": f"sandbox_ver_{digest[4:20]}"
+            }
+        if fields:
+            # Verification details stay whole unless the projection selects within them
+            if include_verification and not any(field.split(".", 1)[0] == "verification" for field in fields):
+                fields = list(fields) + ["verification"]
+            address = self._project(address, fields)
+        return address
+
+    @classmethod
+    def _project(cls, data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """
+        Keep only the dotted field paths in fields (e.g. "verification.method")
+        """
+        nested = {}
+        for field in fields:
+            name, _, rest = field.partition(".")
+            if name in data:
+                nested.setdefault(name, []).append(rest)
+        projected = {}
+        for name, rests in nested.items():
+            value = data[name]
+            if "" in rests or not isinstance(value, dict):
+                projected[name] = value
+            else:
+                projected[name] = cls._project(value, rests)
+        return projected
+
+    def _address(self, token: Optional[str], query: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        fields = query["fields"].split(",") if query.get("fields") else None
+        return self._response(200, self.address_for(token, fields, query.get("include_verification") == "true"))
+
+    def _address_batch(self, token: Optional[str], body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        fields = body.get("fields")
+        include_verification = bool(body.get("include_verification"))
+        return self._response(200, {
+            "results": [
+                {"token": user_token, "address": self.address_for(user_token, fields, include_verification)}
+                for user_token in body.get("tokens", [])
+            ]
+        })
+
+    def _jwks(self, **request: Any) -> BufferedResponse:
+        return self._response(200, {"keys": []})
+
+    def _validate_token(self, token: Optional[str], headers: Dict[str, str], **request: Any) -> BufferedResponse:
+        if not token or not self.verification_success:
+            return self._response(401, {"error": {"message": "Token is invalid or expired"}})
+        return self._response(200, {
+            "app_id": headers.get("X-App-ID"),
+            "scope": ["street", "city", "state", "postal_code", "country"],
+            "expires_in": 3600
+        })
+
+    def _register_webhook(self, token: Optional[str], body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        webhook_id = f"wh_{self._digest('webhook', body.get('url'))[:16]}"
+        return self._response(200, {
+            "id": webhook_id,
+            "url": body.get("url"),
+            "events": body.get("events", []),
+            "secret": body.get("secret") or f"whsec_{self._digest('secret', webhook_id)[:24]}"
+        })
+
+    def _link_wallet(self, token: Optional[str], body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        if not self.verification_success:
+            return self._response(400, {"error": {"message": "Address verification failed"}})
+        link_id = f"sandbox_link_{self._digest('link', body.get('wallet_address'), body.get('chain_id'))[:16]}"
+        result = {
+            "success": True,
+            "link_id": link_id,
+            "wallet_address": body.get("wallet_address"),
+            "chain_id": body.get("chain_id")
+        }
+        if body.get("create_vc"):
+            result["verifiable_credential"] = {
+                "id": f"urn:uuid:{uuid.UUID(self._digest('vc', link_id)[:32])}",
+                "type": ["VerifiableCredential", "AddressVerificationCredential"],
+                "issuer": "did:web:sandbox.secureaddress.bridge"
+            }
+        return self._response(200, result)
+
+    def _usage_stats(self, token: Optional[str], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        with self._lock:
+            used = self._window_requests
+            by_endpoint = dict(self.requests)
+        return self._response(200, {
+            "requests": sum(by_endpoint.values()),
+            "endpoints": by_endpoint,
+            "rate_limit": {
+                "limit": self.rate_limit,
+                "window_seconds": self.window_seconds,
+                "remaining": max(self.rate_limit - used, 0)
+            }
+        })
+
+    def _capabilities(self, **request: Any) -> BufferedResponse:
+        return self._response(200, {"carriers": self.SHIPPING_METHODS})
+
+    def _create_shipping_token(self, token: Optional[str], body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        return self._response(200, {
+            "shipping_token": f"bst_{self._digest('shipping', token, body.get('carriers'), body.get('shipping_methods'))[:24]}",
+            "carriers": body.get("carriers", []),
+            "shipping_methods": body.get("shipping_methods", []),
+            "require_confirmation": body.get("require_confirmation", False),
+            "expiry_days": body.get("expiry_days", 7),
+            "max_uses": body.get("max_uses", 1)
+        })
+
+    def shipment_for(self, shipment: Dict[str, Any], idempotency_key: str = None) -> Dict[str, Any]:
+        """
+        Return the deterministic sandbox shipment for a request (keyed by its idempotency key)
+        """
+        digest = self._digest("shipment", idempotency_key or json.dumps(shipment, sort_keys=True))
+        return {
+            "shipment_id": f"shp_{digest[:16]}",
+            "tracking_number": f"SBX{int(digest[16:32], 16) % 10 ** 16:016d}",
+            "carrier": shipment.get("carrier"),
+            "service": shipment.get("service"),
+            "status": "pre_transit"
+        }
+
+    def _request_shipment(self, body: Dict[str, Any], headers: Dict[str, str], **request: Any) -> BufferedResponse:
+        return self._response(200, self.shipment_for(body, headers.get("Idempotency-Key")))
+
+    def _request_shipment_batch(self, body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        return self._response(200, {
+            "results": [
+                dict(self.shipment_for(shipment, shipment.get("idempotency_key")), idempotency_key=shipment.get("idempotency_key"))
+                for shipment in body.get("shipments", [])
+            ]
+        })
+
+    def _tracking_status(self, tracking_number: str) -> int:
+        return int(self._digest("tracking", tracking_number)[:2], 16) % len(self.TRACKING_STATUSES)
+
+    def _tracking(self, query: Dict[str, Any], **request: Any) -> BufferedResponse:
+        number = query.get("number", "")
+        status = self.TRACKING_STATUSES[self._tracking_status(number)]
+        return self._response(200, {
+            "tracking_number": number,
+            "carrier": query.get("carrier"),
+            "status": status,
+            "events": [{"status": s} for s in self.TRACKING_STATUSES[:self.TRACKING_STATUSES.index(status) + 1]]
+        })
+
+    def _confirm_delivery(self, token: Optional[str], body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        with self._lock:
+            for subscription in self._subscriptions.values():
+                if (body.get("tracking_number"), body.get("carrier")) in subscription["shipments"]:
+                    self._emit(subscription, "delivery.confirmed", body.get("tracking_number"), body.get("carrier"), "delivered")
+        return self._response(200, {
+            "confirmed": True,
+            "tracking_number": body.get("tracking_number"),
+            "carrier": body.get("carrier")
+        })
+
+    def _create_tracking_subscription(self, token: Optional[str], body: Dict[str, Any], **request: Any) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        subscription_id = f"sub_{uuid.uuid4().hex[:16]}"
+        with self._lock:
+            self._subscriptions[subscription_id] = {
+                "shipments": {(s.get("tracking_number"), s.get("carrier")): None for s in body.get("shipments", [])},
+                "event_types": set(body.get("event_types") or ("tracking.updated", "delivery.confirmed")),
+                "events": [],
+                "polled_at": time.monotonic()
+            }
+        return self._response(200, {"subscription_id": subscription_id, "cursor": "0"})
+
+    def _live_subscription(self, subscription_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a subscription unless it is unknown or has expired (callers must hold the lock)
+        """
+        subscription = self._subscriptions.get(subscription_id)
+        if subscription is None:
+            return None
+        now = time.monotonic()
+        if self.subscription_ttl is not None and now - subscription["polled_at"] > self.subscription_ttl:
+            del self._subscriptions[subscription_id]
+            return None
+        subscription["polled_at"] = now
+        return subscription
+
+    def _emit(self, subscription: Dict[str, Any], event_type: str, tracking_number: str, carrier: str, status: str) -> None:
+        if event_type not in subscription["event_types"]:
+            return
+        position = len(subscription["events"]) + 1
+        subscription["events"].append({
+            "id": f"evt_{self._digest('event', id(subscription), position)[:16]}",
+            "type": event_type,
+            "cursor": str(position),
+            "tracking_number": tracking_number,
+            "carrier": carrier,
+            "status": status,
+            "occurred_at": int(time.time())
+        })
+
+    def _advance_shipments(self, subscription: Dict[str, Any]) -> None:
+        """
+        Move every undelivered shipment one tracking status forward (callers must hold the lock)
+        """
+        last = len(self.TRACKING_STATUSES) - 1
+        for key, index in subscription["shipments"].items():
+            if index == last:
+                continue
+            index = self._tracking_status(key[0]) if index is None else index + 1
+            subscription["shipments"][key] = index
+            self._emit(subscription, "tracking.updated", key[0], key[1], self.TRACKING_STATUSES[index])
+
+    def _tracking_events(
+        self,
+        token: Optional[str],
+        query: Dict[str, Any],
+        resource_id: str,
+        **request: Any
+    ) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        try:
+            position = int(query.get("cursor") or 0)
+            limit = int(query.get("limit") or 100)
+        except ValueError:
+            return self._response(400, {"error": {"message": "Invalid cursor"}})
+
+        with self._lock:
+            subscription = self._live_subscription(resource_id)
+            if subscription is None:
+                return self._response(404, {"error": {"message": "Unknown or expired subscription"}})
+            if position >= len(subscription["events"]):
+                self._advance_shipments(subscription)
+            events = subscription["events"][position:position + limit]
+        return self._response(200, {"events": events, "cursor": str(position + len(events))})
+
+    def _update_tracking_subscription(
+        self,
+        token: Optional[str],
+        body: Dict[str, Any],
+        resource_id: str,
+        **request: Any
+    ) -> BufferedResponse:
+        if not token:
+            return self._unauthorized()
+        with self._lock:
+            subscription = self._live_subscription(resource_id)
+            if subscription is None:
+                return self._response(404, {"error": {"message": "Unknown or expired subscription"}})
+            for shipment in body.get("add", []):
+                subscription["shipments"].setdefault((shipment.get("tracking_number"), shipment.get("carrier")), None)
+            for shipment in body.get("remove", []):
+                subscription["shipments"].pop((shipment.get("tracking_number"), shipment.get("carrier")), None)
+            count = len(subscription["shipments"])
+        return self._response(200, {"subscription_id": resource_id, "shipments": count})
+
+
+class SandboxTransport:
+    """
+    Transport that answers every request from a SandboxEngine, with no network I/O
+
+    Used by SecureAddressBridge(sandbox=True); pass one explicitly to share an
+    engine between clients.
+    """
+
+    connect_errors = ()
+    transient_errors = ()
+
+    def __init__(self, engine: SandboxEngine = None, **config: Any):
+        """
+        Initialize the transport
+
+        Args:
+            engine: SandboxEngine to answer requests (a new one is created when omitted)
+            **config: Settings applied to the engine (see SandboxEngine.configure)
+        """
+        self.engine = engine or SandboxEngine()
+        if config:
+            self.engine.configure(config)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        params: Dict[str, Any] = None,
+        json: Any = None
+    ) -> BufferedResponse:
+        latency = self.engine.sample_latency()
+        if latency > 0:
+            time.sleep(latency)
+        return self.engine.handle(method, url, headers=headers, params=params, json=json)
+
+    def connection_stats(self) -> Dict[str, int]:
+        return {"requests": sum(self.engine.requests.values()), "new_connections": 0, "reused_connections": 0}
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,454 @@
+# SecureAddress Bridge Python SDK: access token validation and refresh
+
+import base64
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class ParsedToken(NamedTuple):
+    """
+    The decoded parts of a signed (JWS compact) access token
+    """
+    header: Dict[str, Any]
+    claims: Dict[str, Any]
+    signing_input: bytes
+    signature: bytes
+
+
+class LocalTokenValidator:
+    """
+    Validates signed access tokens locally against the API's published signing
+    keys (JWKS), so validate_token can skip the validate-token round trip
+
+    Opaque tokens, unknown key IDs, unsupported algorithms and tokens without
+    an exp claim cannot be decided locally; validate_token falls back to the
+    network for those. Signature
+    checks require the `crypto` extra (cryptography); without it every token
+    falls back to the network.
+    """
+
+    SUPPORTED_ALGORITHMS = frozenset(["RS256", "RS384", "RS512", "ES256", "ES384"])
+    EC_CURVES = {"ES256": "P-256", "ES384": "P-384"}
+
+    def __init__(
+        self,
+        jwks_ttl: float = 3600.0,
+        min_refresh_interval: float = 60.0,
+        leeway: float = 30.0,
+        required_scopes: List[str] = None,
+        issuer: str = None
+    ):
+        """
+        Initialize the validator
+
+        Args:
+            jwks_ttl: Seconds before the cached signing keys are refetched
+            min_refresh_interval: Minimum seconds between refetches triggered
+                by an unknown key ID (key rotation)
+            leeway: Allowed clock skew in seconds for exp/nbf checks
+            required_scopes: Scopes every token must carry
+            issuer: Expected `iss` claim, if any
+        """
+        self.jwks_ttl = jwks_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.leeway = leeway
+        self.required_scopes = set(required_scopes or [])
+        self.issuer = issuer
+        self._jwks = {}
+        self._keys = {}
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse(token: str) -> Optional[ParsedToken]:
+        """
+        Decode a JWS compact token, returning None for opaque tokens
+        """
+        parts = token.split(".")
+        if len(parts) != 3:
+            return None
+        try:
+            header = json.loads(_b64url_decode(parts[0]))
+            claims = json.loads(_b64url_decode(parts[1]))
+            signature = _b64url_decode(parts[2])
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            return None
+        return ParsedToken(header, claims, f"{parts[0]}.{parts[1]}".encode("ascii"), signature)
+
+    def needs_refresh(self, parsed: ParsedToken) -> bool:
+        """
+        Whether the signing keys must be (re)fetched before verifying a token
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._fetched_at is None or now - self._fetched_at > self.jwks_ttl:
+                return True
+            kid = parsed.header.get("kid")
+            return kid not in self._jwks and now - self._fetched_at > self.min_refresh_interval
+
+    def update_keys(self, jwks: Dict[str, Any]) -> None:
+        """
+        Replace the cached signing keys with a freshly fetched JWKS document
+        """
+        keys = {key.get("kid"): key for key in jwks.get("keys", []) if isinstance(key, dict)}
+        with self._lock:
+            self._jwks = keys
+            self._keys = {}
+            self._fetched_at = time.monotonic()
+
+    def verify(self, parsed: ParsedToken, app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a parsed token's signature and claims
+
+        Returns:
+            A validate_token-style result dict, or None when the token cannot be
+            decided locally
+        """
+        alg = parsed.header.get("alg")
+        if not isinstance(alg, str) or alg not in self.SUPPORTED_ALGORITHMS:
+            return None
+
+        kid = parsed.header.get("kid")
+        if kid is not None and not isinstance(kid, str):
+            return None
+        with self._lock:
+            jwk = self._jwks.get(kid)
+        if jwk is None:
+            return None
+
+        # The header is attacker-controlled: only accept the algorithm the key is for
+        if not self._algorithm_matches(jwk, alg):
+            return {"valid": False, "error": "Token algorithm does not match its signing key", "status": 401}
+
+        key = self._public_key(kid)
+        if key is None:
+            return None
+
+        if not self._signature_valid(key, alg, parsed):
+            return {"valid": False, "error": "Invalid token signature", "status": 401}
+
+        return self._check_claims(parsed.claims, app_id)
+
+    def _algorithm_matches(self, jwk: Dict[str, Any], alg: str) -> bool:
+        if jwk.get("alg") and jwk["alg"] != alg:
+            return False
+        if alg.startswith("RS"):
+            return jwk.get("kty") == "RSA"
+        return jwk.get("kty") == "EC" and jwk.get("crv") == self.EC_CURVES[alg]
+
+    def _check_claims(self, claims: Dict[str, Any], app_id: str) -> Optional[Dict[str, Any]]:
+        # Without an expiry a local check could never find the token expired; let the server decide
+        if "exp" not in claims:
+            return None
+
+        now = time.time()
+
+        for claim in ("exp", "nbf"):
+            value = claims.get(claim)
+            if claim in claims and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                return {"valid": False, "error": f"Token has a malformed {claim} claim", "status": 401}
+
+        if now > claims["exp"] + self.leeway:
+            return {"valid": False, "error": "Token has expired", "status": 401}
+
+        if "nbf" in claims and now < claims["nbf"] - self.leeway:
+            return {"valid": False, "error": "Token is not yet valid", "status": 401}
+
+        if self.issuer and claims.get("iss") != self.issuer:
+            return {"valid": False, "error": "Token issuer mismatch", "status": 401}
+
+        audience = claims.get("aud", claims.get("app_id"))
+        audiences = audience if isinstance(audience, list) else [audience]
+        if app_id not in audiences:
+            return {"valid": False, "error": "Token was not issued for this application", "status": 401}
+
+        scope = claims.get("scope", "")
+        if isinstance(scope, str):
+            scopes = set(scope.split())
+        elif isinstance(scope, list) and all(isinstance(item, str) for item in scope):
+            scopes = set(scope)
+        else:
+            return {"valid": False, "error": "Token has a malformed scope claim", "status": 401}
+        if not self.required_scopes.issubset(scopes):
+            missing = ", ".join(sorted(self.required_scopes - scopes))
+            return {"valid": False, "error": f"Token is missing required scopes: {missing}", "status": 403}
+
+        return {
+            "valid": True,
+            "app_id": app_id,
+            "scope": sorted(scopes),
+            "claims": claims,
+            "validated_locally": True,
+            "expires_at": claims["exp"]
+        }
+
+    def _public_key(self, kid: str) -> Any:
+        with self._lock:
+            if kid in self._keys:
+                return self._keys[kid]
+            jwk = self._jwks.get(kid)
+        if jwk is None:
+            return None
+
+        try:
+            key = self._load_jwk(jwk)
+        except ImportError:
+            return None
+        except (KeyError, TypeError, ValueError) as e:
+            # A malformed key cannot decide anything; leave it to the network
+            logger.warning("Ignoring malformed signing key %r (%s)", kid, type(e).__name__)
+            return None
+
+        with self._lock:
+            self._keys[kid] = key
+        return key
+
+    @staticmethod
+    def _load_jwk(jwk: Dict[str, Any]) -> Any:
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+        def to_int(value: str) -> int:
+            return int.from_bytes(_b64url_decode(value), "big")
+
+        if jwk.get("kty") == "RSA":
+            numbers = rsa.RSAPublicNumbers(to_int(jwk["e"]), to_int(jwk["n"]))
+            return numbers.public_key(default_backend())
+
+        if jwk.get("kty") == "EC":
+            curve = {"P-256": ec.SECP256R1, "P-384": ec.SECP384R1}.get(jwk.get("crv"))
+            if curve is None:
+                return None
+            numbers = ec.EllipticCurvePublicNumbers(to_int(jwk["x"]), to_int(jwk["y"]), curve())
+            return numbers.public_key(default_backend())
+
+        return None
+
+    @staticmethod
+    def _signature_valid(key: Any, alg: str, parsed: ParsedToken) -> bool:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec, padding
+        from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+        digest = {"256": hashes.SHA256, "384": hashes.SHA384, "512": hashes.SHA512}[alg[2:]]()
+        try:
+            if alg.startswith("RS"):
+                key.verify(parsed.signature, parsed.signing_input, padding.PKCS1v15(), digest)
+            else:
+                # JWS carries raw r||s; cryptography expects a DER-encoded signature
+                half = len(parsed.signature) // 2
+                der = encode_dss_signature(
+                    int.from_bytes(parsed.signature[:half], "big"),
+                    int.from_bytes(parsed.signature[half:], "big")
+                )
+                key.verify(der, parsed.signing_input, ec.ECDSA(digest))
+            return True
+        except (InvalidSignature, TypeError, ValueError):
+            return False
+
+
+class _Flight:
+    """
+    A single in-flight call whose result is shared with every waiter
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class TokenManager:
+    """
+    Tracks an access token's expiry, refreshes it ahead of time in the
+    background and coalesces concurrent refreshes into a single in-flight
+    request (single-flight)
+
+    A failed background refresh is retried with exponential backoff until
+    the token expires; after that the next get_token() refreshes in the
+    foreground and raises if it still fails.
+    """
+
+    RETRY_BACKOFF = 1.0
+    MAX_RETRY_BACKOFF = 60.0
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], Dict[str, Any]],
+        refresh_margin: float = 60.0,
+        background_refresh: bool = True
+    ):
+        """
+        Initialize the token manager
+
+        Args:
+            fetch: Called with the current refresh token (or None) to obtain
+                a new token response containing access_token and expires_in
+            refresh_margin: Seconds before expiry at which the token is refreshed
+            background_refresh: Refresh on a timer instead of on first use
+        """
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.access_token = None
+        self.refresh_token = None
+        self.expires_at = None
+        self.refresh_count = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._flight = None
+        self._timer = None
+        self._retry_at = 0.0
+        self._refresh_pending = False
+
+    def record(self, data: Dict[str, Any], grant: bool = False) -> None:
+        """
+        Record a token response from the auth or token endpoint
+
+        Args:
+            data: The token response
+            grant: The response starts a new grant (authenticate or
+                exchange_code) rather than refreshing the current one, so an
+                earlier refresh token is not carried over
+        """
+        with self._lock:
+            self.access_token = data.get("access_token")
+            self.refresh_token = data.get("refresh_token", None if grant else self.refresh_token)
+            expires_in = data.get("expires_in")
+            self.expires_at = time.monotonic() + float(expires_in) if expires_in else None
+            self.failures = 0
+            self._retry_at = 0.0
+        self._schedule()
+
+    def set_token(self, token: Optional[str]) -> None:
+        """
+        Use a token whose expiry is unknown; it is never refreshed
+        """
+        with self._lock:
+            self.access_token = token
+            self.refresh_token = None
+            self.expires_at = None
+        self.cancel()
+
+    def needs_refresh(self) -> bool:
+        expires_at = self.expires_at
+        return expires_at is not None and time.monotonic() >= expires_at - self.refresh_margin
+
+    def expired(self) -> bool:
+        expires_at = self.expires_at
+        return expires_at is not None and time.monotonic() >= expires_at
+
+    def get_token(self) -> Optional[str]:
+        """
+        Return a usable access token, refreshing first if it has expired
+        """
+        if self.expired():
+            return self.refresh()
+        if self.needs_refresh() and time.monotonic() >= self._retry_at:
+            self._refresh_in_background()
+        return self.access_token
+
+    def refresh(self) -> Optional[str]:
+        """
+        Refresh the token now; concurrent callers share one request
+        """
+        with self._lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+                refresh_token = self.refresh_token
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            self.record(self.fetch(refresh_token))
+            self.refresh_count += 1
+            flight.result = self.access_token
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+        return flight.wait()
+
+    def cancel(self) -> None:
+        """
+        Cancel any scheduled background refresh
+        """
+        self._cancel_timer()
+
+    def _cancel_timer(self) -> None:
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule(self) -> None:
+        self._cancel_timer()
+        if not self.background_refresh or self.expires_at is None:
+            return
+        self._start_timer(max(0.0, self.expires_at - self.refresh_margin - time.monotonic()))
+
+    def _schedule_retry(self) -> None:
+        """
+        Back off after a failed background refresh and try again, as long as
+        the current token has not expired yet
+        """
+        self.cancel()
+        expires_at = self.expires_at
+        remaining = expires_at - time.monotonic() if expires_at is not None else 0.0
+        if not self.background_refresh or remaining <= 0:
+            return
+        self.failures += 1
+        delay = min(self.RETRY_BACKOFF * 2 ** (self.failures - 1), self.MAX_RETRY_BACKOFF, remaining)
+        self._retry_at = time.monotonic() + delay
+        self._start_timer(delay)
+
+    def _start_timer(self, delay: float) -> None:
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self) -> None:
+        # Start at most one refresh thread however many callers see the token due
+        with self._lock:
+            if self._flight is not None or self._refresh_pending:
+                return
+            self._refresh_pending = True
+        threading.Thread(target=self._pending_refresh, daemon=True).start()
+
+    def _pending_refresh(self) -> None:
+        try:
+            # A refresh may have finished since this one was requested
+            if self.needs_refresh():
+                self._background_refresh()
+        finally:
+            with self._lock:
+                self._refresh_pending = False
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("Background token refresh failed: %s", e)
+            self._schedule_retry()
@@ -0,0 +1,401 @@
+# SecureAddress Bridge Python SDK: shipment tracking poller and event subscriptions
+
+import heapq
+import inspect
+import itertools
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .bulk import _bounded_map
+from .errors import SecureAddressError
+from .policies import TokenBucket
+
+if TYPE_CHECKING:
+    from .client import SecureAddressBridge
+
+logger = logging.getLogger(__name__)
+
+
+class TrackingUpdate(NamedTuple):
+    """
+    A change in a shipment's tracking status reported by TrackingPoller
+    """
+    tracking_number: str
+    carrier: str
+    status: Optional[str]
+    previous_status: Optional[str]
+    info: Dict[str, Any]
+
+
+class TrackingPoller:
+    """
+    Polls tracking information for many shipments and reports only status changes
+
+    Shipments are polled with bounded concurrency and optional per-carrier rate
+    limits. The next poll of each shipment is scheduled from its current status
+    (e.g. sooner when out for delivery), and shipments reaching a terminal
+    status such as delivered drop out after their final update.
+    """
+
+    TERMINAL_STATUSES = frozenset(["delivered", "returned", "cancelled", "canceled"])
+
+    DEFAULT_INTERVALS = {
+        "label_created": 3600.0,
+        "pre_transit": 3600.0,
+        "in_transit": 1800.0,
+        "out_for_delivery": 300.0,
+        "exception": 900.0
+    }
+
+    def __init__(
+        self,
+        client: "SecureAddressBridge",
+        shipments: Iterable[Tuple[str, str]] = (),
+        concurrency: int = 16,
+        carrier_rates: Dict[str, float] = None,
+        intervals: Dict[str, float] = None,
+        default_interval: float = 1800.0,
+        error_interval: float = 300.0
+    ):
+        """
+        Initialize the poller
+
+        Args:
+            client: The SecureAddressBridge client used to fetch tracking info
+                (async clients should use subscribe_tracking() instead)
+            shipments: Iterable of (tracking_number, carrier) pairs
+            concurrency: Maximum number of tracking requests in flight
+            carrier_rates: Maximum requests per second for each carrier
+            intervals: Seconds until the next poll, per tracking status
+                (merged over DEFAULT_INTERVALS)
+            default_interval: Seconds until the next poll for other statuses
+            error_interval: Seconds until a shipment is retried after a failed poll
+        """
+        if inspect.iscoroutinefunction(client._send):
+            raise TypeError("TrackingPoller needs a synchronous client; use subscribe_tracking() with async clients")
+        self.client = client
+        self.concurrency = concurrency
+        self.intervals = dict(self.DEFAULT_INTERVALS, **(intervals or {}))
+        self.default_interval = default_interval
+        self.error_interval = error_interval
+        self.errors = 0
+        self._limiters = {
+            carrier: TokenBucket(rate) for carrier, rate in (carrier_rates or {}).items()
+        }
+        self._statuses = {}
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        for tracking_number, carrier in shipments:
+            self.add(tracking_number, carrier)
+
+    def add(self, tracking_number: str, carrier: str, delay: float = 0.0) -> None:
+        """
+        Start tracking a shipment
+        """
+        key = (tracking_number, carrier)
+        with self._lock:
+            if key in self._statuses:
+                return
+            self._statuses[key] = None
+            heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._sequence), key))
+
+    def remove(self, tracking_number: str, carrier: str) -> None:
+        """
+        Stop tracking a shipment
+        """
+        with self._lock:
+            self._statuses.pop((tracking_number, carrier), None)
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def poll_once(self) -> Iterator[TrackingUpdate]:
+        """
+        Poll every shipment that is due now, yielding status changes as they arrive
+        """
+        due = self._pop_due()
+        for update in _bounded_map(self._poll, due, self.concurrency):
+            if update is not None:
+                yield update
+
+    def run(self, stop_event: threading.Event = None) -> Iterator[TrackingUpdate]:
+        """
+        Keep polling until every shipment has reached a terminal status or
+        stop_event is set, yielding status changes as they arrive
+        """
+        stop_event = stop_event or threading.Event()
+        while self._statuses and not stop_event.is_set():
+            wait = self._seconds_until_due()
+            if wait > 0:
+                stop_event.wait(wait)
+                continue
+            yield from self.poll_once()
+
+    def _pop_due(self) -> List[Tuple[str, str]]:
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._schedule and self._schedule[0][0] <= now:
+                _, _, key = heapq.heappop(self._schedule)
+                # Removed shipments are dropped lazily
+                if key in self._statuses:
+                    due.append(key)
+        return due
+
+    def _seconds_until_due(self) -> float:
+        with self._lock:
+            if not self._schedule:
+                return self.default_interval
+            return max(0.0, self._schedule[0][0] - time.monotonic())
+
+    def _reschedule(self, key: Tuple[str, str], delay: float) -> None:
+        with self._lock:
+            if key in self._statuses:
+                heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._sequence), key))
+
+    def _poll(self, key: Tuple[str, str]) -> Optional[TrackingUpdate]:
+        tracking_number, carrier = key
+        limiter = self._limiters.get(carrier)
+        if limiter is not None:
+            limiter.acquire()
+
+        try:
+            # Polls must see the live status, so they skip the tracking cache
+            info = self.client._fetch_tracking_info(tracking_number, carrier)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Failed to poll tracking for %s (%s): %s", tracking_number, carrier, e)
+            self._reschedule(key, self.error_interval)
+            return None
+
+        status = info.get("status")
+        status = status.lower() if isinstance(status, str) else status
+        with self._lock:
+            previous = self._statuses.get(key)
+            if status in self.TERMINAL_STATUSES:
+                self._statuses.pop(key, None)
+            elif key in self._statuses:
+                self._statuses[key] = status
+
+        if status not in self.TERMINAL_STATUSES:
+            self._reschedule(key, self.intervals.get(status, self.default_interval))
+
+        if status == previous:
+            return None
+        return TrackingUpdate(tracking_number, carrier, status, previous, info)
+
+
+class TrackingEvent(NamedTuple):
+    """
+    A tracking or delivery-confirmation event delivered by a TrackingSubscription
+    """
+    id: str
+    type: str
+    tracking_number: str
+    carrier: Optional[str]
+    status: Optional[str]
+    cursor: str
+    data: Dict[str, Any]
+
+
+def _tracking_event(data: Dict[str, Any]) -> TrackingEvent:
+    status = data.get("status")
+    return TrackingEvent(
+        data.get("id"),
+        data.get("type"),
+        data.get("tracking_number"),
+        data.get("carrier"),
+        status.lower() if isinstance(status, str) else status,
+        data.get("cursor") or data.get("id"),
+        data
+    )
+
+
+class TrackingSubscription:
+    """
+    Streams tracking and delivery-confirmation events for many shipments over
+    one long-poll connection
+
+    Each poll is held open by the server for up to `wait` seconds until new
+    events arrive, so a quiet subscription costs one request per `wait`
+    seconds however many shipments it covers. `cursor` is advanced past every
+    event handed out; pass it back together with `subscription_id` to resume
+    after a restart without missing or repeating events. Failed polls are
+    retried with exponential backoff, and an expired subscription is recreated
+    from the current cursor.
+    """
+
+    EVENT_TYPES = ("tracking.updated", "delivery.confirmed")
+
+    def __init__(
+        self,
+        client: "SecureAddressBridge",
+        shipments: Iterable[Tuple[str, str]] = (),
+        event_types: Iterable[str] = None,
+        subscription_id: str = None,
+        cursor: str = None,
+        wait: float = 25.0,
+        limit: int = 100,
+        idle_interval: float = 1.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0
+    ):
+        """
+        Initialize the subscription
+
+        Args:
+            client: The SecureAddressBridge client used to poll for events
+            shipments: Iterable of (tracking_number, carrier) pairs
+            event_types: Event types to receive (defaults to EVENT_TYPES)
+            subscription_id: Existing subscription to resume
+            cursor: Cursor of the last event already processed
+            wait: Seconds the server may hold each poll open; keep it below
+                the transport's read timeout
+            limit: Maximum number of events per poll
+            idle_interval: Seconds to pause when a poll returns no events
+            reconnect_delay: Initial delay before retrying a failed poll
+            max_reconnect_delay: Upper bound for the doubling reconnect delay
+        """
+        self.client = client
+        self.event_types = list(event_types or self.EVENT_TYPES)
+        self.subscription_id = subscription_id
+        self.cursor = cursor
+        self.wait = wait
+        self.limit = limit
+        self.idle_interval = idle_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self._shipments = dict.fromkeys(shipments)
+        self._delay = reconnect_delay
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, tracking_number: str, carrier: str) -> None:
+        """
+        Start receiving events for a shipment
+        """
+        if self._track((tracking_number, carrier)):
+            try:
+                self.client.update_tracking_subscription(self.subscription_id, add=[(tracking_number, carrier)])
+            except SecureAddressError as e:
+                if not self._expired(e):
+                    raise
+
+    def remove(self, tracking_number: str, carrier: str) -> None:
+        """
+        Stop receiving events for a shipment
+        """
+        if self._untrack((tracking_number, carrier)):
+            try:
+                self.client.update_tracking_subscription(self.subscription_id, remove=[(tracking_number, carrier)])
+            except SecureAddressError as e:
+                if not self._expired(e):
+                    raise
+
+    def __len__(self) -> int:
+        return len(self._shipments)
+
+    def __iter__(self) -> Iterator[TrackingEvent]:
+        return self.events()
+
+    def close(self) -> None:
+        """
+        Stop iterating once the poll in progress (if any) returns
+        """
+        self._closed.set()
+
+    def events(self) -> Iterator[TrackingEvent]:
+        """
+        Poll until close() is called, yielding events as they arrive
+        """
+        while not self._closed.is_set():
+            request, subscribing = self._next_request()
+            try:
+                data = self.client._send(request, conditional=subscribing)
+            except Exception as e:
+                self._closed.wait(self._retry_delay(e))
+                continue
+
+            events = self._accept(data, subscribing)
+            for event in events:
+                self.cursor = event.cursor
+                yield event
+            if not subscribing and not events:
+                self._closed.wait(self.idle_interval)
+
+    def _track(self, key: Tuple[str, str]) -> bool:
+        """
+        Record a shipment, returning whether the live subscription needs updating
+        """
+        with self._lock:
+            if key in self._shipments:
+                return False
+            self._shipments[key] = None
+            return self.subscription_id is not None
+
+    def _untrack(self, key: Tuple[str, str]) -> bool:
+        with self._lock:
+            if key not in self._shipments:
+                return False
+            del self._shipments[key]
+            return self.subscription_id is not None
+
+    def _next_request(self) -> Tuple[Any, bool]:
+        """
+        Build the next request: a (re)subscribe while there is no subscription,
+        otherwise a long poll from the current cursor
+        """
+        with self._lock:
+            subscription_id = self.subscription_id
+            shipments = list(self._shipments)
+        if subscription_id is None:
+            return self.client._create_tracking_subscription_request(shipments, self.event_types, self.cursor), True
+        return self.client._get_tracking_events_request(subscription_id, self.cursor, self.wait, self.limit), False
+
+    def _accept(self, data: Dict[str, Any], subscribing: bool) -> List[TrackingEvent]:
+        """
+        Apply a successful response, returning the events it delivered
+        """
+        self._delay = self.reconnect_delay
+        if subscribing:
+            with self._lock:
+                self.subscription_id = data["subscription_id"]
+            self.cursor = data.get("cursor") or self.cursor
+            return []
+        return [_tracking_event(event) for event in data.get("events") or []]
+
+    def _expired(self, error: Exception) -> bool:
+        """
+        Forget the subscription if the error says it no longer exists, so the
+        next poll resubscribes with the current shipments and cursor
+        """
+        if getattr(error, "status", None) not in (404, 410) or self.subscription_id is None:
+            return False
+        logger.info("Tracking subscription %s expired; resubscribing from cursor %s", self.subscription_id, self.cursor)
+        with self._lock:
+            self.subscription_id = None
+        return True
+
+    def _retry_delay(self, error: Exception) -> float:
+        """
+        Return how long to wait before reconnecting after a failed request,
+        re-raising errors that reconnecting cannot fix
+        """
+        if self._expired(error):
+            return 0.0
+        status = getattr(error, "status", None)
+        if status is not None and 400 <= status < 500 and status not in (408, 429):
+            raise error
+
+        delay = self._delay
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            delay = max(delay, retry_after)
+        self._delay = min(self._delay * 2, self.max_reconnect_delay)
+        self.reconnects += 1
+        logger.warning("Tracking subscription poll failed (%s); reconnecting in %.1fs", error, delay)
+        return delay
@@ -0,0 +1,214 @@
+# SecureAddress Bridge Python SDK: HTTP transport
+
+import functools
+import importlib.util
+from typing import Any, Dict
+
+from .models import _json_loads
+
+
+def _accept_encoding() -> str:
+    """
+    Return the Accept-Encoding to send: brotli when a decoder is installed
+    (the `brotli` extra), otherwise gzip. The HTTP libraries decode either
+    transparently.
+    """
+    if any(importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")):
+        return "br, gzip"
+    return "gzip"
+
+
+@functools.lru_cache(maxsize=None)
+def _unpooled_adapter_class() -> type:
+    """
+    Return an HTTPAdapter subclass whose pools close every connection once its
+    response has been read instead of keeping it for the next request
+
+    Built on first use so that importing the SDK does not import requests.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class ClosingPoolMixin:
+        def _put_conn(self, conn: Any) -> None:
+            if conn is not None:
+                conn.close()
+            # Return the empty slot so the pool still limits concurrency
+            super()._put_conn(None)
+
+    class ClosingHTTPConnectionPool(ClosingPoolMixin, HTTPConnectionPool):
+        pass
+
+    class ClosingHTTPSConnectionPool(ClosingPoolMixin, HTTPSConnectionPool):
+        pass
+
+    class UnpooledAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": ClosingHTTPConnectionPool,
+                "https": ClosingHTTPSConnectionPool
+            }
+
+    return UnpooledAdapter
+
+
+class HttpTransport:
+    """
+    Pooled, keep-alive HTTP transport for the SecureAddress Bridge API
+
+    A single transport can be shared by many SecureAddressBridge instances in
+    one process so that they reuse the same connection pool instead of opening
+    a new TCP+TLS connection for every call.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        keep_alive: bool = True,
+        http2: bool = False
+    ):
+        """
+        Initialize the transport
+
+        Args:
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of connections kept per host
+            connect_timeout: Seconds to wait when establishing a connection
+            read_timeout: Seconds to wait for the server to send a response
+            keep_alive: Keep connections open between requests. When False
+                every request opens a new connection, which is closed as soon
+                as its response has been read
+            http2: Use HTTP/2 (requires the `http2` extra, which installs httpx)
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.http2 = http2
+
+        if http2:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError(
+                    "HTTP/2 support requires httpx. Install it with: pip install secureaddress-bridge[http2]"
+                )
+            self.connect_errors = (httpx.ConnectError, httpx.ConnectTimeout)
+            self.transient_errors = (httpx.TransportError,)
+            self._session = httpx.Client(
+                http2=True,
+                headers={"Accept-Encoding": _accept_encoding()},
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=pool_connections * pool_maxsize,
+                    max_keepalive_connections=pool_maxsize if keep_alive else 0
+                )
+            )
+        else:
+            # Imported here so that importing the SDK stays cheap
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self.connect_errors = (requests.exceptions.ConnectTimeout,)
+            self.transient_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            self._session = requests.Session()
+            self._session.headers["Accept-Encoding"] = _accept_encoding()
+            adapter_class = HTTPAdapter if keep_alive else _unpooled_adapter_class()
+            adapter = adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        params: Dict[str, Any] = None,
+        json: Any = None
+    ) -> Any:
+        """
+        Send a request through the pooled session
+
+        Args:
+            method: The HTTP method
+            url: The absolute request URL
+            headers: Request headers
+            params: Query string parameters
+            json: JSON-serializable request body
+
+        Returns:
+            The response object (exposes status_code, headers and json())
+        """
+        if self.http2:
+            # HTTP/2 forbids connection-specific headers; keep-alive is governed
+            # by the pool limits instead
+            return self._session.request(method, url, headers=headers, params=params, json=json)
+
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+
+        return self._session.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            json=json,
+            timeout=(self.connect_timeout, self.read_timeout)
+        )
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Return how many requests reused a pooled connection
+
+        Counts cover the pools currently held by the session (HTTP/2
+        transports report no counters).
+        """
+        if self.http2:
+            return {}
+
+        connections = requests_sent = 0
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    requests_sent += pool.num_requests
+        return {
+            "requests": requests_sent,
+            "new_connections": connections,
+            "reused_connections": max(requests_sent - connections, 0)
+        }
+
+    def close(self) -> None:
+        """
+        Close all pooled connections
+        """
+        self._session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BufferedResponse:
+    """
+    A fully read HTTP response, used where the underlying response cannot
+    outlive its connection (e.g. aiohttp)
+    """
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self) -> Any:
+        return _json_loads(self.content)
@@ -0,0 +1,416 @@
+# SecureAddress Bridge Python SDK: webhook verification and receiving
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookVerifier:
+    """
+    Verifies webhook signatures for one or more active secrets
+
+    The keyed HMAC state is computed once per secret and copied for each
+    payload, and payloads are hashed straight from bytes or memoryview without
+    copying. Signatures may be hex (as sent in X-Webhook-Signature) or base64.
+    When a timestamp is given, the signed content is `{timestamp}.{payload}`,
+    the timestamp must fall within `tolerance` seconds of now, and a signature
+    seen before within that window is rejected as a replay.
+    """
+
+    def __init__(
+        self,
+        secrets: Union[str, bytes, Iterable[Union[str, bytes]]],
+        tolerance: float = 300.0,
+        reject_replays: bool = True,
+        max_tracked_signatures: int = 100000
+    ):
+        """
+        Initialize the verifier
+
+        Args:
+            secrets: Webhook secret, or several secrets during rotation
+            tolerance: Maximum age (and clock skew) of a timestamp in seconds
+            reject_replays: Reject signatures already seen within the tolerance window
+            max_tracked_signatures: Maximum number of signatures remembered for replay checks
+        """
+        if isinstance(secrets, (str, bytes)):
+            secrets = [secrets]
+        self.tolerance = tolerance
+        self.reject_replays = reject_replays
+        self.max_tracked_signatures = max_tracked_signatures
+        self._macs = OrderedDict()
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        for secret in secrets:
+            self.add_secret(secret)
+
+    def add_secret(self, secret: Union[str, bytes]) -> None:
+        """
+        Start accepting signatures made with a secret
+        """
+        key = secret.encode("utf-8") if isinstance(secret, str) else bytes(secret)
+        self._macs[key] = hmac.new(key, digestmod=hashlib.sha256)
+
+    def remove_secret(self, secret: Union[str, bytes]) -> None:
+        """
+        Stop accepting signatures made with a retired secret
+        """
+        key = secret.encode("utf-8") if isinstance(secret, str) else bytes(secret)
+        self._macs.pop(key, None)
+
+    def verify(
+        self,
+        payload: Union[str, bytes, bytearray, memoryview],
+        signature: str,
+        timestamp: str = None
+    ) -> bool:
+        """
+        Verify one webhook delivery
+
+        Args:
+            payload: The raw request body
+            signature: The signature header value
+            timestamp: The X-Webhook-Timestamp header value, if sent
+
+        Returns:
+            Whether the signature is valid for any active secret
+        """
+        expected = self._decode_signature(signature)
+        if expected is None:
+            return False
+
+        if timestamp is not None and not self._timestamp_fresh(timestamp):
+            logger.debug("Rejected webhook with stale timestamp %s", timestamp)
+            return False
+
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        prefix = timestamp.encode("utf-8") + b"." if timestamp is not None else None
+
+        for base in list(self._macs.values()):
+            mac = base.copy()
+            if prefix is not None:
+                mac.update(prefix)
+            mac.update(payload)
+            if hmac.compare_digest(mac.digest(), expected):
+                return self._record(expected) if timestamp is not None else True
+        return False
+
+    def verify_many(
+        self,
+        deliveries: Iterable[Tuple[Union[str, bytes, bytearray, memoryview], str, Optional[str]]]
+    ) -> List[bool]:
+        """
+        Verify a batch of (payload, signature, timestamp) deliveries
+
+        Returns:
+            One result per delivery, in input order
+        """
+        return [self.verify(payload, signature, timestamp) for payload, signature, timestamp in deliveries]
+
+    @staticmethod
+    def _decode_signature(signature: str) -> Optional[bytes]:
+        if not signature:
+            return None
+        try:
+            if len(signature) == 64:
+                return bytes.fromhex(signature)
+            return base64.b64decode(signature, validate=True)
+        except ValueError:
+            return None
+
+    def _timestamp_fresh(self, timestamp: str) -> bool:
+        try:
+            sent_at = float(timestamp)
+        except ValueError:
+            try:
+                sent_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                return False
+        return abs(time.time() - sent_at) <= self.tolerance
+
+    def _record(self, signature: bytes) -> bool:
+        """
+        Remember a verified signature, returning False if it is a replay
+        """
+        if not self.reject_replays:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            while self._seen and next(iter(self._seen.values())) < now:
+                self._seen.popitem(last=False)
+            if signature in self._seen:
+                return False
+            self._seen[signature] = now + self.tolerance
+            if len(self._seen) > self.max_tracked_signatures:
+                self._seen.popitem(last=False)
+        return True
+
+
+class WebhookEvent(NamedTuple):
+    """
+    A verified webhook delivery
+    """
+    id: str
+    type: str
+    data: Dict[str, Any]
+    timestamp: Optional[str]
+    raw: bytes
+
+
+class _WebhookReceiverBase:
+    """
+    Verification, deduplication and handler registry shared by the WSGI and
+    ASGI webhook receivers
+    """
+
+    def __init__(
+        self,
+        secrets: Union[str, bytes, Iterable[Union[str, bytes]]],
+        workers: int = 8,
+        queue_size: int = 1000,
+        tolerance: float = 300.0,
+        dedupe_size: int = 100000,
+        cache: ResponseCache = None
+    ):
+        """
+        Initialize the receiver
+
+        Args:
+            secrets: Webhook secret, or several secrets during rotation
+            workers: Number of workers dispatching events to handlers
+            queue_size: Maximum number of accepted events waiting for a worker;
+                deliveries beyond it are refused with 503 so the sender retries
+            tolerance: Maximum age of a delivery timestamp in seconds
+            dedupe_size: Number of recent event IDs remembered for deduplication
+            cache: ResponseCache to invalidate on address and permission events
+        """
+        self.verifier = WebhookVerifier(secrets, tolerance=tolerance, reject_replays=False)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.dedupe_size = dedupe_size
+        self.cache = cache
+        self.stats = {
+            "received": 0,
+            "rejected": 0,
+            "duplicates": 0,
+            "dropped": 0,
+            "processed": 0,
+            "failed": 0
+        }
+        self._handlers = {}
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_handler(self, event_type: str, handler: Callable[[WebhookEvent], Any]) -> None:
+        """
+        Register a handler for an event type ("*" receives every event)
+        """
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def on(self, event_type: str) -> Callable:
+        """
+        Decorator form of add_handler
+        """
+        def decorator(handler: Callable[[WebhookEvent], Any]) -> Callable[[WebhookEvent], Any]:
+            self.add_handler(event_type, handler)
+            return handler
+        return decorator
+
+    def _handlers_for(self, event: WebhookEvent) -> List[Callable[[WebhookEvent], Any]]:
+        return self._handlers.get(event.type, []) + self._handlers.get("*", [])
+
+    def _count(self, name: str) -> None:
+        # Request threads and workers update the counters concurrently
+        with self._lock:
+            self.stats[name] += 1
+
+    def _accept(
+        self,
+        body: bytes,
+        signature: Optional[str],
+        timestamp: Optional[str],
+        event_type: Optional[str]
+    ) -> Tuple[int, Dict[str, Any], Optional[WebhookEvent]]:
+        """
+        Verify and decode a delivery
+
+        Returns:
+            (status, response body, event to dispatch or None)
+        """
+        self._count("received")
+        if not self.verifier.verify(body, signature, timestamp):
+            self._count("rejected")
+            return 401, {"error": "Invalid webhook signature"}, None
+
+        try:
+            data = json.loads(body)
+        except ValueError:
+            self._count("rejected")
+            return 400, {"error": "Invalid JSON payload"}, None
+        if not isinstance(data, dict):
+            data = {"data": data}
+
+        # Retried deliveries carry the same body, so its digest identifies the event
+        event_id = str(data.get("id") or data.get("event_id") or hashlib.sha256(body).hexdigest())
+        # Reserve the ID while checking it, so concurrent deliveries of one event dispatch it once
+        with self._lock:
+            if event_id in self._seen:
+                self.stats["duplicates"] += 1
+                return 200, {"status": "duplicate"}, None
+            self._seen[event_id] = True
+            if len(self._seen) > self.dedupe_size:
+                self._seen.popitem(last=False)
+
+        event = WebhookEvent(event_id, data.get("event_type") or event_type or "unknown", data, timestamp, body)
+        return 202, {"status": "accepted"}, event
+
+    def _queue_full(self, event: WebhookEvent) -> Tuple[int, Dict[str, Any]]:
+        # The sender retries a refused delivery, so it must not count as seen
+        with self._lock:
+            self._seen.pop(event.id, None)
+            self.stats["dropped"] += 1
+        logger.warning("Webhook queue full, refusing event %s", event.id)
+        return 503, {"error": "Webhook queue is full"}
+
+    def _before_dispatch(self, event: WebhookEvent) -> None:
+        if self.cache is not None:
+            self.cache.handle_webhook_event(event.data)
+
+
+class WebhookReceiver(_WebhookReceiverBase):
+    """
+    WSGI webhook receiver dispatching events to handlers on a bounded thread pool
+
+    Mount it as a WSGI app, or call flask_view from a Flask route (requires the
+    `sandbox` extra):
+
+        receiver = WebhookReceiver("YOUR_WEBHOOK_SECRET")
+
+        @receiver.on("address.updated")
+        def on_address_updated(event):
+            ...
+
+        app.add_url_rule("/webhooks", view_func=receiver.flask_view, methods=["POST"])
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._threads = []
+
+    def start(self) -> None:
+        """
+        Start the worker threads (done automatically on the first delivery)
+        """
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"webhook-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop the workers after the queued events have been handled
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def receive(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Verify, deduplicate and enqueue one delivery
+
+        Args:
+            body: The raw request body
+            headers: The request headers (a case-insensitive mapping or a dict)
+
+        Returns:
+            (HTTP status, JSON response body)
+        """
+        status, response, event = self._accept(
+            body,
+            headers.get("X-Webhook-Signature"),
+            headers.get("X-Webhook-Timestamp"),
+            headers.get("X-Webhook-Event")
+        )
+        if event is None:
+            return status, response
+
+        self.start()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            return self._queue_full(event)
+        return status, response
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> List[bytes]:
+        if environ.get("REQUEST_METHOD") != "POST":
+            status, response = 405, {"error": "Method not allowed"}
+        else:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = environ["wsgi.input"].read(length) if length else b""
+            status, response = self.receive(body, {
+                "X-Webhook-Signature": environ.get("HTTP_X_WEBHOOK_SIGNATURE"),
+                "X-Webhook-Timestamp": environ.get("HTTP_X_WEBHOOK_TIMESTAMP"),
+                "X-Webhook-Event": environ.get("HTTP_X_WEBHOOK_EVENT")
+            })
+
+        payload = json.dumps(response).encode("utf-8")
+        headers = [("Content-Type", "application/json"), ("Content-Length", str(len(payload)))]
+        if status == 503:
+            headers.append(("Retry-After", "1"))
+        start_response(f"{status} {_HTTP_REASONS.get(status, '')}".strip(), headers)
+        return [payload]
+
+    def flask_view(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Flask view function receiving the current request
+        """
+        from flask import request
+
+        status, response = self.receive(request.get_data(), request.headers)
+        return response, status
+
+    def _work(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            self._before_dispatch(event)
+            for handler in self._handlers_for(event):
+                try:
+                    handler(event)
+                    self._count("processed")
+                except Exception:
+                    self._count("failed")
+                    logger.exception("Webhook handler failed for event %s", event.id)
+
+
+_HTTP_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    401: "Unauthorized",
+    405: "Method Not Allowed",
+    503: "Service Unavailable"
+}
@@ -34,6 +34,10 @@ setup(
     extras_require={
         "async": ["aiohttp>=3.7.0"],
         "sandbox": ["flask>=2.0.0"],
+        "http2": ["httpx[http2]>=0.23.0"],
+        "crypto": ["cryptography>=3.1"],
+        "speedups": ["orjson>=3.0"],
+        "brotli": ["brotli>=1.0"],
     },
     python_requires=">=3.7",
 )
@@ -0,0 +1,31 @@
+# Shared fixtures for the SecureAddress Bridge SDK tests
+#
+# Tests run offline: against the in-process sandbox transport or the local
+# mock API server from the benchmark suite.
+
+import os
+import sys
+
+import pytest
+
+SDK_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SDK_PATH)
+sys.path.insert(0, os.path.join(SDK_PATH, "benchmarks"))
+
+from mock_server import MockApiServer  # noqa: E402
+
+from secureaddress_bridge import SecureAddressBridge  # noqa: E402
+
+
+@pytest.fixture
+def mock_server():
+    with MockApiServer() as server:
+        yield server
+
+
+@pytest.fixture
+def sandbox_client():
+    client = SecureAddressBridge("app_test", "secret", sandbox=True)
+    client.authenticate()
+    yield client
+    client.close()
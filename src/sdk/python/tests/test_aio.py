@@ -0,0 +1,47 @@
+import asyncio
+
+from secureaddress_bridge import AsyncHttpTransport, AsyncSecureAddressBridge, RetryPolicy, SecureAddressBridge
+
+
+def test_async_client_matches_sync_client(mock_server):
+    sync_client = SecureAddressBridge("app_test", "secret", base_url=mock_server.url)
+    sync_client.authenticate()
+    expected = sync_client.get_address()
+    sync_client.close()
+
+    async def run():
+        async with AsyncSecureAddressBridge("app_test", "secret", base_url=mock_server.url) as client:
+            await client.authenticate()
+            return await client.get_address()
+
+    assert asyncio.run(run()) == expected
+
+
+def test_async_clients_share_one_pooled_session(mock_server):
+    async def run():
+        async with AsyncHttpTransport() as transport:
+            clients = [
+                AsyncSecureAddressBridge(
+                    "app_test", "secret", base_url=mock_server.url, transport=transport,
+                    retry_policy=RetryPolicy(max_retries=0), coalesce_requests=False
+                )
+                for _ in range(2)
+            ]
+            for client in clients:
+                await client.authenticate()
+            for _ in range(5):
+                await asyncio.gather(*(client.get_address() for client in clients))
+            return transport.connection_stats()
+
+    stats = asyncio.run(run())
+    assert stats["requests"] == 12
+    assert stats["new_connections"] <= 2
+
+
+def test_async_sandbox_client():
+    async def run():
+        async with AsyncSecureAddressBridge("app_test", "secret", sandbox=True) as client:
+            await client.authenticate()
+            return await client.get_address()
+
+    assert set(asyncio.run(run())) >= {"street", "city", "country"}
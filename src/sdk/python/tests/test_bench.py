@@ -0,0 +1,31 @@
+from bench import MEMORY_PASS_REQUESTS, failures, run_scenario
+
+
+def _calls(server, endpoint):
+    return sum(count for path, count in server.requests.items() if path.endswith("/" + endpoint))
+
+
+def test_every_benchmarked_call_reaches_the_server(mock_server):
+    result = run_scenario("sync", "address", mock_server.url, 20, 1, 0)
+    assert result["requests"] == 20
+    assert result["errors"] == 0
+    assert _calls(mock_server, "address") == 20 + min(20, MEMORY_PASS_REQUESTS)
+
+
+def test_async_calls_are_not_coalesced(mock_server):
+    result = run_scenario("async", "tracking", mock_server.url, 20, 8, 0)
+    assert result["errors"] == 0
+    assert _calls(mock_server, "tracking") == 40
+
+
+def test_unpooled_scenario_completes_without_errors(mock_server):
+    result = run_scenario("sync-unpooled", "address", mock_server.url, 50, 1, 0)
+    assert result["errors"] == 0
+
+
+def test_scenarios_with_errors_fail_the_run():
+    results = {"sync/address": {"errors": 0}, "sync/tracking": {"errors": 5}}
+    assert failures(results, 0.0, 0) == ["ERRORS sync/tracking: 5 failed calls"]
+    assert failures(results, 0.01, 3) == ["ERRORS sync/tracking: 5 failed calls"]
+    # Injected errors with no retries to absorb them are expected
+    assert failures(results, 0.01, 0) == []
@@ -0,0 +1,207 @@
+import asyncio
+
+import pytest
+
+from secureaddress_bridge import (
+    AsyncSecureAddressBridge, BufferedResponse, LinkCheckpoint, SandboxTransport, SecureAddressBridge
+)
+from secureaddress_bridge.aio import AsyncSandboxTransport
+
+
+class BatchWithdrawnTransport(SandboxTransport):
+    """
+    Serves the first batch address request, then answers 404 as if the
+    endpoint had been withdrawn mid-run
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = 0
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/address/batch"):
+            self.batch_calls += 1
+            if self.batch_calls > 1:
+                return BufferedResponse(404, {}, b'{"error": "Not found"}')
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+class AsyncBatchWithdrawnTransport(AsyncSandboxTransport):
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = 0
+
+    async def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/address/batch"):
+            self.batch_calls += 1
+            if self.batch_calls > 1:
+                return BufferedResponse(404, {}, b'{"error": "Not found"}')
+        return await super().request(method, url, headers=headers, params=params, json=json)
+
+
+TOKENS = [f"user_token_{i}" for i in range(25)]
+
+
+def test_get_addresses_uses_the_batch_endpoint(sandbox_client):
+    results = list(sandbox_client.get_addresses(TOKENS, batch_size=10))
+    assert sorted(result.token for result in results) == sorted(TOKENS)
+    assert all(result.ok for result in results)
+    assert sandbox_client.transport.engine.requests["address/batch"] == 3
+
+
+def test_get_addresses_falls_back_per_token_when_the_batch_endpoint_disappears():
+    client = SecureAddressBridge("app_test", "secret", transport=BatchWithdrawnTransport())
+    client.authenticate()
+    results = list(client.get_addresses(TOKENS, batch_size=10, concurrency=2))
+    assert sorted(result.token for result in results) == sorted(TOKENS)
+    assert all(result.ok for result in results)
+    assert client.transport.engine.requests["address"] == 15
+
+
+def test_async_get_addresses_falls_back_per_token_when_the_batch_endpoint_disappears():
+    async def run():
+        client = AsyncSecureAddressBridge("app_test", "secret", transport=AsyncBatchWithdrawnTransport())
+        await client.authenticate()
+        return [result async for result in client.get_addresses(TOKENS, batch_size=10, concurrency=2)]
+
+    results = asyncio.run(run())
+    assert sorted(result.token for result in results) == sorted(TOKENS)
+    assert all(result.ok for result in results)
+
+
+def test_get_addresses_without_a_batch_endpoint(mock_server):
+    client = SecureAddressBridge("app_test", "secret", base_url=mock_server.url)
+    client.authenticate()
+    results = list(client.get_addresses(TOKENS[:5]))
+    assert sorted(result.token for result in results) == sorted(TOKENS[:5])
+    assert all(result.ok for result in results)
+    client.close()
+
+
+def test_get_addresses_reports_failures_per_token(sandbox_client):
+    sandbox_client.configure_sandbox({"simulate_errors": True, "error_rate": 1.0, "error_status": 400})
+    results = list(sandbox_client.get_addresses(TOKENS[:3], use_batch_endpoint=False))
+    assert len(results) == 3
+    assert not any(result.ok for result in results)
+
+
+def _shipments(count):
+    return [
+        {"shipping_token": f"shp_token_{i}", "carrier": "usps", "service": "Priority", "package": {"type": "box"}}
+        for i in range(count)
+    ]
+
+
+def test_request_shipments_yields_results_in_input_order(sandbox_client):
+    results = list(sandbox_client.request_shipments(_shipments(12), batch_size=5))
+    assert [result.index for result in results] == list(range(12))
+    assert all(result.ok for result in results)
+    assert sandbox_client.transport.engine.requests["request-shipment/batch"] == 3
+
+
+def test_request_shipments_is_idempotent_across_runs(sandbox_client):
+    first = [result.shipment["shipment_id"] for result in sandbox_client.request_shipments(_shipments(3))]
+    again = [result.shipment["shipment_id"] for result in sandbox_client.request_shipments(_shipments(3))]
+    per_item = [
+        result.shipment["shipment_id"]
+        for result in sandbox_client.request_shipments(_shipments(3), use_batch_endpoint=False)
+    ]
+    assert first == again == per_item
+    assert len(set(first)) == 3
+
+
+def test_request_shipments_validates_every_item_before_submitting(sandbox_client):
+    shipments = _shipments(3)
+    shipments[1]["carrier"] = "pigeon"
+    del shipments[2]["package"]
+    with pytest.raises(ValueError, match="#1: .*pigeon.*#2: Package type is required"):
+        list(sandbox_client.request_shipments(shipments))
+    assert "request-shipment" not in sandbox_client.transport.engine.requests
+    assert "request-shipment/batch" not in sandbox_client.transport.engine.requests
+
+
+class LinkRecordingTransport(SandboxTransport):
+    """
+    Sandbox transport that remembers every link-wallet request body and token
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/link-wallet"):
+            self.links.append(dict(json, token=headers["Authorization"][7:]))
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+def _link_client():
+    client = SecureAddressBridge("app_test", "secret", transport=LinkRecordingTransport())
+    client.authenticate()
+    return client
+
+
+def _links(count, credential=False):
+    return [
+        {"wallet_address": f"0x{i:040x}", "chain_id": 137 if i % 2 else 1, "create_verifiable_credential": credential}
+        for i in range(count)
+    ]
+
+
+def test_link_wallets_submits_one_chain_at_a_time():
+    client = _link_client()
+    results = list(client.link_wallets(_links(6), concurrency=1))
+    assert sorted(result.index for result in results) == list(range(6))
+    assert all(result.ok for result in results)
+    assert [link["chain_id"] for link in client.transport.links] == [1, 1, 1, 137, 137, 137]
+
+
+def test_link_wallets_validates_every_item_before_submitting():
+    client = _link_client()
+    links = _links(3)
+    del links[1]["wallet_address"]
+    links[2]["chain_id"] = None
+    with pytest.raises(ValueError, match="#1: Wallet address is required; #2: Chain ID is required"):
+        list(client.link_wallets(links))
+    assert client.transport.links == []
+
+
+def test_link_wallets_uses_each_items_access_token():
+    client = _link_client()
+    links = [dict(link, access_token=f"user_token_{i}") for i, link in enumerate(_links(3))]
+    assert all(result.ok for result in client.link_wallets(links))
+    assert sorted(link["token"] for link in client.transport.links) == ["user_token_0", "user_token_1", "user_token_2"]
+
+
+def test_link_wallets_resumes_from_a_checkpoint(tmp_path):
+    client = _link_client()
+    checkpoint = str(tmp_path / "links.jsonl")
+    client.configure_sandbox({"verification_success": False})
+    assert not any(result.ok for result in client.link_wallets(_links(4), checkpoint=checkpoint))
+    client.configure_sandbox({"verification_success": True})
+    assert len(list(client.link_wallets(_links(4)[:2], checkpoint=checkpoint))) == 2
+    resumed = list(client.link_wallets(_links(4), checkpoint=checkpoint))
+    assert sorted(result.index for result in resumed) == [2, 3]
+    assert list(client.link_wallets(_links(4), checkpoint=checkpoint)) == []
+
+
+def _pending_credentials(path):
+    with LinkCheckpoint(path) as checkpoint:
+        return checkpoint.pending_credentials()
+
+
+def test_deferred_credentials_are_requested_on_the_next_run(tmp_path):
+    client = _link_client()
+    checkpoint = str(tmp_path / "links.jsonl")
+    links = _links(2, credential=True) + _links(4)[2:]
+
+    deferred = list(client.link_wallets(links, checkpoint=checkpoint, defer_credentials=True))
+    assert sorted(result.index for result in deferred if result.credential_pending) == [0, 1]
+    assert not any(link["create_vc"] for link in client.transport.links)
+    assert _pending_credentials(checkpoint) == 2
+
+    credentials = list(client.link_wallets(links, checkpoint=checkpoint))
+    assert sorted(result.index for result in credentials) == [0, 1]
+    assert all("verifiable_credential" in result.link for result in credentials)
+    assert _pending_credentials(checkpoint) == 0
+    assert list(client.link_wallets(links, checkpoint=checkpoint)) == []
@@ -0,0 +1,137 @@
+import sqlite3
+import time
+
+import pytest
+
+from secureaddress_bridge import (
+    PersistentCache, ResponseCache, SandboxEngine, SandboxTransport, SecureAddressBridge, TrackingInfo
+)
+
+
+def _cached_client(cache):
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, cache=cache)
+    client.authenticate()
+    return client
+
+
+def test_get_address_is_served_from_the_cache():
+    client = _cached_client(ResponseCache())
+    first = client.get_address()
+    assert client.get_address() == first
+    assert client.transport.engine.requests["address"] == 1
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_cache_keys_include_the_requested_fields():
+    client = _cached_client(ResponseCache())
+    client.get_address()
+    client.get_address({"fields": ["city"]})
+    assert client.transport.engine.requests["address"] == 2
+
+
+def test_cache_entries_expire():
+    cache = ResponseCache(ttl=0.05)
+    cache.set(("address", "token"), {"city": "Springfield"}, token="token")
+    assert cache.get(("address", "token")) == {"city": "Springfield"}
+    time.sleep(0.06)
+    assert cache.get(("address", "token")) is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.set(("address", name), {"name": name}, token=name)
+    cache.get(("address", "a"))
+    cache.set(("address", "c"), {"name": "c"}, token="c")
+    assert cache.get(("address", "b")) is None
+    assert cache.get(("address", "a")) == {"name": "a"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_webhook_events_invalidate_a_users_entries():
+    cache = ResponseCache()
+    cache.set(("address", "token"), {"city": "Springfield"}, token="token")
+    cache.associate_user("token", "user_1")
+    assert cache.handle_webhook_event({"event_type": "shipment.created", "user_id": "user_1"}) == 0
+    assert cache.handle_webhook_event({"event_type": "address.updated", "user_id": "user_1"}) == 1
+    assert cache.get(("address", "token")) is None
+
+
+def _persistent_client(cache, engine=None, token=None, **kwargs):
+    client = SecureAddressBridge("app_test", "secret", transport=SandboxTransport(engine), cache=cache, **kwargs)
+    if token is None:
+        client.authenticate()
+    else:
+        client.access_token = token
+    return client
+
+
+def test_persistent_cache_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = _persistent_client(PersistentCache(path))
+    address = first.get_address()
+    first.cache.close()
+
+    engine = SandboxEngine()
+    restarted = _persistent_client(PersistentCache(path), engine, token=first.access_token)
+    assert restarted.get_address() == address
+    assert "address" not in engine.requests
+    assert restarted.cache.stats()["hits"] == 1
+
+
+def test_persistent_cache_stores_only_digests(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = PersistentCache(path)
+    cache.set(("address", "secret_token"), {"city": "Springfield"}, token="secret_token")
+    cache.associate_user("secret_token", "user_1")
+    rows = sqlite3.connect(path).execute("SELECT key, token FROM entries UNION ALL SELECT * FROM user_tokens").fetchall()
+    assert not any("secret_token" in value or "user_1" in value for row in rows for value in row)
+    assert cache.invalidate_user("user_1") == 1
+    assert cache.get(("address", "secret_token")) is None
+
+
+def test_persistent_cache_encrypts_payloads(tmp_path):
+    pytest.importorskip("cryptography")
+    path = str(tmp_path / "cache.db")
+    cache = PersistentCache(path, encryption_key=PersistentCache.generate_key())
+    cache.set(("address", "token"), {"city": "Springfield"}, token="token")
+    assert cache.get(("address", "token")) == {"city": "Springfield"}
+    (value,) = sqlite3.connect(path).execute("SELECT value FROM entries").fetchone()
+    assert b"Springfield" not in value
+
+    rotated = PersistentCache(path, encryption_key=PersistentCache.generate_key())
+    assert rotated.get(("address", "token")) is None
+    assert rotated.stats()["entries"] == 0
+
+
+def test_persistent_cache_expires_and_bounds_entries(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"), ttl=60, max_entries=2)
+    cache.set(("address", "short"), {"n": 0}, token="short", ttl=0.05)
+    for n in range(1, 3):
+        cache.set(("address", n), {"n": n}, token=str(n))
+    assert cache.get(("address", "short")) is None
+    assert cache.stats()["entries"] == 2
+    time.sleep(0.06)
+    cache.set(("address", 3), {"n": 3}, token="3")
+    assert cache.get(("address", 1)) is None
+    assert cache.get(("address", 3)) == {"n": 3}
+
+
+def test_tracking_snapshots_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = _persistent_client(PersistentCache(path, tracking_ttl=60), response_models=True)
+    info = first.get_tracking_info("TRK00000001", "usps")
+
+    engine = SandboxEngine()
+    second = _persistent_client(PersistentCache(path, tracking_ttl=60), engine, token="other", response_models=True)
+    cached = second.get_tracking_info("TRK00000001", "usps")
+    assert isinstance(cached, TrackingInfo)
+    assert cached == info
+    assert "tracking" not in engine.requests
+
+
+def test_tracking_is_not_cached_without_a_tracking_ttl(tmp_path):
+    client = _persistent_client(PersistentCache(str(tmp_path / "cache.db")))
+    client.get_tracking_info("TRK00000001", "usps")
+    client.get_tracking_info("TRK00000001", "usps")
+    assert client.transport.engine.requests["tracking"] == 2
@@ -0,0 +1,56 @@
+import pytest
+
+from secureaddress_bridge import CarrierIndex, SecureAddressBridge
+
+
+def _shipment(carrier="usps", service="Priority"):
+    return {"shipping_token": "shp_token", "carrier": carrier, "service": service, "package": {"type": "box"}}
+
+
+def test_index_lookups():
+    index = CarrierIndex({"usps": ["Priority", "Ground"], "fedex": ["2Day"]}, carriers=["usps"])
+    assert index.supports_carrier("usps")
+    assert not index.supports_carrier("fedex")
+    assert index.supports("usps", "Ground")
+    assert not index.supports("usps", "2Day")
+    assert index.invalid_methods(["usps"], ["Ground", "2Day"]) == ["2Day for usps"]
+    with pytest.raises(AttributeError):
+        index.carriers = frozenset()
+
+
+def test_index_from_capabilities():
+    index = CarrierIndex.from_capabilities({"carriers": [{"carrier": "dhl", "services": ["Express"]}]})
+    assert index.as_shipping_methods() == {"dhl": ["Express"]}
+
+
+def test_assigning_supported_carriers_rebuilds_the_index(sandbox_client):
+    with pytest.raises(ValueError, match="carrier"):
+        sandbox_client.request_shipment(_shipment("dhl", "Express"))
+
+    sandbox_client.supported_shipping_methods = dict(sandbox_client.supported_shipping_methods, dhl=["Express"])
+    with pytest.raises(ValueError, match="carrier"):
+        sandbox_client.request_shipment(_shipment("dhl", "Express"))
+
+    sandbox_client.supported_carriers = list(sandbox_client.supported_carriers) + ["dhl"]
+    assert sandbox_client.request_shipment(_shipment("dhl", "Express"))["carrier"] == "dhl"
+
+
+def test_supported_tables_cannot_be_mutated_in_place(sandbox_client):
+    with pytest.raises(AttributeError):
+        sandbox_client.supported_carriers.append("dhl")
+    with pytest.raises(TypeError):
+        sandbox_client.supported_shipping_methods["dhl"] = ["Express"]
+
+
+def test_refresh_capabilities_updates_the_tables(sandbox_client):
+    index = sandbox_client.refresh_capabilities()
+    assert sandbox_client.carrier_index is index
+    assert set(sandbox_client.supported_carriers) == index.carriers
+
+
+def test_clients_can_share_an_index():
+    index = CarrierIndex({"usps": ["Priority"]})
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, carrier_index=index)
+    assert client.carrier_index is index
+    assert client.supported_carriers == ("usps",)
+    assert client.supported_shipping_methods == {"usps": ("Priority",)}
@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from secureaddress_bridge import AsyncSecureAddressBridge, RetryPolicy, SecureAddressBridge
+from secureaddress_bridge.errors import SecureAddressError
+
+
+def _client(**kwargs):
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, retry_policy=RetryPolicy(max_retries=0), **kwargs)
+    client.authenticate()
+    client.configure_sandbox({"latency": 0.05})
+    return client
+
+
+def _concurrently(func, count=8):
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(func) for _ in range(count)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_identical_gets_share_one_request():
+    client = _client()
+    results = _concurrently(client.get_address)
+    assert all(result == results[0] for result in results)
+    assert client.transport.engine.requests["address"] == 1
+    assert client.coalescer.stats() == {"sent": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_requests_for_different_tokens_are_not_shared():
+    client = _client()
+    contexts = [client.for_token(f"user_token_{i % 2}") for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda context: context.get_address(), contexts))
+    assert client.transport.engine.requests["address"] == 2
+
+
+def test_errors_are_shared_with_every_waiter():
+    client = _client()
+    client.configure_sandbox({"simulate_errors": True, "error_rate": 1.0, "error_status": 400})
+    results = _concurrently(client.get_address)
+    assert all(isinstance(result, SecureAddressError) for result in results)
+    assert client.transport.engine.requests["address"] == 1
+
+
+def test_coalescing_can_be_disabled():
+    client = _client(coalesce_requests=False)
+    _concurrently(client.get_address)
+    assert client.coalescer is None
+    assert client.transport.engine.requests["address"] == 8
+
+
+def _async_client():
+    client = AsyncSecureAddressBridge("app_test", "secret", sandbox=True, retry_policy=RetryPolicy(max_retries=0))
+    client.configure_sandbox({"latency": 0.05})
+    return client
+
+
+def test_async_concurrent_identical_gets_share_one_request():
+    async def run():
+        client = _async_client()
+        await client.authenticate()
+        results = await asyncio.gather(*(client.get_address() for _ in range(8)))
+        return client, results
+
+    client, results = asyncio.run(run())
+    assert all(result == results[0] for result in results)
+    assert client.transport.engine.requests["address"] == 1
+    assert client.coalescer.stats()["coalesced"] == 7
+
+
+def test_async_followers_survive_a_cancelled_leader():
+    async def run():
+        client = _async_client()
+        await client.authenticate()
+        leader = asyncio.ensure_future(client.get_address())
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(client.get_address())
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        address = await asyncio.wait_for(follower, 2)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return client, address
+
+    client, address = asyncio.run(run())
+    assert address["city"]
+    # The leader was cancelled during the simulated latency, before the sandbox answered
+    assert client.transport.engine.requests["address"] == 1
+    assert client.coalescer.stats() == {"sent": 2, "coalesced": 0, "in_flight": 0}
+
+
+def test_async_cancelled_follower_leaves_the_leader_running():
+    async def run():
+        client = _async_client()
+        await client.authenticate()
+        leader = asyncio.ensure_future(client.get_address())
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(client.get_address())
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return client, await asyncio.wait_for(leader, 2)
+
+    client, address = asyncio.run(run())
+    assert address["city"]
+    assert client.transport.engine.requests["address"] == 1
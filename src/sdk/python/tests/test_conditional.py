@@ -0,0 +1,105 @@
+import asyncio
+
+from mock_server import MockApiHandler
+
+from secureaddress_bridge import (
+    AsyncSandboxTransport, AsyncSecureAddressBridge, BufferedResponse, HttpTransport, RetryPolicy, SandboxTransport,
+    SecureAddressBridge
+)
+
+
+def _client(server, **kwargs):
+    client = SecureAddressBridge(
+        "app_test", "secret", base_url=server.url, retry_policy=RetryPolicy(max_retries=0), **kwargs
+    )
+    client.authenticate()
+    return client
+
+
+def test_conditional_requests_are_off_by_default(mock_server):
+    client = _client(mock_server)
+    client.get_address()
+    client.get_address()
+    assert client.etag_cache is None
+    assert client.get_metrics()["conditional"] == {}
+    client.close()
+
+
+def test_unchanged_responses_are_reused_after_a_304(mock_server):
+    client = _client(mock_server, conditional_requests=True)
+    first = client.get_address()
+    assert client.get_address() == first
+    assert client.get_tracking_info("TRK00000001", "usps") == client.get_tracking_info("TRK00000001", "usps")
+    assert client.get_metrics()["conditional"] == {"entries": 2, "not_modified": 2, "modified": 0}
+    client.close()
+
+
+def test_conditional_entries_are_kept_per_token(mock_server):
+    client = _client(mock_server, conditional_requests=True)
+    client.get_address()
+    other = client.for_token("user_token").get_address()
+    assert other == client.for_token("user_token").get_address()
+    assert client.etag_cache.stats() == {"entries": 2, "not_modified": 1, "modified": 0}
+    client.close()
+
+
+class ETagEventsTransport(SandboxTransport):
+    """
+    Adds an ETag to tracking event polls, as a caching proxy might
+    """
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        response = super().request(method, url, headers=headers, params=params, json=json)
+        if url.endswith("/events"):
+            return BufferedResponse(response.status_code, dict(response.headers, ETag='"events"'), response.content)
+        return response
+
+
+def test_tracking_event_polls_bypass_the_etag_cache():
+    client = SecureAddressBridge("app_test", "secret", transport=ETagEventsTransport(), conditional_requests=True)
+    client.authenticate()
+    subscription = client.subscribe_tracking([("TRK00000001", "usps")], wait=0, idle_interval=0)
+    next(iter(subscription))
+    client.get_tracking_events(subscription.subscription_id, wait=0)
+    assert client.etag_cache.stats()["entries"] == 0
+
+
+class AsyncETagEventsTransport(AsyncSandboxTransport):
+    """
+    Async version of ETagEventsTransport
+    """
+
+    async def request(self, method, url, headers=None, params=None, json=None):
+        response = await super().request(method, url, headers=headers, params=params, json=json)
+        if url.endswith("/events"):
+            return BufferedResponse(response.status_code, dict(response.headers, ETag='"events"'), response.content)
+        return response
+
+
+def test_async_tracking_event_polls_bypass_the_etag_cache():
+    async def run():
+        client = AsyncSecureAddressBridge(
+            "app_test", "secret", transport=AsyncETagEventsTransport(), conditional_requests=True
+        )
+        await client.authenticate()
+        created = await client.create_tracking_subscription([("TRK00000001", "usps")])
+        await client.get_tracking_events(created["subscription_id"], wait=0)
+        return client
+
+    assert asyncio.run(run()).etag_cache.stats()["entries"] == 0
+
+
+def test_nested_field_projection(sandbox_client):
+    address = sandbox_client.get_address({"fields": ["postal_code", "verification.verified"]})
+    assert address == {"postal_code": "90210", "verification": {"verified": True}}
+    address = sandbox_client.get_address({"fields": {"city": True, "verification": ["method"]}})
+    assert address == {"city": "Secureville", "verification": {"method": "sandbox"}}
+
+
+def test_large_responses_are_gzip_compressed(mock_server, monkeypatch):
+    monkeypatch.setattr(MockApiHandler, "GZIP_MIN_SIZE", 0)
+    with HttpTransport() as transport:
+        response = transport.request("GET", f"{mock_server.url}/v1/address", headers={"Authorization": "Bearer token"})
+        assert response.status_code == 200
+        assert {name.lower(): value for name, value in response.headers.items()}["content-encoding"] == "gzip"
+        assert response.json()["city"]
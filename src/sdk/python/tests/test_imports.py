@@ -0,0 +1,23 @@
+import pytest
+
+import secureaddress_bridge
+from import_time import SCENARIOS, measure
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_optional_dependencies_are_imported_lazily(name):
+    statement, allowed = SCENARIOS[name]
+    result = measure(statement, runs=1)
+    assert [module for module in result["heavy_modules"] if module not in allowed] == []
+
+
+def test_every_export_resolves():
+    for name in secureaddress_bridge.__all__:
+        assert getattr(secureaddress_bridge, name).__name__ == name
+    assert set(secureaddress_bridge.__all__) <= set(dir(secureaddress_bridge))
+
+
+def test_unknown_attributes_raise_attribute_error():
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        secureaddress_bridge.Missing
+
@@ -0,0 +1,87 @@
+import pytest
+
+from secureaddress_bridge import Instrumentation, LatencyHistogram, SecureAddressBridge
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None):
+        span = RecordingSpan(name, dict(attributes or {}))
+        self.spans.append(span)
+        return span
+
+
+class RecordingSpan:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, name, value):
+        self.attributes[name] = value
+
+    def record_exception(self, error):
+        self.exceptions.append(error)
+
+    def end(self):
+        self.ended = True
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for value in [0.005] * 90 + [0.5] * 10:
+        histogram.observe(value)
+    assert histogram.percentile(50) == 0.01
+    assert histogram.percentile(99) == 0.5
+    assert histogram.summary()["count"] == 100
+
+
+def test_per_endpoint_stats_hooks_and_spans():
+    tracer = RecordingTracer()
+    instrumentation = Instrumentation(tracer=tracer)
+    before, after = [], []
+    instrumentation.add_hook(before=before.append, after=after.append)
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, instrumentation=instrumentation)
+    client.authenticate()
+    client.get_address()
+    client.get_address({"fields": ["city"]})
+
+    stats = instrumentation.stats()
+    assert stats["GET /v1/address"]["count"] == 2
+    assert stats["GET /v1/address"]["statuses"] == {200: 2}
+    assert stats["POST /v1/auth"]["request_bytes"] > 0
+    assert len(before) == len(after) == 3
+    assert all(metrics.ok for metrics in after)
+    assert [span.name for span in tracer.spans] == [
+        "SecureAddressBridge POST /v1/auth", "SecureAddressBridge GET /v1/address", "SecureAddressBridge GET /v1/address"
+    ]
+    assert all(span.ended and span.attributes["http.status_code"] == 200 for span in tracer.spans)
+
+
+def test_errors_are_counted_and_hook_failures_ignored():
+    instrumentation = Instrumentation()
+    instrumentation.add_hook(after=lambda metrics: 1 / 0)
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, instrumentation=instrumentation)
+    with pytest.raises(Exception):
+        client.get_address({"access_token": None})
+    client.configure_sandbox({"simulate_errors": True, "error_rate": 1.0, "error_status": 400})
+    with pytest.raises(Exception):
+        client.authenticate()
+    assert instrumentation.stats()["POST /v1/auth"]["errors"] == 1
+
+
+def test_resource_ids_share_one_endpoint_label():
+    instrumentation = Instrumentation()
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, instrumentation=instrumentation)
+    client.authenticate()
+    for _ in range(2):
+        subscription = client.create_tracking_subscription([("TRK00000001", "usps")])
+        client.update_tracking_subscription(subscription["subscription_id"], add=[("TRK00000002", "usps")])
+    stats = instrumentation.stats()
+    assert stats["POST /v1/tracking/subscriptions/{id}/shipments"]["count"] == 2
+    assert sorted(stats) == [
+        "POST /v1/auth", "POST /v1/tracking/subscriptions", "POST /v1/tracking/subscriptions/{id}/shipments"
+    ]
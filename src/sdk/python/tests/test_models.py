@@ -0,0 +1,93 @@
+import pytest
+
+from secureaddress_bridge import (
+    Address, BufferedResponse, ResponseCache, SandboxTransport, SecureAddressBridge, TrackingInfo
+)
+from secureaddress_bridge.errors import SecureAddressError
+
+
+class BodyTransport(SandboxTransport):
+    """
+    Sandbox that answers address requests with a fixed body
+    """
+
+    def __init__(self, body):
+        super().__init__()
+        self.body = body
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/address"):
+            return BufferedResponse(200, {}, self.body)
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+def _client(**kwargs):
+    kwargs.setdefault("sandbox", True)
+    client = SecureAddressBridge("app_test", "secret", response_models=True, **kwargs)
+    client.authenticate()
+    return client
+
+
+def test_plain_dicts_are_returned_by_default(sandbox_client):
+    assert type(sandbox_client.get_address()) is dict
+
+
+def test_address_model_is_parsed_on_first_access():
+    address = _client().get_address()
+    assert isinstance(address, Address)
+    assert address._data is None
+    assert address.city == "Secureville"
+    assert address._data is not None
+
+
+def test_models_keep_the_mapping_api():
+    client = _client()
+    expected = client.transport.engine.address_for(client.access_token)
+    address = client.get_address()
+    assert address == expected
+    assert address["street"] == expected["street"]
+    assert address.get("missing", "default") == "default"
+    assert dict(address) == address.to_dict() == expected
+    assert len(address) == len(expected)
+
+
+def test_models_are_read_only():
+    address = _client().get_address()
+    with pytest.raises(AttributeError):
+        address.city = "Elsewhere"
+    with pytest.raises(TypeError):
+        address["city"] = "Elsewhere"
+    copy = address.to_dict()
+    copy["city"] = "Elsewhere"
+    assert address.city == "Secureville"
+
+
+def test_cached_models_cannot_be_changed_through_data():
+    client = _client(cache=ResponseCache())
+    address = client.get_address()
+    with pytest.raises(TypeError):
+        address.data["city"] = "Poisoned"
+    assert client.get_address() is address
+    assert address.city == "Secureville"
+
+
+@pytest.mark.parametrize("body", [b"<html>oops", b"", b'{"city": "Secureville"', b"{oops}"])
+def test_invalid_json_raises_and_is_not_cached(body):
+    client = _client(sandbox=False, transport=BodyTransport(body), cache=ResponseCache())
+    with pytest.raises(SecureAddressError, match="[Ii]nvalid JSON"):
+        client.get_address()
+    assert client.cache.stats()["entries"] == 0
+
+
+def test_missing_fields_use_the_model_defaults():
+    info = TrackingInfo(b'{"tracking_number": "TRK1", "carrier": "usps"}')
+    assert info.status is None
+    assert info.events == ()
+    assert TrackingInfo().to_dict() == {}
+
+
+def test_tracking_info_is_returned_as_a_model():
+    info = _client().get_tracking_info("TRK00000001", "usps")
+    assert isinstance(info, TrackingInfo)
+    assert info.tracking_number == "TRK00000001"
+    assert info.status == info["status"]
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from secureaddress_bridge import (
+    ApiRequest, BufferedResponse, RateLimitError, RetryPolicy, SandboxTransport, SecureAddressBridge, TokenBucket
+)
+
+
+class ScriptedTransport(SandboxTransport):
+    """
+    Answers the first requests to an endpoint with scripted responses, then
+    falls through to the sandbox
+    """
+
+    def __init__(self, path, responses):
+        super().__init__()
+        self.path = path
+        self.responses = list(responses)
+        self.calls = 0
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith(self.path):
+            self.calls += 1
+            if self.responses:
+                return self.responses.pop(0)
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+def _error(status, retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return BufferedResponse(status, headers, b'{"error": "Unavailable"}')
+
+
+def _client(transport, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0.001))
+    client = SecureAddressBridge("app_test", "secret", transport=transport, **kwargs)
+    client.authenticate()
+    return client
+
+
+def test_transient_errors_are_retried():
+    client = _client(ScriptedTransport("/address", [_error(503), _error(502)]))
+    assert client.get_address()["country"]
+    assert client.transport.calls == 3
+
+
+def test_retries_give_up_after_max_retries():
+    client = _client(ScriptedTransport("/address", [_error(503)] * 3), retry_policy=RetryPolicy(max_retries=2, backoff_factor=0))
+    with pytest.raises(Exception):
+        client.get_address()
+    assert client.transport.calls == 3
+
+
+def test_posts_without_an_idempotency_key_are_not_retried():
+    client = _client(ScriptedTransport("/link-wallet", [_error(503)]))
+    with pytest.raises(Exception):
+        client.link_address_to_wallet({"wallet_address": "0x" + "a" * 40, "chain_id": "ethereum"})
+    assert client.transport.calls == 1
+
+
+def test_rate_limit_errors_carry_retry_after():
+    client = _client(ScriptedTransport("/address", [_error(429, "7")]), retry_policy=RetryPolicy(max_retries=0))
+    with pytest.raises(RateLimitError) as raised:
+        client.get_address()
+    assert raised.value.retry_after == 7.0
+
+
+def test_retry_after_is_honored():
+    policy = RetryPolicy(backoff_factor=0.001)
+    request = ApiRequest("GET", "https://api.example/v1/address")
+    assert policy.retry_delay(request, 0, response=_error(429, "2")) == 2.0
+    assert policy.retry_delay(request, 0, response=_error(400)) is None
+
+
+def test_429_pauses_the_shared_rate_limiter():
+    bucket = TokenBucket(rate=1000)
+    client = _client(ScriptedTransport("/address", [_error(429, "0.2")]), rate_limiter=bucket)
+    started = time.monotonic()
+    client.get_address()
+    assert time.monotonic() - started >= 0.2
+
+
+def test_token_bucket_spreads_requests_beyond_the_burst():
+    bucket = TokenBucket(rate=50, capacity=5)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() == pytest.approx(0.02, abs=0.005)
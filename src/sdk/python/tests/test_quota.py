@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+from secureaddress_bridge import AsyncSandboxTransport, AsyncSecureAddressBridge, QuotaTracker, SecureAddressBridge
+
+
+class SlowUsageTransport(AsyncSandboxTransport):
+    """
+    Async sandbox that holds usage-stats requests open
+    """
+
+    async def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/usage-stats"):
+            await asyncio.sleep(10)
+        return await super().request(method, url, headers=headers, params=params, json=json)
+
+
+def _client(quota):
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, quota=quota)
+    client.authenticate()
+    return client
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_remaining_quota_is_none_without_a_tracker(sandbox_client):
+    assert sandbox_client.remaining_quota() is None
+
+
+def test_remaining_quota_counts_requests_locally():
+    client = _client(QuotaTracker(limit=10, reconcile_interval=None))
+    client.get_address()
+    client.get_address({"fields": ["city"]})
+    assert client.remaining_quota() == 7
+    usage = client.quota.usage()
+    assert usage["endpoints"] == {"POST /v1/auth": 1, "GET /v1/address": 2}
+    assert "usage-stats" not in client.transport.engine.requests
+
+
+def test_remaining_quota_is_unknown_until_the_limit_is_learned():
+    client = _client(QuotaTracker(reconcile_interval=None))
+    assert client.remaining_quota() is None
+    client.get_usage_stats()
+    assert client.quota.limit == client.transport.engine.rate_limit
+    # The server counted auth and usage-stats; usage-stats is also counted as
+    # in flight since the mark, erring on the side of caution
+    assert client.remaining_quota() == client.transport.engine.rate_limit - 3
+
+
+def test_threshold_callback_fires_once_per_window():
+    crossings = []
+    quota = QuotaTracker(limit=10, window_seconds=0.2, warning_threshold=0.5, on_threshold=crossings.append)
+    for _ in range(8):
+        quota.record("GET /v1/address")
+    assert len(crossings) == 1
+    assert crossings[0]["used"] == 5
+    time.sleep(0.25)
+    assert quota.remaining() == 10
+    for _ in range(5):
+        quota.record("GET /v1/address")
+    assert len(crossings) == 2
+
+
+def test_failing_threshold_callback_does_not_break_requests():
+    def explode(usage):
+        raise RuntimeError("callback failed")
+
+    client = _client(QuotaTracker(limit=2, warning_threshold=0.5, on_threshold=explode, reconcile_interval=None))
+    assert client.get_address()["city"]
+    assert client.remaining_quota() == 0
+
+
+def test_reconcile_adds_requests_sent_since_the_mark():
+    quota = QuotaTracker(limit=100, reconcile_interval=None)
+    quota.record("GET /v1/address", 5)
+    mark = quota.mark()
+    quota.record("GET /v1/address", 3)
+    quota.reconcile({"rate_limit": {"limit": 50, "remaining": 40, "reset_in": 30}}, mark)
+    assert quota.limit == 50
+    assert quota.remaining() == 37
+    assert 29 < quota.usage()["resets_in"] <= 30
+
+
+def test_client_reconciles_in_the_background():
+    client = _client(QuotaTracker(limit=1000, reconcile_interval=0))
+    client.get_address()
+    engine = client.transport.engine
+    assert _wait_for(lambda: engine.requests.get("usage-stats", 0) >= 1)
+    assert _wait_for(lambda: client.quota.limit == engine.rate_limit)
+
+
+def test_async_reconcile_task_is_kept_and_cancelled_on_close():
+    async def run():
+        client = AsyncSecureAddressBridge(
+            "app_test", "secret", transport=SlowUsageTransport(), quota=QuotaTracker(limit=1000, reconcile_interval=0)
+        )
+        await client.authenticate()
+        await client.get_address()
+        task = client._reconcile_task
+        await client.get_address()
+        assert client._reconcile_task is task and not task.done()
+        await client.close()
+        return client, task
+
+    client, task = asyncio.run(run())
+    assert task.cancelled()
+    assert client._reconcile_task is None
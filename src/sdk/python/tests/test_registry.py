@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from secureaddress_bridge import AsyncClientRegistry, AsyncSandboxTransport, ClientRegistry, SandboxTransport
+
+
+class GatedTransport(SandboxTransport):
+    """
+    Holds the first auth request until release() so tests can act while a
+    tenant's client is being created
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.auth_bodies = []
+
+    def release(self):
+        self.gate.set()
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/auth"):
+            self.auth_bodies.append(json)
+            if not self.entered.is_set():
+                self.entered.set()
+                self.gate.wait(2)
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+def test_concurrent_first_requests_share_one_authentication():
+    registry = ClientRegistry(transport=SandboxTransport(latency=0.05))
+    registry.register("app_a", "secret")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda i: registry.get("app_a"), range(8)))
+    assert all(client is clients[0] for client in clients)
+    assert registry.transport.engine.requests["auth"] == 1
+
+
+def test_unknown_tenants_raise_key_error():
+    registry = ClientRegistry(transport=SandboxTransport())
+    with pytest.raises(KeyError):
+        registry.get("app_missing")
+
+
+def test_reregistering_during_creation_installs_the_new_credentials():
+    transport = GatedTransport()
+    registry = ClientRegistry(transport=transport)
+    registry.register("app_a", "old-secret")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(registry.get, "app_a")
+        assert transport.entered.wait(2)
+        registry.register("app_a", "new-secret")
+        transport.release()
+        client = pending.result(2)
+    assert client.app_secret == "new-secret"
+    assert registry.get("app_a") is client
+    assert [body["app_secret"] for body in transport.auth_bodies] == ["old-secret", "new-secret"]
+
+
+def test_unregistering_during_creation_raises_key_error():
+    transport = GatedTransport()
+    registry = ClientRegistry(transport=transport)
+    registry.register("app_a", "secret")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(registry.get, "app_a")
+        assert transport.entered.wait(2)
+        registry.unregister("app_a")
+        transport.release()
+        with pytest.raises(KeyError):
+            pending.result(2)
+    assert registry.stats()["active"] == 0
+
+
+def test_get_evicts_idle_clients():
+    registry = ClientRegistry(transport=SandboxTransport(), idle_timeout=0.05)
+    registry.register("app_a", "secret")
+    registry.register("app_b", "secret")
+    registry.get("app_a")
+    client_b = registry.get("app_b")
+    time.sleep(0.03)
+    registry.get("app_b")
+    time.sleep(0.03)
+    assert registry.get("app_b") is client_b
+    assert registry.stats() == {"tenants": 2, "active": 1, "saved_tokens": 1, "evictions": 1}
+
+
+def test_evicted_tenants_reuse_their_token_and_carrier_tables():
+    registry = ClientRegistry(transport=SandboxTransport(), max_tenants=1, load_capabilities=True)
+    registry.register("app_a", "secret")
+    registry.register("app_b", "secret")
+    first = registry.get("app_a")
+    registry.get("app_b")
+    returned = registry.get("app_a")
+    assert returned is not first
+    assert returned.access_token == first.access_token
+    engine = registry.transport.engine
+    assert engine.requests["auth"] == 2
+    assert engine.requests["capabilities"] == 2
+
+
+def test_async_followers_survive_a_cancelled_leader():
+    async def run():
+        registry = AsyncClientRegistry(transport=AsyncSandboxTransport(latency=0.05))
+        registry.register("app_a", "secret")
+        leader = asyncio.ensure_future(registry.get("app_a"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(registry.get("app_a"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        client = await asyncio.wait_for(follower, 2)
+        assert await registry.get("app_a") is client
+        assert leader.cancelled()
+        await registry.close()
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+import pytest
+
+from secureaddress_bridge import HttpTransport, RetryPolicy, SandboxEngine, SandboxTransport, SecureAddressBridge
+from secureaddress_bridge.errors import SecureAddressError
+
+
+def _client(**kwargs):
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, retry_policy=RetryPolicy(max_retries=0), **kwargs)
+    client.authenticate()
+    return client
+
+
+def test_sandbox_addresses_are_deterministic_per_token(sandbox_client):
+    first = sandbox_client.get_address()
+    assert sandbox_client.get_address() == first
+    assert first["city"] == SandboxEngine.DEFAULT_ADDRESS["city"]
+    assert sandbox_client.transport.engine.requests["auth"] == 1
+
+
+def test_configure_sandbox_overrides_the_address(sandbox_client):
+    sandbox_client.configure_sandbox({"mock_address": {"city": "Springfield"}})
+    assert sandbox_client.get_address()["city"] == "Springfield"
+
+
+def test_configure_sandbox_requires_sandbox_mode():
+    client = SecureAddressBridge("app_test", "secret", transport=HttpTransport())
+    with pytest.raises(Exception, match="Sandbox mode is not enabled"):
+        client.configure_sandbox({"simulate_errors": True})
+    client.close()
+
+
+def test_simulated_errors_use_the_configured_status():
+    client = _client()
+    client.configure_sandbox({"simulate_errors": True, "error_rate": 1.0, "error_status": 502})
+    with pytest.raises(SecureAddressError) as excinfo:
+        client.get_address()
+    assert excinfo.value.status == 502
+
+
+def test_error_rate_is_reproducible_with_a_seed():
+    def failures(seed):
+        engine = SandboxEngine({"simulate_errors": True, "error_rate": 0.5}, seed=seed)
+        return [engine.handle("GET", "https://sandbox/v1/capabilities").status_code for _ in range(20)]
+
+    assert failures(7) == failures(7)
+    assert set(failures(7)) == {200, 503}
+
+
+def test_failed_verification_rejects_tokens(sandbox_client):
+    sandbox_client.configure_sandbox({"verification_success": False})
+    assert sandbox_client.validate_token()["valid"] is False
+    address = sandbox_client.get_address({"include_verification_info": True})
+    assert address["verification"]["verified"] is False
+
+
+def test_engine_can_be_shared_between_clients():
+    engine = SandboxEngine()
+    first = SecureAddressBridge("app_a", "secret", transport=SandboxTransport(engine))
+    second = SecureAddressBridge("app_b", "secret", transport=SandboxTransport(engine, latency=0))
+    first.authenticate()
+    second.authenticate()
+    assert engine.requests["auth"] == 2
+
+
+def test_unknown_endpoints_answer_404():
+    response = SandboxEngine().handle("GET", "https://sandbox/v1/nowhere")
+    assert response.status_code == 404
@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from secureaddress_bridge import AsyncSecureAddressBridge, QuotaTracker, SandboxTransport, SecureAddressBridge
+
+
+class RecordingTransport(SandboxTransport):
+    """
+    Sandbox transport that remembers the bearer token of every request by route
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tokens = []
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        self.tokens.append((url.rsplit("/", 1)[-1], (headers or {}).get("Authorization")))
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+def test_contexts_use_their_own_tokens(sandbox_client):
+    engine = sandbox_client.transport.engine
+    users = [f"user_token_{i}" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        addresses = list(executor.map(lambda token: sandbox_client.for_token(token).get_address(), users))
+    assert addresses == [engine.address_for(token) for token in users]
+
+
+def test_context_tokens_cannot_be_reassigned(sandbox_client):
+    context = sandbox_client.for_token("user_token")
+    with pytest.raises(AttributeError):
+        context.access_token = "other"
+    assert context.for_token("other").access_token == "other"
+
+
+@pytest.mark.parametrize("method, args", [
+    ("authenticate", ()),
+    ("exchange_code", ({"code": "code", "redirect_uri": "https://example.com/callback"},)),
+    ("refresh_access_token", ())
+])
+def test_token_changing_methods_fail_before_sending(sandbox_client, method, args):
+    engine = sandbox_client.transport.engine
+    sent = dict(engine.requests)
+    client_token = sandbox_client.access_token
+    with pytest.raises(Exception, match="for_token"):
+        getattr(sandbox_client.for_token("user_token"), method)(*args)
+    assert engine.requests == sent
+    assert sandbox_client.access_token == client_token
+
+
+def test_async_context_authenticate_fails_before_sending():
+    client = AsyncSecureAddressBridge("app_test", "secret", sandbox=True)
+    with pytest.raises(Exception, match="for_token"):
+        client.for_token("user_token").authenticate()
+    assert client.transport.engine.requests == {}
+
+
+def test_quota_is_reconciled_with_the_client_token():
+    transport = RecordingTransport()
+    client = SecureAddressBridge(
+        "app_test", "secret", transport=transport, quota=QuotaTracker(limit=1000, reconcile_interval=0)
+    )
+    client.authenticate()
+    client.for_token("user_token").get_address()
+    deadline = time.monotonic() + 2
+    while not any(route == "usage-stats" for route, _ in transport.tokens) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    usage_tokens = {token for route, token in transport.tokens if route == "usage-stats"}
+    assert usage_tokens == {f"Bearer {client.access_token}"}
+    assert ("address", "Bearer user_token") in transport.tokens
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from secureaddress_bridge import BufferedResponse, SandboxTransport, SecureAddressBridge, TokenManager
+
+
+class AccessTokenOnlyTransport(SandboxTransport):
+    """
+    Sandbox whose code exchange returns an access token without a refresh token
+    """
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/token"):
+            return BufferedResponse(200, {}, b'{"access_token": "user_token", "expires_in": 3600}')
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+
+def test_concurrent_refreshes_share_one_request():
+    calls = []
+
+    def fetch(refresh_token):
+        calls.append(refresh_token)
+        time.sleep(0.05)
+        return {"access_token": f"token_{len(calls)}", "expires_in": 3600}
+
+    manager = TokenManager(fetch, background_refresh=False)
+    threads = [threading.Thread(target=manager.refresh) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert manager.access_token == "token_1"
+
+
+class GatedTokenManager(TokenManager):
+    """
+    Holds every refresh until the gate opens, then lets them through one at a
+    time so a late caller only reaches refresh() after the first has finished
+    """
+
+    def __init__(self, fetch, **kwargs):
+        super().__init__(fetch, **kwargs)
+        self.gate = threading.Event()
+        self.turn = threading.Lock()
+
+    def refresh(self):
+        self.gate.wait(2)
+        with self.turn:
+            return super().refresh()
+
+
+def test_a_burst_in_the_refresh_window_sends_one_request():
+    calls = []
+
+    def fetch(refresh_token):
+        calls.append(refresh_token)
+        return {"access_token": f"token_{len(calls)}", "expires_in": 3600}
+
+    manager = GatedTokenManager(fetch, refresh_margin=60, background_refresh=False)
+    manager.record({"access_token": "stale", "expires_in": 30})
+    barrier = threading.Barrier(32)
+
+    def use():
+        barrier.wait()
+        return manager.get_token()
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        tokens = list(executor.map(lambda i: use(), range(32)))
+    assert tokens == ["stale"] * 32
+    manager.gate.set()
+    deadline = time.monotonic() + 2
+    while manager.refresh_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert len(calls) == 1
+    assert manager.get_token() == "token_1"
+
+
+def test_expired_token_is_refreshed_before_use():
+    manager = TokenManager(lambda refresh_token: {"access_token": "fresh", "expires_in": 3600}, background_refresh=False)
+    manager.record({"access_token": "stale", "expires_in": 0.01})
+    time.sleep(0.02)
+    assert manager.get_token() == "fresh"
+    assert manager.refresh_count == 1
+
+
+def test_app_token_is_renewed_with_the_app_credentials():
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, auto_refresh=True)
+    first = client.authenticate()["access_token"]
+    assert client.refresh_access_token() != first
+    assert client.transport.engine.requests["auth"] == 2
+    client.close()
+
+
+def test_user_token_refresh_uses_its_refresh_token():
+    client = SecureAddressBridge("app_test", "secret", sandbox=True, auto_refresh=True)
+    client.exchange_code({"code": "code", "redirect_uri": "https://example.com/callback"})
+    client.refresh_access_token()
+    assert "auth" not in client.transport.engine.requests
+    assert client.transport.engine.requests["token"] == 2
+    client.close()
+
+
+def test_user_token_without_refresh_token_is_never_replaced_by_an_app_token():
+    client = SecureAddressBridge("app_test", "secret", transport=AccessTokenOnlyTransport(), auto_refresh=True)
+    client.exchange_code({"code": "code", "redirect_uri": "https://example.com/callback"})
+    with pytest.raises(Exception, match="cannot be refreshed"):
+        client.refresh_access_token()
+    assert client.access_token == "user_token"
+    assert "auth" not in client.transport.engine.requests
+    client.close()
+
+
+def test_authenticate_drops_an_earlier_refresh_token():
+    manager = TokenManager(lambda refresh_token: {}, background_refresh=False)
+    manager.record({"access_token": "user", "refresh_token": "user_refresh", "expires_in": 3600}, grant=True)
+    manager.record({"access_token": "app", "expires_in": 3600}, grant=True)
+    assert manager.refresh_token is None
+
+
+def test_failed_background_refresh_is_retried_with_backoff(monkeypatch):
+    monkeypatch.setattr(TokenManager, "RETRY_BACKOFF", 0.01)
+    attempts = []
+    done = threading.Event()
+
+    def fetch(refresh_token):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise Exception("token endpoint unavailable")
+        done.set()
+        return {"access_token": "fresh", "expires_in": 3600}
+
+    manager = TokenManager(fetch, refresh_margin=59.99)
+    manager.record({"access_token": "current", "expires_in": 60})
+    assert done.wait(2)
+    assert len(attempts) == 3
+    assert manager.access_token == "fresh"
+    assert manager.failures == 0
+    manager.cancel()
+
+
+def test_async_refresh_survives_a_cancelled_leader():
+    from secureaddress_bridge import AsyncTokenManager
+
+    calls = []
+
+    async def fetch(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.05)
+        return {"access_token": f"token_{len(calls)}", "expires_in": 3600}
+
+    async def run():
+        manager = AsyncTokenManager(fetch, background_refresh=False)
+        leader = asyncio.ensure_future(manager.refresh())
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(manager.refresh())
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.wait_for(follower, 2)
+
+    assert asyncio.run(run()) == "token_2"
+    assert len(calls) == 2
+
+
+def test_async_background_refresh_runs_once_and_stops_on_close():
+    from secureaddress_bridge import AsyncTokenManager
+
+    calls = []
+
+    async def fetch(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(10)
+        return {"access_token": "fresh", "expires_in": 3600}
+
+    async def run():
+        manager = AsyncTokenManager(fetch, refresh_margin=60, background_refresh=False)
+        manager.record({"access_token": "stale", "expires_in": 30})
+        for _ in range(5):
+            assert await manager.ensure_token() == "stale"
+        task = manager._refresh_task
+        await asyncio.sleep(0.01)
+        await manager.close()
+        return task
+
+    assert asyncio.run(run()).cancelled()
+    assert len(calls) == 1
@@ -0,0 +1,133 @@
+import base64
+import json
+import time
+
+import pytest
+
+from secureaddress_bridge import LocalTokenValidator, SecureAddressBridge
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import hashes  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature  # noqa: E402
+
+APP_ID = "app_test"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _int_b64(value: int) -> str:
+    return _b64(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="module")
+def ec_key():
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def _jwks(rsa_key, ec_key):
+    rsa_numbers = rsa_key.public_key().public_numbers()
+    ec_numbers = ec_key.public_key().public_numbers()
+    return {"keys": [
+        {"kid": "rsa", "kty": "RSA", "alg": "RS256", "n": _int_b64(rsa_numbers.n), "e": _int_b64(rsa_numbers.e)},
+        {"kid": "ec", "kty": "EC", "crv": "P-256", "x": _int_b64(ec_numbers.x), "y": _int_b64(ec_numbers.y)}
+    ]}
+
+
+def _token(key, alg, kid, claims):
+    signing_input = f"{_b64(json.dumps({'alg': alg, 'kid': kid}).encode())}.{_b64(json.dumps(claims).encode())}"
+    if isinstance(key, rsa.RSAPrivateKey):
+        signature = key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+    else:
+        r, s = decode_dss_signature(key.sign(signing_input.encode(), ec.ECDSA(hashes.SHA256())))
+        signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+    return f"{signing_input}.{_b64(signature)}"
+
+
+def _with_header(token, alg, kid):
+    # Swap the header but keep the original signature, as an attacker would
+    return ".".join([_b64(json.dumps({"alg": alg, "kid": kid}).encode())] + token.split(".")[1:])
+
+
+def _claims(**overrides):
+    return dict({"aud": APP_ID, "exp": time.time() + 600, "scope": "address"}, **overrides)
+
+
+@pytest.fixture
+def validator(rsa_key, ec_key):
+    validator = LocalTokenValidator()
+    validator.update_keys(_jwks(rsa_key, ec_key))
+    return validator
+
+
+def _verify(validator, token):
+    return validator.verify(validator.parse(token), APP_ID)
+
+
+def test_valid_rsa_and_ec_tokens(validator, rsa_key, ec_key):
+    assert _verify(validator, _token(rsa_key, "RS256", "rsa", _claims()))["valid"]
+    assert _verify(validator, _token(ec_key, "ES256", "ec", _claims()))["valid"]
+
+
+def test_tampered_signature_is_rejected(validator, rsa_key):
+    token = _token(rsa_key, "RS256", "rsa", _claims())
+    tampered = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+    assert _verify(validator, tampered) == {"valid": False, "error": "Invalid token signature", "status": 401}
+
+
+@pytest.mark.parametrize("alg, kid", [("RS256", "ec"), ("ES256", "rsa"), ("ES384", "ec"), ("RS384", "rsa")])
+def test_algorithm_must_match_the_key(validator, rsa_key, ec_key, alg, kid):
+    token = _token(ec_key, "ES256", "ec", _claims()) if kid == "ec" else _token(rsa_key, "RS256", "rsa", _claims())
+    result = _verify(validator, _with_header(token, alg, kid))
+    assert result["error"] == "Token algorithm does not match its signing key"
+    assert result["status"] == 401
+
+
+@pytest.mark.parametrize("claims, error", [
+    (_claims(exp=time.time() - 600), "Token has expired"),
+    (_claims(exp="tomorrow"), "Token has a malformed exp claim"),
+    (_claims(nbf=[1]), "Token has a malformed nbf claim"),
+    (_claims(scope=7), "Token has a malformed scope claim"),
+    (_claims(aud="another_app"), "Token was not issued for this application")
+])
+def test_bad_claims_are_rejected(validator, rsa_key, claims, error):
+    result = _verify(validator, _token(rsa_key, "RS256", "rsa", claims))
+    assert result["valid"] is False
+    assert result["error"] == error
+
+
+def test_malformed_jwk_falls_back_to_the_network(rsa_key):
+    validator = LocalTokenValidator()
+    validator.update_keys({"keys": [{"kid": "rsa", "kty": "RSA", "alg": "RS256", "n": "AQAB"}]})
+    assert _verify(validator, _token(rsa_key, "RS256", "rsa", _claims())) is None
+
+
+def test_tokens_without_an_expiry_fall_back_to_the_network(validator, rsa_key):
+    claims = _claims()
+    del claims["exp"]
+    token = _token(rsa_key, "RS256", "rsa", claims)
+    assert _verify(validator, token) is None
+    client = SecureAddressBridge(APP_ID, "secret", sandbox=True, token_validator=validator)
+    assert "validated_locally" not in client.validate_token(token)
+    assert client.transport.engine.requests["validate-token"] == 1
+
+
+def test_opaque_and_unknown_tokens_fall_back_to_the_network(validator, rsa_key):
+    assert validator.parse("opaque-token") is None
+    assert _verify(validator, _token(rsa_key, "RS256", "unknown", _claims())) is None
+
+
+def test_validate_token_never_raises_on_a_mismatched_algorithm(validator, ec_key):
+    client = SecureAddressBridge(APP_ID, "secret", sandbox=True, token_validator=validator)
+    token = _with_header(_token(ec_key, "ES256", "ec", _claims()), "RS256", "ec")
+    assert client.validate_token(token)["valid"] is False
+    assert client.validate_token(_token(ec_key, "ES256", "ec", _claims()))["validated_locally"] is True
+    assert "validate-token" not in client.transport.engine.requests
@@ -0,0 +1,182 @@
+import asyncio
+import itertools
+import json
+import time
+
+import pytest
+
+from secureaddress_bridge import (
+    AsyncSecureAddressBridge, BufferedResponse, RetryPolicy, SandboxTransport, SecureAddressBridge, TrackingPoller
+)
+from secureaddress_bridge.errors import SecureAddressError
+
+
+class ProgressingTrackingTransport(SandboxTransport):
+    """
+    Answers tracking requests from a per-shipment list of statuses, one per poll
+    """
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = {number: list(sequence) for number, sequence in statuses.items()}
+        self.polls = {}
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        if url.endswith("/tracking"):
+            return self._tracking(params)
+        return super().request(method, url, headers=headers, params=params, json=json)
+
+    def _tracking(self, params):
+        number = params["number"]
+        self.polls[number] = self.polls.get(number, 0) + 1
+        sequence = self.statuses[number]
+        status = sequence.pop(0) if len(sequence) > 1 else sequence[0]
+        if status is None:
+            return BufferedResponse(503, {}, b'{"error": "Carrier unavailable"}')
+        body = {"tracking_number": number, "carrier": params.get("carrier"), "status": status}
+        return BufferedResponse(200, {}, json.dumps(body).encode())
+
+
+def _client(statuses):
+    client = SecureAddressBridge(
+        "app_test", "secret", transport=ProgressingTrackingTransport(statuses), retry_policy=RetryPolicy(max_retries=0)
+    )
+    client.authenticate()
+    return client
+
+
+def _poller(client, shipments, **kwargs):
+    kwargs.setdefault("default_interval", 0)
+    kwargs.setdefault("error_interval", 0)
+    return TrackingPoller(client, shipments, intervals=dict.fromkeys(TrackingPoller.DEFAULT_INTERVALS, 0), **kwargs)
+
+
+def test_poller_reports_only_status_changes_until_delivered():
+    client = _client({"1Z1": ["in_transit", "in_transit", "out_for_delivery", "delivered"]})
+    poller = _poller(client, [("1Z1", "ups")])
+    updates = list(poller.run())
+    assert [(update.previous_status, update.status) for update in updates] == [
+        (None, "in_transit"), ("in_transit", "out_for_delivery"), ("out_for_delivery", "delivered")
+    ]
+    assert len(poller) == 0
+    assert client.transport.polls["1Z1"] == 4
+
+
+def test_poller_retries_failed_polls():
+    client = _client({"1Z1": [None, "delivered"]})
+    poller = _poller(client, [("1Z1", "ups")])
+    assert [update.status for update in poller.run()] == ["delivered"]
+    assert poller.errors == 1
+
+
+def test_poller_rejects_async_clients():
+    client = AsyncSecureAddressBridge("app_test", "secret", sandbox=True)
+    with pytest.raises(TypeError, match="subscribe_tracking"):
+        TrackingPoller(client, [("1Z1", "ups")])
+
+
+def test_removed_shipments_are_no_longer_polled():
+    client = _client({"1Z1": ["in_transit"], "1Z2": ["delivered"]})
+    poller = _poller(client, [("1Z1", "ups"), ("1Z2", "ups")])
+    assert {update.tracking_number for update in poller.poll_once()} == {"1Z1", "1Z2"}
+    poller.remove("1Z1", "ups")
+    assert list(poller.run()) == []
+    assert client.transport.polls == {"1Z1": 1, "1Z2": 1}
+
+
+SHIPMENTS = [("TRK00000001", "usps"), ("TRK00000002", "fedex")]
+
+
+def _subscribe(client, shipments=SHIPMENTS, **kwargs):
+    return client.subscribe_tracking(shipments, wait=0, idle_interval=0, reconnect_delay=0, **kwargs)
+
+
+def _take(subscription, count):
+    return list(itertools.islice(subscription, count))
+
+
+def _statuses(events):
+    statuses = {}
+    for event in events:
+        statuses.setdefault(event.tracking_number, []).append(event.status)
+    return statuses
+
+
+def test_subscription_streams_every_shipment_to_delivery(sandbox_client):
+    events = []
+    for event in _subscribe(sandbox_client):
+        events.append(event)
+        if sum(1 for e in events if e.status == "delivered") == len(SHIPMENTS):
+            break
+    for statuses in _statuses(events).values():
+        assert statuses == sorted(statuses, key=sandbox_client.transport.engine.TRACKING_STATUSES.index)
+        assert statuses[-1] == "delivered"
+    assert [event.cursor for event in events] == [str(i) for i in range(1, len(events) + 1)]
+    assert sandbox_client.transport.engine.requests["tracking/subscriptions"] == 1
+
+
+def test_subscription_resumes_from_its_cursor(sandbox_client):
+    subscription = _subscribe(sandbox_client)
+    first = _take(subscription, 2)
+    subscription.close()
+
+    resumed = _subscribe(sandbox_client, subscription_id=subscription.subscription_id, cursor=subscription.cursor)
+    following = _take(resumed, 2)
+    assert following[0].cursor == str(int(first[-1].cursor) + 1)
+    assert not {event.id for event in first} & {event.id for event in following}
+    assert sandbox_client.transport.engine.requests["tracking/subscriptions"] == 1
+
+
+def test_expired_subscriptions_are_recreated_from_the_cursor(sandbox_client):
+    sandbox_client.configure_sandbox({"subscription_ttl": 0.02})
+    subscription = _subscribe(sandbox_client)
+    _take(subscription, 1)
+    expired = subscription.subscription_id
+    time.sleep(0.05)
+    _take(subscription, 1)
+    assert subscription.subscription_id != expired
+    assert sandbox_client.transport.engine.requests["tracking/subscriptions"] == 2
+    assert subscription.reconnects == 0
+
+
+def test_delivery_confirmations_are_delivered(sandbox_client):
+    created = sandbox_client.create_tracking_subscription(SHIPMENTS, event_types=["delivery.confirmed"])
+    sandbox_client.confirm_delivery(*SHIPMENTS[1])
+    subscription = _subscribe(sandbox_client, subscription_id=created["subscription_id"], cursor=created["cursor"])
+    (event,) = _take(subscription, 1)
+    assert (event.type, event.tracking_number, event.status) == ("delivery.confirmed", SHIPMENTS[1][0], "delivered")
+
+
+def test_shipments_added_to_a_live_subscription_receive_events(sandbox_client):
+    subscription = _subscribe(sandbox_client, shipments=SHIPMENTS[:1])
+    _take(subscription, 1)
+    subscription.add(*SHIPMENTS[1])
+    subscription.remove(*SHIPMENTS[0])
+    assert len(subscription) == 1
+    assert {event.tracking_number for event in _take(subscription, 2)} == {SHIPMENTS[1][0]}
+    requests = sandbox_client.transport.engine.requests
+    assert sum(count for route, count in requests.items() if route.endswith("/shipments")) == 2
+
+
+def test_subscription_raises_errors_that_reconnecting_cannot_fix(sandbox_client):
+    sandbox_client.retry_policy = RetryPolicy(max_retries=0)
+    subscription = _subscribe(sandbox_client)
+    sandbox_client.configure_sandbox({"simulate_errors": True, "error_rate": 1.0, "error_status": 400})
+    with pytest.raises(SecureAddressError):
+        _take(subscription, 1)
+
+
+def test_async_subscription_streams_events():
+    async def run():
+        client = AsyncSecureAddressBridge("app_test", "secret", sandbox=True)
+        await client.authenticate()
+        subscription = client.subscribe_tracking(SHIPMENTS, wait=0, idle_interval=0)
+        events = []
+        async for event in subscription:
+            events.append(event)
+            if len(events) == 3:
+                break
+        return events
+
+    events = asyncio.run(run())
+    assert [event.cursor for event in events] == ["1", "2", "3"]
@@ -0,0 +1,29 @@
+from secureaddress_bridge import HttpTransport, RetryPolicy, SecureAddressBridge
+
+
+def _client(server, transport):
+    client = SecureAddressBridge(
+        "app_test", "secret", base_url=server.url, transport=transport, retry_policy=RetryPolicy(max_retries=0)
+    )
+    client.authenticate()
+    return client
+
+
+def test_keep_alive_reuses_connections(mock_server):
+    with HttpTransport() as transport:
+        client = _client(mock_server, transport)
+        for _ in range(20):
+            client.get_address()
+        stats = transport.connection_stats()
+    assert stats["requests"] == 21
+    assert stats["new_connections"] == 1
+
+
+def test_unpooled_transport_opens_a_connection_per_request(mock_server):
+    with HttpTransport(keep_alive=False) as transport:
+        client = _client(mock_server, transport)
+        for _ in range(300):
+            assert client.get_address()["country"] == "US"
+        stats = transport.connection_stats()
+    assert stats["requests"] == 301
+    assert stats["reused_connections"] == 0
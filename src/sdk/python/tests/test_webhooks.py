@@ -0,0 +1,152 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from secureaddress_bridge import AsyncWebhookReceiver, SecureAddressBridge, WebhookReceiver, WebhookVerifier
+
+SECRET = "whsec_test"
+
+
+def _sign(payload, secret=SECRET, timestamp=None):
+    content = f"{timestamp}.".encode() + payload if timestamp is not None else payload
+    return hmac.new(secret.encode(), content, hashlib.sha256).hexdigest()
+
+
+def test_hex_and_base64_signatures():
+    payload = b'{"event_type": "address.updated"}'
+    signature = _sign(payload)
+    verifier = WebhookVerifier(SECRET)
+    assert verifier.verify(payload, signature)
+    assert verifier.verify(memoryview(payload), base64.b64encode(bytes.fromhex(signature)).decode())
+    assert not verifier.verify(payload + b" ", signature)
+    assert not verifier.verify(payload, "not-a-signature")
+
+
+def test_secret_rotation():
+    payload = b"{}"
+    verifier = WebhookVerifier(["old_secret", "new_secret"])
+    assert verifier.verify(payload, _sign(payload, "old_secret"))
+    verifier.remove_secret("old_secret")
+    assert not verifier.verify(payload, _sign(payload, "old_secret"))
+    assert verifier.verify(payload, _sign(payload, "new_secret"))
+
+
+def test_timestamped_signatures_reject_stale_and_replayed_deliveries():
+    payload = b"{}"
+    verifier = WebhookVerifier(SECRET, tolerance=60)
+    now = str(int(time.time()))
+    assert verifier.verify(payload, _sign(payload, timestamp=now), now)
+    assert not verifier.verify(payload, _sign(payload, timestamp=now), now)
+    stale = str(int(time.time()) - 120)
+    assert not verifier.verify(payload, _sign(payload, timestamp=stale), stale)
+
+
+def test_verify_many_keeps_input_order():
+    payloads = [json.dumps({"n": n}).encode() for n in range(3)]
+    deliveries = [(payload, _sign(payload), None) for payload in payloads]
+    deliveries[1] = (payloads[1], _sign(b"tampered"), None)
+    assert WebhookVerifier(SECRET).verify_many(deliveries) == [True, False, True]
+
+
+def test_client_verify_webhook_signature():
+    client = SecureAddressBridge("app_test", "secret", sandbox=True)
+    payload = '{"event_type": "address.updated"}'
+    assert client.verify_webhook_signature(_sign(payload.encode()), payload, SECRET)
+    assert not client.verify_webhook_signature(_sign(payload.encode()), payload, "other_secret")
+
+
+def _delivery(event_id, event_type="address.updated"):
+    body = json.dumps({"id": event_id, "event_type": event_type}).encode()
+    return body, {"X-Webhook-Signature": _sign(body)}
+
+
+def test_receiver_dispatches_each_event_once_under_concurrent_redelivery():
+    received = []
+    receiver = WebhookReceiver(SECRET, workers=4)
+    receiver.add_handler("*", received.append)
+    body, headers = _delivery("evt_1")
+    barrier = threading.Barrier(16)
+    # Widen the window between the duplicate check and the enqueue
+    enqueue = receiver._queue.put_nowait
+    receiver._queue.put_nowait = lambda event: (time.sleep(0.01), enqueue(event))
+
+    def deliver():
+        barrier.wait()
+        return receiver.receive(body, headers)[0]
+
+    with ThreadPoolExecutor(16) as pool:
+        statuses = list(pool.map(lambda _: deliver(), range(16)))
+    receiver.stop()
+    assert sorted(statuses) == [200] * 15 + [202]
+    assert len(received) == 1
+    assert receiver.stats["received"] == 16
+    assert receiver.stats["duplicates"] == 15
+    assert receiver.stats["processed"] == 1
+
+
+def test_refused_deliveries_are_accepted_when_retried():
+    release = threading.Event()
+    receiver = WebhookReceiver(SECRET, workers=1, queue_size=1)
+    receiver.add_handler("*", lambda event: release.wait(2))
+    statuses = [receiver.receive(*_delivery(f"evt_{n}"))[0] for n in range(4)]
+    assert statuses[-1] == 503
+    release.set()
+    receiver.stop()
+    assert receiver.receive(*_delivery("evt_3"))[0] == 202
+    receiver.stop()
+
+
+def test_wsgi_receiver_rejects_bad_signatures():
+    receiver = WebhookReceiver(SECRET)
+    body = b'{"id": "evt_1"}'
+    responses = []
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        "HTTP_X_WEBHOOK_SIGNATURE": _sign(b"other")
+    }
+    receiver(environ, lambda status, headers: responses.append(status))
+    assert responses == ["401 Unauthorized"]
+    assert receiver.stats["rejected"] == 1
+
+
+def test_asgi_receiver_handles_http_lifespan_and_websocket_scopes():
+    received = []
+    receiver = AsyncWebhookReceiver(SECRET)
+    receiver.add_handler("address.updated", received.append)
+
+    async def call(scope, messages):
+        messages = list(messages)
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await receiver(scope, receive, send)
+        return sent
+
+    async def run():
+        body, headers = _delivery("evt_1")
+        http = await call(
+            {"type": "http", "method": "POST", "headers": [(b"x-webhook-signature", headers["X-Webhook-Signature"].encode())]},
+            [{"type": "http.request", "body": body}]
+        )
+        websocket = await call({"type": "websocket"}, [{"type": "websocket.connect"}])
+        lifespan = await call({"type": "lifespan"}, [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        return http, websocket, lifespan
+
+    http, websocket, lifespan = asyncio.run(run())
+    assert http[0]["status"] == 202
+    assert websocket == [{"type": "websocket.close", "code": 1008}]
+    assert lifespan == [{"type": "lifespan.startup.complete"}, {"type": "lifespan.shutdown.complete"}]
+    assert [event.id for event in received] == ["evt_1"]